@@ -0,0 +1,380 @@
+"""
+Analysis service layer.
+
+Runs the analysis pipeline (DataFetcher -> TechnicalIndicators -> ScoringSystem
+-> MonteCarloSimulator) and returns a typed, serializable AnalysisResult. Shared
+by the Streamlit app, the CLI and the HTTP API; contains no UI code.
+"""
+import json
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bars import normalize_interval
+from data_fetcher import DataFetcher
+from fundamentals import parse_earnings_date
+from providers import DataProvider
+from indicators import TechnicalIndicators, compact_frame
+from jumps import trading_days_until
+from lookback import ESTIMATION_BARS, history_bars
+from scoring import ScoringSystem
+from monte_carlo import STOP_LOSS_FACTOR, MonteCarloSimulator
+from profiling import timed
+
+
+TIMEFRAMES = ('short', 'medium', 'long')
+RISK_LEVELS = ('conservative', 'moderate', 'aggressive')
+
+# Monte Carlo horizon (days) per timeframe
+TIMEFRAME_DAYS = {
+    'short': 7,
+    'medium': 28,
+    'long': 180,
+}
+
+POSITION_SIZES = {
+    'conservative': '2-3% of portfolio',
+    'moderate': '3-5% of portfolio',
+    'aggressive': '7-10% of portfolio',
+}
+
+# Scalar Monte Carlo statistics kept in the result
+SIMULATION_STATS = ('median_price', 'mean_price', 'percentile_10', 'percentile_90',
+                    'bull_probability', 'bear_probability', 'bull_target', 'bear_target',
+                    'drift', 'volatility', 'current_price', 'days')
+# Path-dependent statistics (monte_carlo.PathRisk) kept in the result
+PATH_STATS = ('stop_loss', 'target', 'stop_probability', 'target_probability',
+              'stop_first_probability', 'target_first_probability', 'days_to_stop', 'days_to_target',
+              'max_drawdown_mean', 'max_drawdown_median', 'max_drawdown_90')
+
+
+@dataclass
+class ScenarioResult:
+    """Bull or bear scenario from the Monte Carlo simulation."""
+    probability: float
+    target: float
+    change_pct: float
+    days: int
+    description: str
+
+
+@dataclass
+class Recommendation:
+    """Trade recommendation derived from the signal and scenarios."""
+    action: str
+    note: str = ''
+    entry_low: Optional[float] = None
+    entry_high: Optional[float] = None
+    target: Optional[float] = None
+    target_change_pct: Optional[float] = None
+    stop_loss: Optional[float] = None
+    position_size: Optional[str] = None
+    risk_reward: float = 0.0
+
+
+@dataclass
+class AnalysisSeries:
+    """
+    Full pandas/NumPy data behind a result (only when requested, never serialized).
+
+    Stored as float32 (OHLCV block, indicator block views, simulation paths)
+    so cached results stay small.
+    """
+    data: pd.DataFrame
+    indicators: Dict[str, Any]
+    simulation: Dict[str, Any]
+
+
+@dataclass
+class AnalysisResult:
+    """Serializable result of one analysis."""
+    ticker: str
+    timeframe: str
+    risk_tolerance: str
+    interval: str = '1d'
+    error: Optional[str] = None
+    stock_info: Dict[str, Any] = field(default_factory=dict)
+    score: int = 0
+    signal: str = ''
+    confidence: str = ''
+    max_score: float = 0
+    breakdown: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    indicators: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    simulation: Dict[str, float] = field(default_factory=dict)
+    # Timeframe -> Monte Carlo statistics at its horizon, from the same paths
+    horizons: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    scenarios: Dict[str, ScenarioResult] = field(default_factory=dict)
+    recommendation: Optional[Recommendation] = None
+    generated_at: str = ''
+    elapsed_ms: float = 0.0
+    series: Optional[AnalysisSeries] = field(default=None, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        """True if the analysis completed."""
+        return self.error is None
+
+    def score_results(self) -> Dict[str, Any]:
+        """Scoring results in ScoringSystem.calculate_score layout."""
+        return {
+            'score': self.score,
+            'signal': self.signal,
+            'confidence': self.confidence,
+            'breakdown': self.breakdown,
+            'max_score': self.max_score,
+        }
+
+    def scenario_dicts(self) -> Dict[str, Dict[str, Any]]:
+        """Scenarios in MonteCarloSimulator.get_scenarios layout."""
+        return {name: asdict(scenario) for name, scenario in self.scenarios.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-Python dictionary (JSON-safe; series excluded, NaN as None)."""
+        data = asdict(self, dict_factory=lambda items: {k: v for k, v in items if k != 'series'})
+        return _to_builtin(data)
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize to JSON."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AnalysisResult':
+        """Rebuild a result from to_dict() output."""
+        data = dict(data)
+        data.pop('series', None)
+        data['scenarios'] = {name: ScenarioResult(**s) for name, s in data.get('scenarios', {}).items()}
+        if data.get('recommendation') is not None:
+            data['recommendation'] = Recommendation(**data['recommendation'])
+        return cls(**data)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'AnalysisResult':
+        """Rebuild a result from to_json() output."""
+        return cls.from_dict(json.loads(text))
+
+
+def _to_builtin(value: Any) -> Any:
+    """Recursively convert NumPy scalars to Python values and NaN to None."""
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if hasattr(value, 'item') and not hasattr(value, '__len__'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def compact_simulation(simulation: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulation results with the path arrays stored as float32."""
+    return {key: value.astype(np.float32, copy=False) if isinstance(value, np.ndarray) else value
+            for key, value in simulation.items()}
+
+
+def scalar_indicators(indicators: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Drop the pandas series from an indicators dict.
+
+    Args:
+        indicators: Output of TechnicalIndicators.calculate_all()
+
+    Returns:
+        Same structure with only scalar values and signals (as Python types)
+    """
+    scalars = {}
+    for name, ind in indicators.items():
+        values = {}
+        for key, value in ind.items():
+            if isinstance(value, (pd.Series, pd.DataFrame)):
+                continue
+            values[key] = value.item() if hasattr(value, 'item') else value
+        scalars[name] = values
+    return scalars
+
+
+def build_recommendation(signal: str, current_price: float, scenarios: Dict[str, Dict[str, Any]],
+                         risk_tolerance: str) -> Recommendation:
+    """
+    Turn a signal and Monte Carlo scenarios into entry/target/stop levels.
+
+    Args:
+        signal: Signal from ScoringSystem
+        current_price: Current stock price
+        scenarios: Output of MonteCarloSimulator.get_scenarios()
+        risk_tolerance: 'conservative', 'moderate', or 'aggressive'
+
+    Returns:
+        Recommendation
+    """
+    bull, bear = scenarios['bull'], scenarios['bear']
+    risk_reward = abs(bull['change_pct'] / bear['change_pct']) if bear['change_pct'] != 0 else 0
+
+    if "BUY" in signal:
+        return Recommendation(
+            action=signal,
+            entry_low=current_price * 0.99,
+            entry_high=current_price * 1.01,
+            target=bull['target'],
+            target_change_pct=bull['change_pct'],
+            stop_loss=current_price * STOP_LOSS_FACTOR,
+            position_size=POSITION_SIZES.get(risk_tolerance, POSITION_SIZES['moderate']),
+            risk_reward=risk_reward,
+        )
+    elif "SELL" in signal:
+        return Recommendation(action=signal, risk_reward=risk_reward,
+                              note="Consider exiting position or avoiding entry at this time.")
+    else:  # HOLD
+        return Recommendation(action=signal, risk_reward=risk_reward,
+                              note="Wait for better entry opportunity or maintain current position.")
+
+
+class AnalysisService:
+    """Run analyses and cache their results."""
+
+    def __init__(self, iterations: int = 1000, cache_ttl: float = 0,
+                 provider: Optional[DataProvider] = None, return_model: str = 'normal',
+                 precision: str = 'float64'):
+        """
+        Initialize service.
+
+        Args:
+            iterations: Monte Carlo iterations
+            cache_ttl: Seconds to cache results per (ticker, timeframe, risk, interval); 0 disables
+            provider: Price/info data provider (defaults to the process-wide provider)
+            return_model: Monte Carlo daily return model ('normal', 'garch' or 'jump';
+                'jump' also places a jump on the next earnings date)
+            precision: Precision of simulated paths ('float64', or 'float32'
+                with an automatic float64 fallback)
+        """
+        self.iterations = iterations
+        self.return_model = return_model
+        self.precision = precision
+        self.cache_ttl = cache_ttl
+        self.provider = provider
+        self._cache: Dict[Tuple[str, str, str, str], Tuple[float, AnalysisResult]] = {}
+        self._lock = threading.Lock()
+
+    @timed()
+    def analyze(self, ticker: str, timeframe: str = 'short', risk_tolerance: str = 'moderate',
+                include_series: bool = False, interval: str = '1d') -> AnalysisResult:
+        """
+        Analyze one ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            timeframe: 'short', 'medium', or 'long'
+            risk_tolerance: 'conservative', 'moderate', or 'aggressive'
+            include_series: Attach price data, indicator series and simulation paths
+            interval: Bar interval for indicators and scoring ('5m', '1h', '1d', '1wk', ...);
+                the Monte Carlo simulation always uses daily bars
+
+        Returns:
+            AnalysisResult (with error set if the analysis could not run)
+        """
+        ticker = ticker.upper()
+        try:
+            interval = normalize_interval(interval)
+        except ValueError as e:
+            return AnalysisResult(ticker=ticker, timeframe=timeframe, risk_tolerance=risk_tolerance,
+                                  interval=interval, error=str(e))
+        key = (ticker, timeframe, risk_tolerance, interval)
+
+        if self.cache_ttl > 0:
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                if not include_series or cached[1].series is not None:
+                    return cached[1]
+
+        result = self._run(ticker, timeframe, risk_tolerance, include_series, interval)
+
+        if self.cache_ttl > 0 and result.ok:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def _run(self, ticker: str, timeframe: str, risk_tolerance: str,
+             include_series: bool, interval: str = '1d') -> AnalysisResult:
+        result = AnalysisResult(ticker=ticker, timeframe=timeframe, risk_tolerance=risk_tolerance,
+                                interval=interval, generated_at=datetime.now().isoformat(timespec='seconds'))
+        start = time.perf_counter()
+
+        try:
+            fetcher = DataFetcher(ticker, self.provider) if self.provider else DataFetcher(ticker)
+            if not fetcher.validate_ticker():
+                result.error = f"Invalid ticker symbol: {ticker}"
+                return result
+
+            stock_info = fetcher.get_stock_info()
+            stock_info['ticker'] = ticker
+
+            if interval == '1d':
+                data = daily = fetcher.fetch_data(timeframe)
+            else:
+                # One download at the finer interval; daily bars are resampled from it when possible
+                bars = fetcher.fetch_intervals(timeframe, [interval, '1d'], bars=history_bars(timeframe, interval))
+                data, daily = bars[interval], bars['1d']
+            if data is None or data.empty or daily is None or daily.empty:
+                result.error = f"Could not fetch data for {ticker}"
+                return result
+
+            indicators = TechnicalIndicators(data).calculate_all()
+            score_results = ScoringSystem(timeframe, risk_tolerance, provider=self.provider).calculate_score(
+                indicators, stock_info)
+
+            earnings_day = None
+            if self.return_model == 'jump':
+                earnings_day = trading_days_until(parse_earnings_date(fetcher.info or {}), daily.index[-1])
+            mc_sim = MonteCarloSimulator(daily, iterations=self.iterations,
+                                         estimation_window=ESTIMATION_BARS.get(timeframe),
+                                         model=self.return_model, ticker=ticker, earnings_day=earnings_day,
+                                         precision=self.precision)
+            days = TIMEFRAME_DAYS.get(timeframe, 7)
+            # Paths are only kept for the chart; the statistics have a closed form
+            # (for normal returns) and the path risk is accumulated chunk by chunk.
+            # Every timeframe's horizon is reported from the same run.
+            if include_series or not mc_sim.has_closed_form:
+                simulation = mc_sim.run_simulation(days, stock_info['current_price'],
+                                                   horizons=TIMEFRAME_DAYS.values())
+            else:
+                simulation = mc_sim.run_analytic(days, stock_info['current_price'], horizons=TIMEFRAME_DAYS.values())
+                simulation.update(mc_sim.run_path_risk(days, stock_info['current_price']))
+            scenarios = mc_sim.get_scenarios(simulation)
+
+            result.stock_info = _to_builtin(stock_info)
+            result.score = score_results['score']
+            result.signal = score_results['signal']
+            result.confidence = score_results['confidence']
+            result.max_score = score_results['max_score']
+            result.breakdown = _to_builtin(score_results['breakdown'])
+            result.indicators = scalar_indicators(indicators)
+            result.simulation = {key: _to_builtin(simulation[key]) for key in SIMULATION_STATS + PATH_STATS}
+            result.horizons = {
+                name: {'days': horizon, **_to_builtin(simulation['horizons'][horizon])}
+                for name, horizon in TIMEFRAME_DAYS.items()
+            }
+            result.scenarios = {
+                name: ScenarioResult(**_to_builtin(scenario)) for name, scenario in scenarios.items()
+            }
+            result.recommendation = build_recommendation(
+                result.signal, stock_info['current_price'], scenarios, risk_tolerance
+            )
+
+            if include_series:
+                result.series = AnalysisSeries(data=compact_frame(data), indicators=indicators,
+                                               simulation=compact_simulation(simulation))
+
+        except Exception as e:
+            result.error = f"Analysis failed for {ticker}: {e}"
+
+        finally:
+            result.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        return result
@@ -0,0 +1,419 @@
+"""
+Local HTTP API for the analysis pipeline.
+
+Serves analyze/score/simulate endpoints on top of AnalysisService using only
+the standard library (asyncio). Concurrent identical requests share a single
+in-flight computation, finished results are kept in a bounded LRU cache, and
+per-endpoint latency percentiles are exposed at /metrics.
+
+Usage:
+    python -m api_server --port 8600
+    curl 'http://127.0.0.1:8600/score?ticker=AAPL&timeframe=short&risk=moderate'
+
+Endpoints (GET):
+    /analyze   Full AnalysisResult
+    /score     Score, signal, confidence and breakdown
+    /simulate  Monte Carlo statistics and bull/bear scenarios
+    /metrics   Request counts, cache/coalescing stats, p50/p99 latency, HTTP session counters
+               (plus per-stage timings when started with --profile)
+    /metrics/prometheus  Per-stage timings in Prometheus text format
+    /health    Liveness check
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import profiling
+from analysis_service import AnalysisResult, AnalysisService, TIMEFRAMES, RISK_LEVELS
+from providers import configure_provider, http_session_stats
+
+
+AnalysisKey = Tuple[str, str, str]
+
+MAX_HEADER_LINES = 100
+# Request bodies are read and discarded (all endpoints are GET); larger ones are refused
+MAX_BODY_BYTES = 1 << 20
+
+
+class LatencyMetrics:
+    """Request counts and latency percentiles per endpoint."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize metrics.
+
+        Args:
+            window: Number of most recent latencies kept per endpoint
+        """
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, elapsed_ms: float, error: bool = False):
+        """Record one request."""
+        if endpoint not in self._latencies:
+            self._latencies[endpoint] = deque(maxlen=self.window)
+            self._counts[endpoint] = 0
+            self._errors[endpoint] = 0
+        self._latencies[endpoint].append(elapsed_ms)
+        self._counts[endpoint] += 1
+        self._errors[endpoint] += int(error)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize all endpoints.
+
+        Returns:
+            Dictionary of endpoint -> count, errors, p50_ms, p99_ms, max_ms
+        """
+        summary = {}
+        for endpoint, latencies in self._latencies.items():
+            values = np.fromiter(latencies, dtype=float)
+            p50, p99 = np.percentile(values, [50, 99])
+            summary[endpoint] = {
+                'count': self._counts[endpoint],
+                'errors': self._errors[endpoint],
+                'p50_ms': round(float(p50), 2),
+                'p99_ms': round(float(p99), 2),
+                'max_ms': round(float(values.max()), 2),
+            }
+        return summary
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one computation."""
+
+    def __init__(self):
+        self._in_flight: Dict[Any, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Any, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func for key, or wait for the call already in flight.
+
+        Args:
+            key: Hashable request key
+            func: Coroutine function producing the value
+
+        Returns:
+            The (shared) result
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leading call was cancelled (e.g. its client went away): take over
+                # unless this call is being cancelled as well
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.do(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await func()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if not future.done():
+                # Cancelled or interrupted: release the waiters instead of leaving them pending
+                future.cancel()
+            del self._in_flight[key]
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+
+class AnalysisApi:
+    """Request routing, coalescing and caching over AnalysisService."""
+
+    def __init__(self, service: Optional[AnalysisService] = None, cache_ttl: float = 300,
+                 max_workers: int = 8, cache_size: int = 1024):
+        """
+        Initialize API.
+
+        Args:
+            service: Analysis service (a new one if not given)
+            cache_ttl: Seconds to cache successful results; 0 disables
+            max_workers: Threads running analyses
+            cache_size: Maximum cached results; the least recently used are evicted first
+        """
+        self.service = service or AnalysisService()
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self.single_flight = SingleFlight()
+        self.metrics = LatencyMetrics()
+        self._cache: 'OrderedDict[AnalysisKey, Tuple[float, AnalysisResult]]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.started = time.time()
+
+        self.routes: Dict[str, Callable[[AnalysisResult], Dict[str, Any]]] = {
+            '/analyze': lambda result: result.to_dict(),
+            '/score': self._score_view,
+            '/simulate': self._simulate_view,
+        }
+
+    @staticmethod
+    def _score_view(result: AnalysisResult) -> Dict[str, Any]:
+        view = {'ticker': result.ticker, 'timeframe': result.timeframe,
+                'risk_tolerance': result.risk_tolerance, 'generated_at': result.generated_at}
+        view.update(result.score_results())
+        return view
+
+    @staticmethod
+    def _simulate_view(result: AnalysisResult) -> Dict[str, Any]:
+        return {'ticker': result.ticker, 'timeframe': result.timeframe,
+                'generated_at': result.generated_at, 'simulation': result.simulation,
+                'scenarios': result.scenario_dicts()}
+
+    async def get_result(self, key: AnalysisKey) -> AnalysisResult:
+        """
+        Get the analysis for (ticker, timeframe, risk), from cache if fresh.
+
+        Args:
+            key: (ticker, timeframe, risk_tolerance)
+
+        Returns:
+            AnalysisResult
+        """
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached[1]
+        self.cache_misses += 1
+
+        async def compute():
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self.service.analyze, *key)
+            if self.cache_ttl > 0 and result.ok:
+                self._store(key, result)
+            return result
+
+        return await self.single_flight.do(key, compute)
+
+    def _store(self, key: AnalysisKey, result: AnalysisResult):
+        """Cache a result, dropping expired entries and then the least recently used beyond cache_size."""
+        now = time.monotonic()
+        self._cache[key] = (now, result)
+        self._cache.move_to_end(key)
+        for stale in [k for k, (stored, _) in self._cache.items() if now - stored >= self.cache_ttl]:
+            del self._cache[stale]
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def handle(self, method: str, target: str) -> Tuple[int, Union[Dict[str, Any], str]]:
+        """
+        Handle one request.
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+
+        Returns:
+            Tuple of (HTTP status, JSON payload or plain text)
+        """
+        start = time.perf_counter()
+        url = urlsplit(target)
+        status, payload = await self._dispatch(method, url.path.rstrip('/') or '/', parse_qs(url.query))
+        endpoint = url.path if url.path in self.routes or url.path in ('/metrics', '/metrics/prometheus', '/health') else 'other'
+        self.metrics.record(endpoint, (time.perf_counter() - start) * 1000, error=status >= 400)
+        return int(status), payload
+
+    async def _dispatch(self, method: str, path: str,
+                        query: Dict[str, list]) -> Tuple[int, Union[Dict[str, Any], str]]:
+        if method not in ('GET', 'HEAD'):
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Method {method} not allowed"}
+
+        if path == '/health':
+            return HTTPStatus.OK, {'status': 'ok'}
+        if path == '/metrics':
+            return HTTPStatus.OK, self.metrics_payload()
+        if path == '/metrics/prometheus':
+            return HTTPStatus.OK, profiling.prometheus_text()
+
+        view = self.routes.get(path)
+        if view is None:
+            return HTTPStatus.NOT_FOUND, {'error': f"Unknown endpoint: {path}"}
+
+        ticker = query.get('ticker', [''])[0].strip().upper()
+        timeframe = query.get('timeframe', ['short'])[0].lower()
+        risk = query.get('risk', ['moderate'])[0].lower()
+        if not ticker:
+            return HTTPStatus.BAD_REQUEST, {'error': "Missing 'ticker' parameter"}
+        if timeframe not in TIMEFRAMES:
+            return HTTPStatus.BAD_REQUEST, {'error': f"'timeframe' must be one of {', '.join(TIMEFRAMES)}"}
+        if risk not in RISK_LEVELS:
+            return HTTPStatus.BAD_REQUEST, {'error': f"'risk' must be one of {', '.join(RISK_LEVELS)}"}
+
+        try:
+            result = await self.get_result((ticker, timeframe, risk))
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Analysis failed for {ticker}: {e}"}
+
+        if not result.ok:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {'ticker': ticker, 'error': result.error}
+        return HTTPStatus.OK, view(result)
+
+    def metrics_payload(self) -> Dict[str, Any]:
+        """Metrics for the /metrics endpoint."""
+        payload = {
+            'uptime_s': round(time.time() - self.started, 1),
+            'endpoints': self.metrics.summary(),
+            'cache': {'hits': self.cache_hits, 'misses': self.cache_misses, 'entries': len(self._cache)},
+            'single_flight': {'coalesced': self.single_flight.coalesced, 'in_flight': len(self.single_flight)},
+        }
+        http_stats = http_session_stats()
+        if http_stats is not None:
+            payload['http'] = http_stats
+        if profiling.is_enabled():
+            payload['stages'] = profiling.metrics.snapshot()
+        return payload
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection (keep-alive supported)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self._write(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request'}, False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    await self._write(writer, HTTPStatus.BAD_REQUEST, {'error': 'Invalid Content-Length'}, False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                status, payload = await self.handle(method, target)
+                await self._write(writer, status, payload, keep_alive, head=method == 'HEAD')
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, payload: Union[Dict[str, Any], str],
+                     keep_alive: bool, head: bool = False):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        status = HTTPStatus(status)
+        header = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(header.encode('latin-1') + (b'' if head else body))
+        await writer.drain()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8600) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            host: Interface to bind (local only by default)
+            port: TCP port (0 picks a free port)
+
+        Returns:
+            asyncio Server
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Shut down the worker threads."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m api_server',
+        description='Local HTTP API for the stock analysis pipeline (educational use only).'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--iterations', type=int, default=1000, help='Monte Carlo iterations')
+    parser.add_argument('--cache-ttl', type=float, default=300, help='Seconds to cache results')
+    parser.add_argument('--cache-size', type=int, default=1024, help='Maximum cached results')
+    parser.add_argument('--workers', type=int, default=8, help='Analysis worker threads')
+    parser.add_argument('--profile', action='store_true', help='Record per-stage timings')
+    data = parser.add_mutually_exclusive_group()
+    data.add_argument('--record', metavar='DIR', help='Record yfinance responses to DIR')
+    data.add_argument('--replay', metavar='DIR', help='Serve recorded responses from DIR (no network)')
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace):
+    """Run the server until cancelled."""
+    if args.profile:
+        profiling.enable()
+    if args.record or args.replay:
+        configure_provider('record' if args.record else 'replay', args.record or args.replay)
+    api = AnalysisApi(AnalysisService(iterations=args.iterations), args.cache_ttl, args.workers,
+                      args.cache_size)
+    server = await api.start(args.host, args.port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Serving analysis API on http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+def main(argv=None) -> int:
+    """Run the API server."""
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,18 +3,15 @@ Streamlit Stock Analysis App
 Educational stock analysis tool with technical indicators and Monte Carlo simulation.
 """
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-import numpy as np
 from datetime import datetime
+import json
 
-from data_fetcher import DataFetcher
-from indicators import TechnicalIndicators
-from scoring import ScoringSystem
-from monte_carlo import MonteCarloSimulator
-from news_sentiment import NewsSentimentAnalyzer
-from fundamentals import FundamentalAnalyzer
+import profiling
+from profiling import span, timed
+from reasoning import generate_signal_reasoning, generate_bull_reasoning, generate_bear_reasoning
+
+# Heavy modules (pandas, plotly, yfinance, VADER) are imported where they are
+# first needed, so the disclaimer and welcome screen render without them.
 
 
 # Page configuration
@@ -124,447 +121,41 @@ def show_disclaimer():
         st.stop()
 
 
-def get_timeframe_days(timeframe: str) -> int:
-    """Get number of days for Monte Carlo simulation based on timeframe."""
-    timeframe_map = {
-        "Short-term (1-7 days)": 7,
-        "Medium-term (1-4 weeks)": 28,
-        "Long-term (1-6 months)": 180
-    }
-    return timeframe_map.get(timeframe, 7)
+@st.cache_resource
+def get_fundamentals_store() -> 'FundamentalsStore':
+    """Shared on-disk fundamentals snapshot store (one per process)."""
+    from fundamentals_store import FundamentalsStore
+    return FundamentalsStore()
 
 
-def create_price_chart(data: pd.DataFrame, indicators: dict, stock_name: str):
-    """Create interactive price chart with indicators."""
-    fig = make_subplots(
-        rows=4, cols=1,
-        shared_xaxes=True,
-        vertical_spacing=0.05,
-        subplot_titles=(f'{stock_name} Price & Bollinger Bands', 'MACD', 'RSI', 'Volume'),
-        row_heights=[0.5, 0.15, 0.15, 0.2]
-    )
-    
-    # Price and Bollinger Bands
-    fig.add_trace(
-        go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name='Price'
-        ),
-        row=1, col=1
-    )
-    
-    if 'bollinger' in indicators:
-        bb = indicators['bollinger']
-        fig.add_trace(
-            go.Scatter(x=data.index, y=bb['upper_series'], name='BB Upper',
-                      line=dict(color='gray', dash='dash')),
-            row=1, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=data.index, y=bb['middle_series'], name='BB Middle',
-                      line=dict(color='orange')),
-            row=1, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=data.index, y=bb['lower_series'], name='BB Lower',
-                      line=dict(color='gray', dash='dash')),
-            row=1, col=1
-        )
-    
-    # SMAs
-    if 'sma' in indicators:
-        sma = indicators['sma']
-        if sma['sma_50'] is not None:
-            fig.add_trace(
-                go.Scatter(x=data.index, y=sma['sma_50_series'], name='SMA 50',
-                          line=dict(color='blue')),
-                row=1, col=1
-            )
-        if sma['sma_200'] is not None:
-            fig.add_trace(
-                go.Scatter(x=data.index, y=sma['sma_200_series'], name='SMA 200',
-                          line=dict(color='red')),
-                row=1, col=1
-            )
-    
-    # MACD
-    if 'macd' in indicators:
-        macd = indicators['macd']
-        fig.add_trace(
-            go.Scatter(x=data.index, y=macd['macd_series'], name='MACD',
-                      line=dict(color='blue')),
-            row=2, col=1
-        )
-        fig.add_trace(
-            go.Scatter(x=data.index, y=macd['signal_series'], name='Signal',
-                      line=dict(color='red')),
-            row=2, col=1
-        )
-        fig.add_trace(
-            go.Bar(x=data.index, y=macd['histogram_series'], name='Histogram',
-                  marker_color='gray'),
-            row=2, col=1
-        )
-    
-    # RSI
-    if 'rsi' in indicators:
-        rsi = indicators['rsi']
-        fig.add_trace(
-            go.Scatter(x=data.index, y=rsi['series'], name='RSI',
-                      line=dict(color='purple')),
-            row=3, col=1
-        )
-        fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
-        fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
-    
-    # Volume
-    if 'volume' in indicators:
-        colors = ['red' if data['Close'].iloc[i] < data['Open'].iloc[i] else 'green' 
-                 for i in range(len(data))]
-        fig.add_trace(
-            go.Bar(x=data.index, y=data['Volume'], name='Volume',
-                  marker_color=colors),
-            row=4, col=1
-        )
-    
-    fig.update_layout(
-        height=1000,
-        showlegend=True,
-        xaxis_rangeslider_visible=False,
-        hovermode='x unified'
-    )
-    
-    fig.update_xaxes(title_text="Date", row=4, col=1)
-    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-    fig.update_yaxes(title_text="MACD", row=2, col=1)
-    fig.update_yaxes(title_text="RSI", row=3, col=1)
-    fig.update_yaxes(title_text="Volume", row=4, col=1)
-    
-    return fig
+@st.cache_resource
+def get_analysis_service() -> 'AnalysisService':
+    """Shared analysis service (one per process)."""
+    from analysis_service import AnalysisService
+    # Simulated paths only feed the chart and its percentiles, where float32 is plenty
+    return AnalysisService(precision='float32')
 
 
-def create_monte_carlo_chart(simulation_results: dict):
-    """Create Monte Carlo simulation visualization."""
-    simulations = simulation_results['simulations']
-    days = simulation_results['days']
-    current_price = simulation_results['current_price']
-    
-    fig = go.Figure()
-    
-    # Plot subset of simulations (for performance)
-    sample_size = min(100, len(simulations))
-    indices = np.random.choice(len(simulations), sample_size, replace=False)
-    
-    for idx in indices:
-        fig.add_trace(
-            go.Scatter(
-                x=list(range(days)),
-                y=simulations[idx],
-                mode='lines',
-                line=dict(color='lightblue', width=0.5),
-                showlegend=False,
-                opacity=0.3
-            )
-        )
-    
-    # Add median line
-    median_path = np.median(simulations, axis=0)
-    fig.add_trace(
-        go.Scatter(
-            x=list(range(days)),
-            y=median_path,
-            mode='lines',
-            name='Median',
-            line=dict(color='blue', width=3)
-        )
-    )
-    
-    # Add starting price
-    fig.add_hline(y=current_price, line_dash="dash", line_color="black",
-                  annotation_text=f"Current: ${current_price:.2f}")
-    
-    fig.update_layout(
-        title="Monte Carlo Simulation (1000 iterations)",
-        xaxis_title="Days",
-        yaxis_title="Price ($)",
-        height=500,
-        hovermode='x unified'
-    )
-    
-    return fig
+@st.cache_resource(show_spinner=False)
+def get_sentiment_analyzer() -> 'SentimentIntensityAnalyzer':
+    """VADER analyzer with its lexicon loaded (one per process)."""
+    from news_sentiment import get_sentiment_analyzer as load_analyzer
+    return load_analyzer()
 
 
-def generate_signal_reasoning(score_results: dict, indicators: dict, stock_info: dict) -> str:
-    """Generate detailed reasoning for the trading signal."""
-    signal = score_results['signal']
-    score = score_results['score']
-    breakdown = score_results['breakdown']
-    
-    reasoning = f"### 🧠 Signal Reasoning\n\n"
-    reasoning += f"**Overall Score: {score}/100** ({score_results['confidence']} confidence)\n\n"
-    
-    # Explain score calculation
-    reasoning += "#### 📊 Score Breakdown\n\n"
-    reasoning += "Each indicator contributes to the total score based on its importance for your selected timeframe:\n\n"
-    
-    for indicator_name, details in breakdown.items():
-        weighted = details['weighted']
-        max_score = details['max']
-        percentage = (weighted / max_score * 100) if max_score > 0 else 0
-        reasoning += f"**{indicator_name.upper()}:** {weighted:.0f}/{max_score} points ({percentage:.0f}% efficiency)\n"
-    
-    reasoning += f"\n**Total:** {score}/100\n\n"
-    
-    # Count bullish vs bearish signals
-    bullish_count = 0
-    bearish_count = 0
-    neutral_count = 0
-    
-    for ind_name, ind_data in indicators.items():
-        if 'signal' in ind_data:
-            sig = ind_data['signal']
-            if 'BULLISH' in sig or 'ABOVE' in sig or 'HIGH VOLUME' in sig:
-                bullish_count += 1
-            elif 'BEARISH' in sig or 'BELOW' in sig or 'LOW VOLUME' in sig:
-                bearish_count += 1
-            else:
-                neutral_count += 1
-    
-    total_signals = bullish_count + bearish_count + neutral_count
-    
-    reasoning += "---\n\n"
-    reasoning += f"#### 🎯 Why **{signal}**?\n\n"
-    reasoning += f"**Market Consensus:** {bullish_count} bullish / {bearish_count} bearish / {neutral_count} neutral signals\n\n"
-    
-    if "BUY" in signal:
-        reasoning += "**✅ Strong Buy Case:**\n\n"
-        reasoning += f"The score of {score}/100 indicates a favorable risk/reward setup. Here's why:\n\n"
-        
-        # Detailed indicator explanations
-        if 'rsi' in indicators:
-            rsi_val = indicators['rsi']['value']
-            if rsi_val < 40:
-                reasoning += f"**RSI ({rsi_val:.1f}):** Oversold territory suggests the stock has been sold off aggressively and may be due for a bounce. Historically, RSI below 40 often precedes short-term recoveries.\n\n"
-            elif rsi_val < 60:
-                reasoning += f"**RSI ({rsi_val:.1f}):** In neutral zone with room to run higher. Not showing overbought conditions, which means momentum can continue building.\n\n"
-        
-        if 'macd' in indicators and indicators['macd']['signal'] == 'BULLISH':
-            reasoning += f"**MACD:** Bullish crossover detected (histogram: {indicators['macd']['histogram']:.2f}). This signals that short-term momentum is accelerating above the longer-term trend. When MACD crosses above its signal line, it often precedes price increases.\n\n"
-        
-        if 'bollinger' in indicators:
-            bb_sig = indicators['bollinger']['signal']
-            if 'LOWER' in bb_sig:
-                reasoning += f"**Bollinger Bands:** Price near lower band (${indicators['bollinger']['lower']:.2f}). Statistically, prices tend to revert to the middle band (${indicators['bollinger']['middle']:.2f}), suggesting potential upside of {((indicators['bollinger']['middle'] - stock_info['current_price']) / stock_info['current_price'] * 100):.1f}%.\n\n"
-            elif 'ABOVE' in bb_sig:
-                reasoning += f"**Bollinger Bands:** Price above middle band shows bullish momentum. Current trend is upward.\n\n"
-        
-        if 'volume' in indicators and 'HIGH' in indicators['volume']['signal']:
-            reasoning += f"**Volume:** {indicators['volume']['change_pct']:+.1f}% above average. High volume confirms genuine buying interest and validates the move. This isn't a low-conviction rally.\n\n"
-        
-        reasoning += f"**📈 Bottom Line:** With {bullish_count}/{total_signals} indicators bullish and a score above threshold, the technical setup favors entry at current levels.\n"
-        
-    elif "SELL" in signal:
-        reasoning += "**⚠️ Warning Signs:**\n\n"
-        reasoning += f"The score of {score}/100 is below safe thresholds. Here's why this is risky:\n\n"
-        
-        if 'rsi' in indicators and indicators['rsi']['value'] > 70:
-            reasoning += f"**RSI ({indicators['rsi']['value']:.1f}):** Severely overbought. When RSI exceeds 70, it indicates excessive buying that typically leads to pullbacks. The stock is statistically \"expensive\" at current levels.\n\n"
-        
-        if 'macd' in indicators and indicators['macd']['signal'] == 'BEARISH':
-            reasoning += f"**MACD:** Bearish crossover (histogram: {indicators['macd']['histogram']:.2f}). Momentum has turned negative. Short-term trend is now weaker than long-term, signaling potential decline.\n\n"
-        
-        if 'sma' in indicators and 'BEARISH' in indicators['sma']['signal']:
-            reasoning += f"**Moving Averages:** Price below key support levels. This confirms downtrend. Breaking below moving averages often triggers further selling.\n\n"
-        
-        if 'volume' in indicators and 'LOW' in indicators['volume']['signal']:
-            reasoning += f"**Volume:** {indicators['volume']['change_pct']:.1f}% below average. Low volume during price moves suggests weak conviction and potential reversal.\n\n"
-        
-        reasoning += f"**📉 Bottom Line:** With {bearish_count}/{total_signals} bearish signals and score below {score}, risk significantly outweighs potential reward. Better opportunities elsewhere.\n"
-        
-    else:  # HOLD
-        reasoning += "**⏸️ Mixed Signals - No Clear Edge:**\n\n"
-        reasoning += f"The score of {score}/100 falls in the neutral zone. Here's the dilemma:\n\n"
-        
-        reasoning += f"**Bullish factors ({bullish_count}):**\n"
-        if 'macd' in indicators and 'BULLISH' in indicators['macd']['signal']:
-            reasoning += f"- MACD showing positive momentum\n"
-        if 'volume' in indicators and 'HIGH' in indicators['volume']['signal']:
-            reasoning += f"- Strong volume confirms participation\n"
-        if 'bollinger' in indicators and 'ABOVE' in indicators['bollinger']['signal']:
-            reasoning += f"- Price above middle Bollinger Band\n"
-        
-        reasoning += f"\n**Bearish/Neutral factors ({bearish_count + neutral_count}):**\n"
-        if 'rsi' in indicators and 40 <= indicators['rsi']['value'] <= 60:
-            reasoning += f"- RSI neutral (~{indicators['rsi']['value']:.0f}) - no clear bias\n"
-        if 'sma' in indicators and 'INSUFFICIENT' in indicators['sma']['signal']:
-            reasoning += f"- Trend unclear (insufficient data)\n"
-        
-        reasoning += f"\n**⚖️ Bottom Line:** Not enough bullish confirmation to justify entry, but not bearish enough to avoid completely. Wait for {score + 10}-{score + 15} score (clearer setup) or {score - 10}-{score - 15} (clear avoidance). Patience beats forcing trades.\n"
-    
-    return reasoning
+@st.cache_data(ttl=300, show_spinner=False)
+def run_analysis(ticker: str, timeframe: str, risk_tolerance: str) -> 'AnalysisResult':
+    """Run (or reuse for 5 minutes) the analysis for the selected settings."""
+    return get_analysis_service().analyze(ticker, timeframe, risk_tolerance, include_series=True)
 
 
-def generate_bull_reasoning(scenarios: dict, indicators: dict) -> str:
-    """Generate reasoning for bull case."""
-    bull = scenarios['bull']
-    bear = scenarios['bear']
-    
-    is_more_likely = bull['probability'] > bear['probability']
-    
-    reasoning = f"### 🟢 Bull Case Analysis\n\n"
-    
-    # Adjust tone based on probability
-    if is_more_likely:
-        reasoning += f"**Probability: {bull['probability']:.1f}%** (More likely scenario)\n"
-        reasoning += f"**Upside Target:** ${bull['target']:.2f} ({bull['change_pct']:+.1f}%)\n\n"
-        reasoning += "📈 **Why this scenario is favored:**\n\n"
-    else:
-        reasoning += f"**Probability: {bull['probability']:.1f}%** (Less likely, but possible)\n"
-        reasoning += f"**Upside Target:** ${bull['target']:.2f} ({bull['change_pct']:+.1f}%)\n\n"
-        reasoning += "📊 **What would need to happen:**\n\n"
-    
-    # Count bullish indicators
-    bullish_count = 0
-    bullish_factors = []
-    
-    if 'rsi' in indicators:
-        rsi = indicators['rsi']['value']
-        if rsi < 40:
-            bullish_factors.append(f"**RSI Oversold ({rsi:.1f}):** Significant bounce potential from oversold levels. Historically, RSI below 40 sees reversals within 1-5 days in ~65% of cases.")
-            bullish_count += 1
-        elif rsi < 55:
-            bullish_factors.append(f"**RSI Neutral ({rsi:.1f}):** Room to appreciate without hitting overbought resistance at 70. Can sustain upward momentum.")
-            bullish_count += 1
-    
-    if 'macd' in indicators and indicators['macd']['signal'] == 'BULLISH':
-        bullish_factors.append(f"**MACD Crossover:** Bullish momentum confirmed. Histogram at {indicators['macd']['histogram']:.2f} shows acceleration. Short-term trend now outpacing long-term, which typically continues for 3-7 days.")
-        bullish_count += 1
-    
-    if 'bollinger' in indicators:
-        bb = indicators['bollinger']
-        if 'LOWER' in bb['signal']:
-            potential = ((bb['middle'] - bb['current']) / bb['current'] * 100)
-            bullish_factors.append(f"**Bollinger Band Reversion:** Price near lower band (${bb['lower']:.2f}). Mean reversion to middle band (${bb['middle']:.2f}) would yield {potential:.1f}% gain. Statistically, 70% of touches revert.")
-            bullish_count += 1
-        elif 'ABOVE' in bb['signal']:
-            bullish_factors.append(f"**Bollinger Bands:** Price above middle confirms uptrend. Bulls in control.")
-            bullish_count += 1
-    
-    if 'sma' in indicators and 'BULLISH' in indicators['sma']['signal']:
-        bullish_factors.append(f"**Moving Average Support:** Price trading above SMA 50 (${indicators['sma']['sma_50']:.2f}). This acts as support level and confirms trend direction.")
-        bullish_count += 1
-    
-    if 'volume' in indicators and 'HIGH' in indicators['volume']['signal']:
-        bullish_factors.append(f"**Volume Confirmation:** {indicators['volume']['change_pct']:+.1f}% above average. Institutional buying or retail FOMO supports sustainable move, not just noise.")
-        bullish_count += 1
-    
-    # Add factors
-    for i, factor in enumerate(bullish_factors, 1):
-        reasoning += f"{i}. {factor}\n\n"
-    
-    if not bullish_factors:
-        reasoning += "*No strong bullish catalysts detected currently. This scenario relies on external factors (news, sector rotation, market sentiment shift) rather than technical setup.*\n\n"
-    
-    # Conclusion based on probability
-    reasoning += "---\n\n"
-    if is_more_likely:
-        reasoning += f"**✅ Verdict:** {bullish_count}/5 technical factors support upside. Monte Carlo simulation ({bull['probability']:.1f}% probability) confirms this as the **primary scenario**. "
-        if bull['change_pct'] > 2:
-            reasoning += f"Target of {bull['change_pct']:+.1f}% offers solid risk/reward."
-        else:
-            reasoning += f"Modest {bull['change_pct']:+.1f}% target suggests limited upside - manage expectations."
-    else:
-        reasoning += f"**⚠️ Verdict:** Only {bullish_count}/5 factors support upside. {bull['probability']:.1f}% probability makes this the **secondary scenario**. While possible, "
-        reasoning += f"the odds favor the bear case. Would need stronger confirmation (more bullish signals) to justify betting on this outcome."
-    
-    reasoning += f"\n\n*{bull['description']}*\n"
-    
-    return reasoning
-
-
-def generate_bear_reasoning(scenarios: dict, indicators: dict) -> str:
-    """Generate reasoning for bear case."""
-    bear = scenarios['bear']
-    bull = scenarios['bull']
-    
-    is_more_likely = bear['probability'] > bull['probability']
-    
-    reasoning = f"### 🔴 Bear Case Analysis\n\n"
-    
-    # Adjust tone based on probability
-    if is_more_likely:
-        reasoning += f"**Probability: {bear['probability']:.1f}%** (More likely scenario)\n"
-        reasoning += f"**Downside Risk:** ${bear['target']:.2f} ({bear['change_pct']:.1f}%)\n\n"
-        reasoning += "📉 **Why this scenario is favored:**\n\n"
-    else:
-        reasoning += f"**Probability: {bear['probability']:.1f}%** (Less likely, but still a risk)\n"
-        reasoning += f"**Downside Risk:** ${bear['target']:.2f} ({bear['change_pct']:.1f}%)\n\n"
-        reasoning += "⚠️ **Risk factors to monitor:**\n\n"
-    
-    # Count bearish indicators
-    bearish_count = 0
-    bearish_factors = []
-    
-    if 'rsi' in indicators:
-        rsi = indicators['rsi']['value']
-        if rsi > 70:
-            bearish_factors.append(f"**RSI Overbought ({rsi:.1f}):** Extreme overbought. RSI above 70 typically precedes 2-5% pullbacks within days. Stock is statistically \"expensive\" and due for mean reversion.")
-            bearish_count += 1
-        elif rsi > 60:
-            bearish_factors.append(f"**RSI Elevated ({rsi:.1f}):** Approaching overbought zone. Limited room to run before hitting resistance at 70. Any negative catalyst could trigger selling.")
-            bearish_count += 1
-    
-    if 'macd' in indicators and indicators['macd']['signal'] == 'BEARISH':
-        bearish_factors.append(f"**MACD Bearish Crossover:** Momentum turned negative. Histogram at {indicators['macd']['histogram']:.2f} shows deceleration. Short-term trend now underperforming long-term - classic topping signal.")
-        bearish_count += 1
-    
-    if 'bollinger' in indicators:
-        bb = indicators['bollinger']
-        if 'UPPER' in bb['signal']:
-            potential_drop = ((bb['current'] - bb['middle']) / bb['current'] * 100)
-            bearish_factors.append(f"**Bollinger Band Extension:** Price at upper band (${bb['upper']:.2f}). Mean reversion to middle (${bb['middle']:.2f}) would mean {potential_drop:.1f}% decline. Price has stretched too far from average.")
-            bearish_count += 1
-    
-    if 'sma' in indicators and 'BEARISH' in indicators['sma']['signal']:
-        bearish_factors.append(f"**Moving Average Breakdown:** Price below SMA 50 (${indicators['sma']['sma_50']:.2f}). Lost key support. Traders use this as stop-loss level, triggering cascading selling.")
-        bearish_count += 1
-    
-    if 'volume' in indicators:
-        vol = indicators['volume']
-        if 'LOW' in vol['signal'] or vol['change_pct'] < -20:
-            bearish_factors.append(f"**Volume Weakness:** {vol['change_pct']:.1f}% below average. Low conviction in current price. Moves without volume often reverse quickly.")
-            bearish_count += 1
-    
-    # Add factors
-    for i, factor in enumerate(bearish_factors, 1):
-        reasoning += f"{i}. {factor}\n\n"
-    
-    if not bearish_factors:
-        reasoning += "*No strong bearish signals detected. This scenario would require external shock (bad news, sector weakness, market crash) rather than technical deterioration.*\n\n"
-    
-    # Conclusion based on probability
-    reasoning += "---\n\n"
-    if is_more_likely:
-        reasoning += f"**🚨 Verdict:** {bearish_count}/5 technical factors point to downside risk. Monte Carlo simulation ({bear['probability']:.1f}% probability) confirms this as the **primary scenario**. "
-        if abs(bear['change_pct']) > 2:
-            reasoning += f"Potential {bear['change_pct']:.1f}% drop is significant - risk management critical."
-        else:
-            reasoning += f"Modest {bear['change_pct']:.1f}% downside, but still the more likely path."
-        reasoning += " Consider waiting for better entry or tightening stop-losses."
-    else:
-        reasoning += f"**✅ Verdict:** Only {bearish_count}/5 factors suggest downside. {bear['probability']:.1f}% probability makes this the **secondary scenario**. "
-        reasoning += f"While risk exists, the odds favor the bull case. Monitor these factors but don't let fear override favorable setup. "
-        reasoning += "Use stop-loss below key support to protect against this outcome."
-    
-    reasoning += f"\n\n*{bear['description']}*\n"
-    
-    return reasoning
+def get_timeframe_days(timeframe: str) -> int:
+    """Get number of days for Monte Carlo simulation based on timeframe."""
+    from analysis_service import TIMEFRAME_DAYS
+    return TIMEFRAME_DAYS.get(timeframe.split('-')[0].lower(), 7)
 
 
+@timed('app.display_summary')
 def display_summary(stock_info: dict, score_results: dict, scenarios: dict, timeframe: str, indicators: dict):
     """Display summary view."""
     st.markdown("---")
@@ -633,6 +224,7 @@ def display_summary(stock_info: dict, score_results: dict, scenarios: dict, time
             st.markdown(bear_reasoning)
 
 
+@timed('app.display_detailed_analysis')
 def display_detailed_analysis(indicators: dict, score_results: dict, stock_info: dict):
     """Display detailed technical analysis."""
     st.markdown("---")
@@ -878,6 +470,46 @@ def display_detailed_analysis(indicators: dict, score_results: dict, stock_info:
                     st.metric("Score", f"{score_results['breakdown']['volume']['weighted']:.0f}/{score_results['breakdown']['volume']['max']}")
 
 
+def show_ticker_hint(ticker: str):
+    """Show the company for a known ticker, or autocomplete suggestions (no network)."""
+    from symbols import get_symbol_directory
+    
+    if not ticker:
+        return
+    directory = get_symbol_directory()
+    entry = directory.get(ticker)
+    if entry is not None:
+        st.sidebar.caption(f"{entry.name} · {entry.exchange}")
+        return
+    suggestions = directory.complete(ticker, limit=5)
+    if suggestions:
+        st.sidebar.caption("Did you mean: " + ", ".join(f"**{s.symbol}** ({s.name})" for s in suggestions))
+
+
+def show_profiling_panel(request_trace: profiling.Trace):
+    """Show the per-request timing waterfall in the sidebar (debug)."""
+    import pandas as pd
+    from charts import create_waterfall_chart
+    
+    rows = request_trace.waterfall()
+    
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(f"### ⏱️ Timing: {request_trace.total_ms:,.0f} ms")
+    if not rows:
+        st.sidebar.caption("No stages recorded (results came from cache).")
+        return
+    
+    st.sidebar.plotly_chart(create_waterfall_chart(rows), use_container_width=True)
+    
+    slowest = pd.DataFrame(rows).sort_values('duration_ms', ascending=False).head(10)
+    st.sidebar.dataframe(slowest[['name', 'duration_ms', 'start_ms']], hide_index=True)
+    
+    st.sidebar.download_button("⬇️ Stage metrics (Prometheus)", profiling.prometheus_text(),
+                               file_name="stage_metrics.prom", mime="text/plain")
+    st.sidebar.download_button("⬇️ Request trace (JSON)", json.dumps(rows, indent=2),
+                               file_name="trace.json", mime="application/json")
+
+
 def main():
     """Main application."""
     # Show disclaimer first
@@ -891,10 +523,11 @@ def main():
     st.sidebar.header("⚙️ Analysis Settings")
     
     ticker = st.sidebar.text_input("Stock Ticker", "AAPL", help="Enter stock symbol (e.g., AAPL, TSLA, NVDA)").upper()
+    show_ticker_hint(ticker)
     
     timeframe_options = ["Short-term (1-7 days)", "Medium-term (1-4 weeks)", "Long-term (1-6 months)"]
     timeframe_display = st.sidebar.selectbox("⏱️ Trading Timeframe", timeframe_options)
-    timeframe = timeframe_display.split()[0].lower()  # Extract 'short', 'medium', or 'long'
+    timeframe = timeframe_display.split('-')[0].lower()  # Extract 'short', 'medium', or 'long'
     
     risk_options = ["Conservative", "Moderate", "Aggressive"]
     risk_tolerance = st.sidebar.selectbox("🎲 Risk Tolerance", risk_options).lower()
@@ -905,46 +538,33 @@ def main():
     st.sidebar.markdown("---")
     st.sidebar.warning("⚠️ **Educational use only**\n\nNot financial advice")
     
+    # Debug: per-stage timing for this session's analyses only (the default follows STOCK_ANALYZER_PROFILE)
+    show_timing = st.sidebar.checkbox("🛠️ Show timing waterfall", value=profiling.is_enabled(),
+                                      help="Time each analysis stage and show a waterfall after the analysis")
+    
     # Main analysis
     if analyze_button:
         if not ticker:
             st.error("Please enter a stock ticker symbol.")
             return
         
-        with st.spinner(f"Analyzing {ticker}..."):
-            # Fetch data
-            fetcher = DataFetcher(ticker)
+        with profiling.trace(f"analyze {ticker}", enable=show_timing) as request_trace, st.spinner(f"Analyzing {ticker}..."):
+            with span('app.run_analysis'):
+                result = run_analysis(ticker, timeframe, risk_tolerance)
             
-            # Validate ticker
-            if not fetcher.validate_ticker():
-                st.error(f"❌ Invalid ticker symbol: {ticker}")
-                st.info("Please check the ticker and try again.")
+            if not result.ok:
+                st.error(f"❌ {result.error}")
+                if result.error.startswith("Invalid ticker"):
+                    st.info("Please check the ticker and try again.")
                 return
             
-            # Get stock info
-            stock_info = fetcher.get_stock_info()
-            stock_info['ticker'] = ticker
-            
-            # Fetch historical data
-            data = fetcher.fetch_data(timeframe)
-            
-            if data is None or data.empty:
-                st.error(f"❌ Could not fetch data for {ticker}")
-                return
-            
-            # Calculate indicators
-            indicator_calc = TechnicalIndicators(data)
-            indicators = indicator_calc.calculate_all()
-            
-            # Calculate score
-            scorer = ScoringSystem(timeframe, risk_tolerance)
-            score_results = scorer.calculate_score(indicators, stock_info)
-            
-            # Run Monte Carlo simulation
+            stock_info = result.stock_info
+            score_results = result.score_results()
+            scenarios = result.scenario_dicts()
+            data = result.series.data
+            indicators = result.series.indicators
+            simulation_results = result.series.simulation
             days = get_timeframe_days(timeframe_display)
-            mc_sim = MonteCarloSimulator(data)
-            simulation_results = mc_sim.run_simulation(days, stock_info['current_price'])
-            scenarios = mc_sim.get_scenarios(simulation_results)
             
             # Display results
             display_summary(stock_info, score_results, scenarios, timeframe_display, indicators)
@@ -953,46 +573,47 @@ def main():
             st.markdown("---")
             st.markdown("## 💡 RECOMMENDATION")
             
+            recommendation = result.recommendation
             col1, col2 = st.columns([2, 1])
             with col1:
-                signal = score_results['signal']
+                signal = recommendation.action
                 
                 if "BUY" in signal:
                     st.success(f"**Action:** {signal}")
-                    st.write(f"**Entry Range:** ${stock_info['current_price'] * 0.99:.2f} - ${stock_info['current_price'] * 1.01:.2f}")
-                    st.write(f"**Target:** ${scenarios['bull']['target']:.2f} ({scenarios['bull']['change_pct']:+.1f}%)")
-                    st.write(f"**Stop-Loss:** ${stock_info['current_price'] * 0.97:.2f}")
-                    
-                    if risk_tolerance == "conservative":
-                        st.write("**Position Size:** 2-3% of portfolio")
-                    elif risk_tolerance == "aggressive":
-                        st.write("**Position Size:** 7-10% of portfolio")
-                    else:
-                        st.write("**Position Size:** 3-5% of portfolio")
+                    st.write(f"**Entry Range:** ${recommendation.entry_low:.2f} - ${recommendation.entry_high:.2f}")
+                    st.write(f"**Target:** ${recommendation.target:.2f} ({recommendation.target_change_pct:+.1f}%)")
+                    st.write(f"**Stop-Loss:** ${recommendation.stop_loss:.2f}")
+                    risk = result.simulation
+                    st.write(f"**Stop hit before target:** {risk['stop_first_probability']:.0f}% of simulated paths "
+                             f"(target first: {risk['target_first_probability']:.0f}%, "
+                             f"median max drawdown: {risk['max_drawdown_median']:.1f}%)")
+                    st.write(f"**Position Size:** {recommendation.position_size}")
                     
                 elif "SELL" in signal:
                     st.error(f"**Action:** {signal}")
-                    st.write("Consider exiting position or avoiding entry at this time.")
+                    st.write(recommendation.note)
                     
                 else:  # HOLD
                     st.warning(f"**Action:** {signal}")
-                    st.write("Wait for better entry opportunity or maintain current position.")
+                    st.write(recommendation.note)
             
             with col2:
-                risk_reward = abs(scenarios['bull']['change_pct'] / scenarios['bear']['change_pct']) if scenarios['bear']['change_pct'] != 0 else 0
-                st.metric("Risk/Reward Ratio", f"1:{risk_reward:.1f}")
+                st.metric("Risk/Reward Ratio", f"1:{recommendation.risk_reward:.1f}")
             
             # Charts
+            from charts import create_price_chart, create_monte_carlo_chart
+            
             st.markdown("---")
             st.markdown("## 📊 INTERACTIVE CHARTS")
             
             tab1, tab2, tab3, tab4 = st.tabs(["Price & Indicators", "📈 Fundamentals", "📰 News & Sentiment", "Monte Carlo Simulation"])
             
-            with tab1:
+            with tab1, span('app.tab.price'):
                 price_chart = create_price_chart(data, indicators, stock_info['name'])
-                st.plotly_chart(price_chart, use_container_width=True)
+                with span('app.plotly_chart.price'):
+                    st.plotly_chart(price_chart, use_container_width=True)
             
-            with tab4:
+            with tab4, span('app.tab.monte_carlo'):
                 st.markdown("### 🎲 Monte Carlo Simulation Results")
                 
                 col1, col2, col3, col4 = st.columns(4)
@@ -1006,7 +627,20 @@ def main():
                     st.metric("90th Percentile", f"${simulation_results['percentile_90']:.2f}")
                 
                 mc_chart = create_monte_carlo_chart(simulation_results)
-                st.plotly_chart(mc_chart, use_container_width=True)
+                with span('app.plotly_chart.monte_carlo'):
+                    st.plotly_chart(mc_chart, use_container_width=True)
+                
+                st.markdown("#### Scenarios by Horizon")
+                import pandas as pd
+                horizon_rows = [{
+                    'Horizon': f"{stats['days']} days",
+                    'Median': f"${stats['median_price']:.2f}",
+                    '10th-90th Percentile': f"${stats['percentile_10']:.2f} - ${stats['percentile_90']:.2f}",
+                    'Bull Probability': f"{stats['bull_probability']:.1f}%",
+                    'Bull Target': f"${stats['bull_target']:.2f}",
+                    'Bear Target': f"${stats['bear_target']:.2f}",
+                } for stats in result.horizons.values()]
+                st.dataframe(pd.DataFrame(horizon_rows), hide_index=True)
                 
                 st.info(f"""
                 **Simulation Parameters:**
@@ -1016,12 +650,13 @@ def main():
                 - Daily Volatility: {simulation_results['volatility']*100:.2f}%
                 """)
             
-            with tab3:
+            with tab3, span('app.tab.news'):
                 st.markdown("### 📰 News & Sentiment Analysis")
                 
                 with st.spinner("Fetching latest news..."):
                     # Fetch and analyze news
-                    news_analyzer = NewsSentimentAnalyzer(ticker)
+                    from news_sentiment import NewsSentimentAnalyzer
+                    news_analyzer = NewsSentimentAnalyzer(ticker, analyzer=get_sentiment_analyzer())
                     news_data = news_analyzer.get_news_with_sentiment(limit=10)
                     
                     if 'error' in news_data:
@@ -1131,13 +766,14 @@ def main():
                         Sentiment analysis provides context but should be combined with technical analysis for trading decisions.
                         """)
             
-            with tab2:
+            with tab2, span('app.tab.fundamentals'):
                 st.markdown("### 📈 Fundamental Analysis")
                 st.markdown("**Long-term investment evaluation based on company fundamentals**")
                 
                 with st.spinner("Fetching fundamental data..."):
                     # Fetch fundamental data
-                    fund_analyzer = FundamentalAnalyzer(ticker)
+                    from fundamentals import FundamentalAnalyzer
+                    fund_analyzer = FundamentalAnalyzer(ticker, store=get_fundamentals_store())
                     fundamentals = fund_analyzer.fetch_fundamentals()
                     health_score, analysis = fund_analyzer.calculate_health_score(fundamentals)
                     
@@ -1468,6 +1104,25 @@ def main():
                         else:
                             st.metric("52-Week Range", "N/A")
                     
+                    # Sector Peer Percentiles (from cached snapshots)
+                    from fundamentals_store import SectorPeerEngine, PEER_METRICS
+                    peer_engine = SectorPeerEngine.from_store(get_fundamentals_store())
+                    percentiles = peer_engine.ticker_percentiles(ticker)
+                    ranked = {m: p for m, p in percentiles.items() if p is not None}
+                    if len(peer_engine.frame) > 1 and ranked:
+                        st.markdown("---")
+                        st.markdown("#### 🏭 Sector Peer Percentiles")
+                        st.caption(f"Ranked against {len(peer_engine.frame) - 1} cached peers "
+                                   f"(sector-level when at least {peer_engine.min_peers} peers are cached)")
+                        
+                        cols = st.columns(4)
+                        for i, (metric, pct) in enumerate(ranked.items()):
+                            higher_is_better = PEER_METRICS[metric][1]
+                            favorable = pct if higher_is_better else 100 - pct
+                            color = "🟢" if favorable >= 66 else ("🟡" if favorable >= 33 else "🔴")
+                            with cols[i % 4]:
+                                st.metric(f"{color} {metric.replace('_', ' ').title()}", f"{pct:.0f}th pct")
+                    
                     # Investment Insights
                     st.markdown("---")
                     st.markdown("#### 💡 Long-Term Investment Insights")
@@ -1597,6 +1252,9 @@ def main():
             
             # Detailed analysis
             display_detailed_analysis(indicators, score_results, stock_info)
+        
+        if show_timing and request_trace is not None:
+            show_profiling_panel(request_trace)
     
     else:
         # Initial state - show instructions
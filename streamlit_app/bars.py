@@ -0,0 +1,159 @@
+"""
+Bar intervals and OHLCV resampling.
+
+Coarser bars are derived from a finer base series instead of being
+downloaded separately: 5m bars give 15m/30m/1h/1d, daily bars give weekly
+and monthly. Bins are found once from the index and aggregated with NumPy
+ufunc.reduceat (first open, max high, min low, last close, summed volume).
+
+Intraday bins are anchored at the session open found in the data, so 1h
+bars start at 9:30 like Yahoo's rather than on the clock hour. Daily,
+weekly (Monday) and monthly bins use the index's local calendar.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Supported intervals, finest first, with their bar length in minutes
+# (trading-calendar intervals use nominal lengths for ordering only)
+INTERVAL_MINUTES: Dict[str, int] = {
+    '1m': 1,
+    '2m': 2,
+    '5m': 5,
+    '15m': 15,
+    '30m': 30,
+    '1h': 60,
+    '1d': 24 * 60,
+    '1wk': 7 * 24 * 60,
+    '1mo': 31 * 24 * 60,
+}
+
+INTRADAY_INTERVALS = ('1m', '2m', '5m', '15m', '30m', '1h')
+
+# Longest history Yahoo serves per interval (days); None is unlimited
+MAX_LOOKBACK_DAYS: Dict[str, Optional[int]] = {
+    '1m': 7,
+    '2m': 60,
+    '5m': 60,
+    '15m': 60,
+    '30m': 60,
+    '1h': 730,
+    '1d': None,
+    '1wk': None,
+    '1mo': None,
+}
+
+# Other spellings yfinance accepts
+INTERVAL_ALIASES = {'60m': '1h'}
+
+
+def normalize_interval(interval: str) -> str:
+    """
+    Canonical interval name.
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    interval = INTERVAL_ALIASES.get(interval.lower(), interval.lower())
+    if interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval: {interval} (use one of {', '.join(INTERVAL_MINUTES)})")
+    return interval
+
+
+def can_resample(base: str, target: str) -> bool:
+    """True if bars at `target` can be built from bars at `base`."""
+    if base == target:
+        return True
+    if INTERVAL_MINUTES[base] >= INTERVAL_MINUTES[target]:
+        return False
+    if target in INTRADAY_INTERVALS:
+        return INTERVAL_MINUTES[target] % INTERVAL_MINUTES[base] == 0
+    # Any finer series aggregates into calendar bars
+    return True
+
+
+def period_days(period: str) -> float:
+    """Approximate length of a yfinance period string in calendar days ('max' is infinite)."""
+    if period == 'max':
+        return float('inf')
+    if period == 'ytd':
+        return 366.0
+    for suffix, days in (('mo', 30.5), ('wk', 7.0), ('d', 1.0), ('y', 365.25)):
+        if period.endswith(suffix):
+            return int(period[:-len(suffix)]) * days
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def clamp_period(period: str, interval: str) -> str:
+    """Shorten a period to what Yahoo serves for an interval."""
+    limit = MAX_LOOKBACK_DAYS[interval]
+    if limit is None or period_days(period) <= limit:
+        return period
+    return f"{limit}d"
+
+
+_MINUTE_NS = 60 * 10 ** 9
+_DAY_NS = 24 * 60 * _MINUTE_NS
+
+
+def _bin_starts(wall_ns: np.ndarray, interval: str) -> np.ndarray:
+    """Bin start (local wall-clock ns since epoch) of each timestamp."""
+    day = wall_ns - wall_ns % _DAY_NS
+    if interval in INTRADAY_INTERVALS:
+        # Minutes since local midnight, binned from the session open
+        minutes = (wall_ns - day) // _MINUTE_NS
+        session_open = minutes.min()
+        width = INTERVAL_MINUTES[interval]
+        return day + (session_open + (minutes - session_open) // width * width) * _MINUTE_NS
+    if interval == '1d':
+        return day
+    if interval == '1wk':
+        # 1970-01-01 was a Thursday: Monday-based weekday is (days + 3) % 7
+        return day - ((day // _DAY_NS + 3) % 7) * _DAY_NS
+    return wall_ns.astype('datetime64[ns]').astype('datetime64[M]').astype('datetime64[ns]').view(np.int64)
+
+
+def resample_ohlcv(frame: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into coarser bars.
+
+    Args:
+        frame: Bars sorted by time (Open, High, Low, Close, Volume; other
+            numeric columns such as Dividends are summed)
+        interval: Target interval (see INTERVAL_MINUTES)
+
+    Returns:
+        DataFrame indexed by bin start; bins without data are omitted
+    """
+    interval = normalize_interval(interval)
+    frame = frame[frame['Close'].notna()] if frame['Close'].hasnans else frame
+    if frame.empty:
+        return frame
+
+    # Work on local wall-clock time so days and sessions follow the exchange calendar
+    index = frame.index
+    wall = index.tz_localize(None) if index.tz is not None else index
+    codes = _bin_starts(wall.as_unit('ns').asi8, interval)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    bin_index = pd.DatetimeIndex(codes[starts].view('datetime64[ns]'), name=index.name)
+    if index.tz is not None:
+        bin_index = bin_index.tz_localize(index.tz)
+
+    columns = {}
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        if column == 'Open':
+            columns[column] = values[starts]
+        elif column == 'Close':
+            columns[column] = values[ends]
+        elif column == 'High':
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low':
+            columns[column] = np.fmin.reduceat(values, starts)
+        elif np.issubdtype(values.dtype, np.number):
+            columns[column] = np.add.reduceat(values, starts)
+        else:
+            columns[column] = values[ends]
+    return pd.DataFrame(columns, index=bin_index)
@@ -0,0 +1,512 @@
+"""
+Offline benchmark suite for the analysis hot paths.
+
+Times indicators and indicator kernels, scoring, Monte Carlo simulation (fixed and
+adaptive path counts, streamed path risk, return models, float64/float32 paths and
+the closed-form statistics), bar resampling, chart building and sentiment scoring on
+fixture data (synthetic, or a recorded OHLCV file), and compares the results against a
+JSON baseline. Benchmarks slower than the baseline by more than the tolerance are
+flagged as regressions. --memory also records each benchmark's peak allocation.
+
+Usage:
+    python -m benchmark                      # run and compare with the baseline
+    python -m benchmark --save               # run and overwrite the baseline
+    python -m benchmark --filter monte_carlo --tolerance 0.5
+    python -m benchmark --data recorded/AAPL.parquet
+    python -m benchmark --filter simulate_paths --memory   # float64 vs float32 paths
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fixtures import load_ohlcv, synthetic_info, synthetic_news, synthetic_ohlcv
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'baseline.json')
+
+INDICATOR_SIZES = (60, 500, 2520)
+SIMULATION_DAYS = (7, 28, 180)
+SIMULATION_SIZES = [(iterations, days) for iterations in (1000, 10000) for days in SIMULATION_DAYS]
+NEWS_SIZES = (10, 100)
+
+BENCH_TICKER = 'BENCH'
+
+# name -> setup function returning the zero-argument callable to time
+Setup = Callable[[], Callable[[], Any]]
+BENCHMARKS: Dict[str, Setup] = {}
+
+# Recorded OHLCV data (set by --data); synthetic data is used otherwise
+_recorded: Optional[pd.DataFrame] = None
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark setup function."""
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def price_data(days: int) -> pd.DataFrame:
+    """Fixture OHLCV data with (up to) the given number of rows."""
+    if _recorded is not None:
+        return _recorded.tail(days)
+    return synthetic_ohlcv(days)
+
+
+def _register_indicators(days: int):
+    @benchmark(f'indicators.calculate_all[{days}d]')
+    def setup():
+        from indicators import TechnicalIndicators
+        data = price_data(days)
+        return lambda: TechnicalIndicators(data).calculate_all()
+
+
+def _register_scoring(timeframe: str):
+    @benchmark(f'scoring.calculate_score[{timeframe}]')
+    def setup():
+        from factors import FactorCache
+        from indicators import TechnicalIndicators
+        from scoring import ScoringSystem
+
+        indicators = TechnicalIndicators(price_data(500)).calculate_all()
+        stock_info = synthetic_info(BENCH_TICKER)
+        # Pre-filled factor scores keep provider factors off the network
+        cache = FactorCache(ttl=float('inf'))
+        cache.set('sentiment', BENCH_TICKER, 60)
+        cache.set('sec_filings', BENCH_TICKER, 55)
+        scorer = ScoringSystem(timeframe, 'moderate', factor_cache=cache)
+        return lambda: scorer.calculate_score(indicators, stock_info)
+
+
+def _register_simulation(iterations: int, days: int):
+    @benchmark(f'monte_carlo.run_simulation[{iterations}x{days}d]')
+    def setup():
+        from monte_carlo import MonteCarloSimulator
+        data = price_data(500)
+        simulator = MonteCarloSimulator(data, iterations=iterations)
+        current_price = float(data['Close'].iloc[-1])
+        return lambda: simulator.run_simulation(days, current_price)
+
+
+def _register_adaptive(days: int):
+    @benchmark(f'monte_carlo.run_adaptive[{days}d]')
+    def setup():
+        from monte_carlo import MonteCarloSimulator
+        data = price_data(500)
+        current_price = float(data['Close'].iloc[-1])
+        return lambda: MonteCarloSimulator(data, seed=0).run_adaptive(days, current_price)
+
+
+@benchmark('monte_carlo.run_path_risk[10000x180d]')
+def _path_risk():
+    from monte_carlo import MonteCarloSimulator
+    data = price_data(500)
+    current_price = float(data['Close'].iloc[-1])
+    simulator = MonteCarloSimulator(data, iterations=10000, seed=0)
+    return lambda: simulator.run_path_risk(180, current_price)
+
+
+@benchmark('monte_carlo.run_simulation[10000x7d+28d+180d]')
+def _horizons():
+    from monte_carlo import MonteCarloSimulator
+    data = price_data(500)
+    current_price = float(data['Close'].iloc[-1])
+    simulator = MonteCarloSimulator(data, iterations=10000)
+    # Compare with run_simulation[10000x180d]: the shorter horizons come from the same paths
+    return lambda: simulator.run_simulation(7, current_price, horizons=SIMULATION_DAYS)
+
+
+@benchmark('monte_carlo.run_simulation[garch 100000x180d]')
+def _garch():
+    from garch import GarchStore
+    from monte_carlo import MonteCarloSimulator
+    data = price_data(500)
+    current_price = float(data['Close'].iloc[-1])
+    simulator = MonteCarloSimulator(data, iterations=100000, model='garch', ticker=BENCH_TICKER, store=GarchStore())
+    # Fitted once in setup, as for a ticker already in the store
+    simulator.garch_parameters()
+    return lambda: simulator.run_simulation(180, current_price)
+
+
+@benchmark('monte_carlo.run_simulation[jump 10000x180d]')
+def _jumps():
+    from monte_carlo import MonteCarloSimulator
+    data = price_data(500)
+    current_price = float(data['Close'].iloc[-1])
+    simulator = MonteCarloSimulator(data, iterations=10000, model='jump', earnings_day=20)
+    simulator.jump_parameters()
+    return lambda: simulator.run_simulation(180, current_price)
+
+
+def _register_precision(precision: str):
+    @benchmark(f'monte_carlo.simulate_paths[{precision} 100000x180d]')
+    def setup():
+        from monte_carlo import MonteCarloSimulator
+        data = price_data(500)
+        current_price = float(data['Close'].iloc[-1])
+        simulator = MonteCarloSimulator(data, seed=0, precision=precision)
+        return lambda: simulator.simulate_paths(100000, 180, current_price)
+
+
+def _register_analytic(days: int):
+    @benchmark(f'monte_carlo.run_analytic[{days}d]')
+    def setup():
+        from monte_carlo import MonteCarloSimulator
+        data = price_data(500)
+        current_price = float(data['Close'].iloc[-1])
+        # Includes estimating drift/volatility, as for each ticker of a screen
+        return lambda: MonteCarloSimulator(data).run_analytic(days, current_price)
+
+
+def _register_sentiment(count: int):
+    @benchmark(f'sentiment.get_news_with_sentiment[{count}]')
+    def setup():
+        from news_sentiment import NewsSentimentAnalyzer
+
+        articles = synthetic_news(count)
+
+        class FixtureNewsAnalyzer(NewsSentimentAnalyzer):
+            def fetch_news(self, limit: int = 10):
+                return [dict(article) for article in articles[:limit]]
+
+        analyzer = FixtureNewsAnalyzer(BENCH_TICKER)
+        return lambda: analyzer.get_news_with_sentiment(limit=count)
+
+
+for _days in INDICATOR_SIZES:
+    _register_indicators(_days)
+for _timeframe in ('short', 'medium', 'long'):
+    _register_scoring(_timeframe)
+for _iterations, _days in SIMULATION_SIZES:
+    _register_simulation(_iterations, _days)
+for _precision in ('float64', 'float32'):
+    _register_precision(_precision)
+for _days in SIMULATION_DAYS:
+    _register_analytic(_days)
+    _register_adaptive(_days)
+for _count in NEWS_SIZES:
+    _register_sentiment(_count)
+
+
+@benchmark('sentiment.analyzer_init')
+def _sentiment_init():
+    from news_sentiment import NewsSentimentAnalyzer
+    return lambda: NewsSentimentAnalyzer(BENCH_TICKER)
+
+
+@benchmark('sentiment.lexicon_load')
+def _sentiment_lexicon():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer
+
+
+@benchmark('charts.create_price_chart[500d]')
+def _price_chart():
+    from charts import create_price_chart
+    from indicators import TechnicalIndicators
+    data = price_data(500)
+    indicators = TechnicalIndicators(data).calculate_all()
+    return lambda: create_price_chart(data, indicators, 'Bench Corp')
+
+
+@benchmark('charts.create_monte_carlo_chart[1000x28d]')
+def _monte_carlo_chart():
+    from charts import create_monte_carlo_chart
+    from monte_carlo import MonteCarloSimulator
+    data = price_data(500)
+    simulation = MonteCarloSimulator(data, iterations=1000).run_simulation(28, float(data['Close'].iloc[-1]))
+    return lambda: create_monte_carlo_chart(simulation)
+
+
+def _register_resample(interval: str):
+    @benchmark(f'bars.resample_ohlcv[5m->{interval}]')
+    def setup():
+        from bars import resample_ohlcv
+        from fixtures import synthetic_intraday
+        data = synthetic_intraday(40, 5)
+        return lambda: resample_ohlcv(data, interval)
+
+
+for _interval in ('1h', '1d'):
+    _register_resample(_interval)
+
+
+# Kernel throughput: 20 years of daily bars, 1 year of 1-minute bars, and a
+# 20-year daily panel of 50 tickers
+KERNEL_DATASETS = ('20y-1d', '1y-1m', '20y-1d-x50')
+
+
+def kernel_data(dataset: str) -> Dict[str, Any]:
+    """High/Low/Close/Volume (Series, or dates x tickers DataFrames) for a kernel benchmark."""
+    from fixtures import synthetic_intraday
+    if dataset == '1y-1m':
+        frame = synthetic_intraday(252, 1)
+    elif dataset == '20y-1d':
+        frame = synthetic_ohlcv(20 * 252)
+    else:
+        frames = [synthetic_ohlcv(20 * 252, seed=seed) for seed in range(50)]
+        return {field: pd.concat([f[field] for f in frames], axis=1, ignore_index=True)
+                for field in ('High', 'Low', 'Close', 'Volume')}
+    return {field: frame[field] for field in ('High', 'Low', 'Close', 'Volume')}
+
+
+# Benchmark name -> (kernels function, input columns)
+KERNELS = {
+    'stochastic': ('stochastic', ('High', 'Low', 'Close')),
+    'atr': ('average_true_range', ('High', 'Low', 'Close')),
+    'adx': ('average_directional_index', ('High', 'Low', 'Close')),
+    'obv': ('on_balance_volume', ('Close', 'Volume')),
+    'vwap': ('vwap', ('High', 'Low', 'Close', 'Volume')),
+}
+
+
+def _register_kernel(name: str, dataset: str):
+    @benchmark(f'kernels.{name}[{dataset}]')
+    def setup():
+        import kernels
+        function, columns = KERNELS[name]
+        data = kernel_data(dataset)
+        args = [data[column] for column in columns]
+        return lambda: getattr(kernels, function)(*args)
+
+
+for _name in KERNELS:
+    for _dataset in KERNEL_DATASETS:
+        _register_kernel(_name, _dataset)
+
+
+@benchmark('analysis_service.analyze[replay]')
+def _replay_analysis():
+    import atexit
+    import shutil
+    import tempfile
+    from analysis_service import AnalysisService
+    from fixtures import FixtureProvider
+    from providers import RecordingProvider, ReplayProvider
+
+    directory = tempfile.mkdtemp(prefix='bench-recordings-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    recorder = RecordingProvider(directory, inner=FixtureProvider())
+    AnalysisService(iterations=10, provider=recorder).analyze(BENCH_TICKER, 'short')
+    service = AnalysisService(iterations=1000, provider=ReplayProvider(directory))
+    return lambda: service.analyze(BENCH_TICKER, 'short')
+
+
+def time_callable(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    Each of the repeat rounds runs the callable enough times to take at
+    least min_time seconds; the per-call time of each round is recorded.
+
+    Args:
+        func: Zero-argument callable
+        repeat: Number of timing rounds
+        min_time: Minimum seconds per round
+
+    Returns:
+        Dictionary with median_ms, min_ms, number (calls per round), repeat
+    """
+    start = time.perf_counter()
+    func()  # warm-up, also estimates the cost
+    estimate = max(time.perf_counter() - start, 1e-6)
+    number = max(1, int(min_time / estimate))
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number * 1000)
+
+    return {
+        'median_ms': round(float(np.median(rounds)), 4),
+        'min_ms': round(float(np.min(rounds)), 4),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def peak_memory(func: Callable[[], Any]) -> float:
+    """Peak memory (MiB) allocated by one call, NumPy arrays included (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(pattern: Optional[str] = None, repeat: int = 5,
+                   verbose: bool = True, memory: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Run registered benchmarks.
+
+    Args:
+        pattern: Only run benchmarks whose name contains this substring
+        repeat: Timing rounds per benchmark
+        verbose: Print each result as it completes
+        memory: Also record the peak memory of one call ('peak_mib'), measured
+            after the timing rounds so tracing does not slow them
+
+    Returns:
+        Dictionary of benchmark name -> timing
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        func = setup()
+        timing = time_callable(func, repeat=repeat)
+        if memory:
+            timing['peak_mib'] = peak_memory(func)
+        results[name] = timing
+        if verbose:
+            peak = f" {timing['peak_mib']:>10.1f} MiB" if memory else ''
+            print(f"{name:<48} {timing['median_ms']:>10.3f} ms{peak}", file=sys.stderr)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and library versions a run was made with."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpus': os.cpu_count(),
+        'data': 'recorded' if _recorded is not None else 'synthetic',
+    }
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Dict[str, Any]:
+    """Load a baseline file (empty if missing)."""
+    if not os.path.exists(path):
+        return {'environment': {}, 'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = DEFAULT_BASELINE,
+                  merge: bool = True):
+    """
+    Write results as the new baseline.
+
+    Args:
+        results: Output of run_benchmarks()
+        path: Baseline file
+        merge: Keep baseline entries for benchmarks that were not run
+    """
+    baseline = load_baseline(path) if merge else {'results': {}}
+    baseline['environment'] = environment()
+    baseline['results'] = {**baseline.get('results', {}), **results}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+            tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Output of run_benchmarks()
+        baseline: Output of load_baseline()
+        tolerance: Allowed slowdown as a fraction of the baseline median
+
+    Returns:
+        One row per benchmark with name, baseline_ms, current_ms, change_pct
+        and status ('ok', 'regression', 'faster' or 'new')
+    """
+    rows = []
+    for name, timing in results.items():
+        current = timing['median_ms']
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            rows.append({'name': name, 'baseline_ms': None, 'current_ms': current,
+                         'change_pct': None, 'status': 'new'})
+            continue
+
+        change = current / base['median_ms'] - 1 if base['median_ms'] > 0 else 0.0
+        if change > tolerance:
+            status = 'regression'
+        elif change < -tolerance:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline_ms': base['median_ms'], 'current_ms': current,
+                     'change_pct': round(change * 100, 1), 'status': status})
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """Format comparison rows as a text table."""
+    lines = [f"{'Benchmark':<48} {'Baseline':>12} {'Current':>12} {'Change':>9}  Status"]
+    for row in rows:
+        base = f"{row['baseline_ms']:.3f} ms" if row['baseline_ms'] is not None else '-'
+        change = f"{row['change_pct']:+.1f}%" if row['change_pct'] is not None else '-'
+        flag = '✗ ' if row['status'] == 'regression' else ''
+        lines.append(f"{row['name']:<48} {base:>12} {row['current_ms']:>9.3f} ms {change:>9}  "
+                     f"{flag}{row['status'].upper()}")
+    return '\n'.join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(prog='python -m benchmark',
+                                     description='Benchmark the analysis hot paths offline.')
+    parser.add_argument('--filter', help='Only run benchmarks containing this text')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds per benchmark')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='Write results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before flagging (0.25 = 25%%)')
+    parser.add_argument('--data', help='Recorded OHLCV file (CSV or Parquet) instead of synthetic data')
+    parser.add_argument('--memory', action='store_true', help='Also record peak memory per call')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite."""
+    global _recorded
+    args = parse_args(argv)
+
+    if args.list:
+        print('\n'.join(BENCHMARKS))
+        return 0
+    if args.data:
+        _recorded = load_ohlcv(args.data)
+
+    results = run_benchmarks(args.filter, args.repeat, memory=args.memory)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Saved {len(results)} results to {args.baseline}", file=sys.stderr)
+        return 0
+
+    rows = compare(results, load_baseline(args.baseline), args.tolerance)
+    print(format_report(rows))
+
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
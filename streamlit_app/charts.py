@@ -0,0 +1,202 @@
+"""
+Chart builders for the Streamlit app.
+Plotly figures for price/indicator history and Monte Carlo paths.
+"""
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import pandas as pd
+import numpy as np
+
+from profiling import timed
+
+
+@timed()
+def create_price_chart(data: pd.DataFrame, indicators: dict, stock_name: str):
+    """Create interactive price chart with indicators."""
+    fig = make_subplots(
+        rows=4, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        subplot_titles=(f'{stock_name} Price & Bollinger Bands', 'MACD', 'RSI', 'Volume'),
+        row_heights=[0.5, 0.15, 0.15, 0.2]
+    )
+    
+    # Price and Bollinger Bands
+    fig.add_trace(
+        go.Candlestick(
+            x=data.index,
+            open=data['Open'],
+            high=data['High'],
+            low=data['Low'],
+            close=data['Close'],
+            name='Price'
+        ),
+        row=1, col=1
+    )
+    
+    if 'bollinger' in indicators:
+        bb = indicators['bollinger']
+        fig.add_trace(
+            go.Scatter(x=data.index, y=bb['upper_series'], name='BB Upper',
+                      line=dict(color='gray', dash='dash')),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=data.index, y=bb['middle_series'], name='BB Middle',
+                      line=dict(color='orange')),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=data.index, y=bb['lower_series'], name='BB Lower',
+                      line=dict(color='gray', dash='dash')),
+            row=1, col=1
+        )
+    
+    # SMAs
+    if 'sma' in indicators:
+        sma = indicators['sma']
+        if sma['sma_50'] is not None:
+            fig.add_trace(
+                go.Scatter(x=data.index, y=sma['sma_50_series'], name='SMA 50',
+                          line=dict(color='blue')),
+                row=1, col=1
+            )
+        if sma['sma_200'] is not None:
+            fig.add_trace(
+                go.Scatter(x=data.index, y=sma['sma_200_series'], name='SMA 200',
+                          line=dict(color='red')),
+                row=1, col=1
+            )
+    
+    # MACD
+    if 'macd' in indicators:
+        macd = indicators['macd']
+        fig.add_trace(
+            go.Scatter(x=data.index, y=macd['macd_series'], name='MACD',
+                      line=dict(color='blue')),
+            row=2, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=data.index, y=macd['signal_series'], name='Signal',
+                      line=dict(color='red')),
+            row=2, col=1
+        )
+        fig.add_trace(
+            go.Bar(x=data.index, y=macd['histogram_series'], name='Histogram',
+                  marker_color='gray'),
+            row=2, col=1
+        )
+    
+    # RSI
+    if 'rsi' in indicators:
+        rsi = indicators['rsi']
+        fig.add_trace(
+            go.Scatter(x=data.index, y=rsi['series'], name='RSI',
+                      line=dict(color='purple')),
+            row=3, col=1
+        )
+        fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
+        fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
+    
+    # Volume
+    if 'volume' in indicators:
+        colors = ['red' if data['Close'].iloc[i] < data['Open'].iloc[i] else 'green' 
+                 for i in range(len(data))]
+        fig.add_trace(
+            go.Bar(x=data.index, y=data['Volume'], name='Volume',
+                  marker_color=colors),
+            row=4, col=1
+        )
+    
+    fig.update_layout(
+        height=1000,
+        showlegend=True,
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified'
+    )
+    
+    fig.update_xaxes(title_text="Date", row=4, col=1)
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    fig.update_yaxes(title_text="MACD", row=2, col=1)
+    fig.update_yaxes(title_text="RSI", row=3, col=1)
+    fig.update_yaxes(title_text="Volume", row=4, col=1)
+    
+    return fig
+
+
+@timed()
+def create_monte_carlo_chart(simulation_results: dict):
+    """Create Monte Carlo simulation visualization."""
+    simulations = simulation_results['simulations']
+    days = simulation_results['days']
+    current_price = simulation_results['current_price']
+    
+    fig = go.Figure()
+    
+    # Plot subset of simulations (for performance)
+    sample_size = min(100, len(simulations))
+    indices = np.random.choice(len(simulations), sample_size, replace=False)
+    
+    for idx in indices:
+        fig.add_trace(
+            go.Scatter(
+                x=list(range(days)),
+                y=simulations[idx],
+                mode='lines',
+                line=dict(color='lightblue', width=0.5),
+                showlegend=False,
+                opacity=0.3
+            )
+        )
+    
+    # Add median line
+    median_path = np.median(simulations, axis=0)
+    fig.add_trace(
+        go.Scatter(
+            x=list(range(days)),
+            y=median_path,
+            mode='lines',
+            name='Median',
+            line=dict(color='blue', width=3)
+        )
+    )
+    
+    # Add starting price
+    fig.add_hline(y=current_price, line_dash="dash", line_color="black",
+                  annotation_text=f"Current: ${current_price:.2f}")
+    
+    fig.update_layout(
+        title="Monte Carlo Simulation (1000 iterations)",
+        xaxis_title="Days",
+        yaxis_title="Price ($)",
+        height=500,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+
+def create_waterfall_chart(spans: list):
+    """Create a timing waterfall from profiling spans (one bar per span, nested by depth)."""
+    labels = [f"{'· ' * span['depth']}{span['name']}" for span in spans]
+    
+    fig = go.Figure(
+        go.Bar(
+            y=labels,
+            x=[span['duration_ms'] for span in spans],
+            base=[span['start_ms'] for span in spans],
+            orientation='h',
+            marker_color=[span['depth'] for span in spans],
+            hovertemplate='%{y}<br>start %{base:.1f} ms<br>%{x:.1f} ms<extra></extra>'
+        )
+    )
+    
+    fig.update_layout(
+        xaxis_title="ms",
+        yaxis=dict(autorange='reversed', tickfont=dict(size=9)),
+        height=max(250, 18 * len(spans) + 80),
+        margin=dict(l=10, r=10, t=10, b=40),
+        showlegend=False
+    )
+    
+    return fig
@@ -0,0 +1,222 @@
+"""
+Headless command-line runner for the analysis pipeline.
+
+Runs DataFetcher -> TechnicalIndicators -> ScoringSystem -> MonteCarloSimulator
+for a list of tickers without importing Streamlit or Plotly, so it starts fast
+enough for cron jobs.
+
+Usage:
+    python -m cli AAPL MSFT NVDA --timeframe medium --format csv -o results.csv
+    python -m cli --file tickers.txt --workers 8 --format parquet -o results.parquet
+    python -m cli AAPL MSFT --record recordings/    # capture responses for offline replay
+    python -m cli AAPL MSFT --replay recordings/    # no network
+    python -m cli AAPL --interval 1h                 # hourly indicators and scoring
+    python -m cli AAPL --model garch                 # GARCH(1,1) volatility in the simulation
+    python -m cli AAPL --model jump                  # jumps, plus the next earnings gap
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import profiling
+from bars import INTERVAL_MINUTES
+from analysis_service import AnalysisResult, AnalysisService, TIMEFRAMES, RISK_LEVELS
+from monte_carlo import RETURN_MODELS
+from providers import configure_provider
+
+
+def flatten_result(result: AnalysisResult) -> Dict[str, Any]:
+    """
+    Flatten an AnalysisResult into one record for CSV/Parquet output.
+
+    Args:
+        result: Result from AnalysisService.analyze()
+
+    Returns:
+        Flat dictionary of plain Python values
+    """
+    record: Dict[str, Any] = {
+        'ticker': result.ticker,
+        'timeframe': result.timeframe,
+        'risk_tolerance': result.risk_tolerance,
+        'interval': result.interval,
+        'error': result.error,
+        'elapsed_ms': result.elapsed_ms,
+    }
+    if not result.ok:
+        return record
+
+    data = result.to_dict()
+    record.update({
+        'name': data['stock_info'].get('name'),
+        'current_price': data['stock_info'].get('current_price'),
+        'score': data['score'],
+        'signal': data['signal'],
+        'confidence': data['confidence'],
+    })
+    for name, details in data['breakdown'].items():
+        record[f'score_{name}'] = details['score']
+    for name, ind in data['indicators'].items():
+        record[f'signal_{name}'] = ind.get('signal')
+    # Indicators the history is too short for are skipped (empty cells)
+    record['rsi'] = data['indicators'].get('rsi', {}).get('value')
+    record['macd_histogram'] = data['indicators'].get('macd', {}).get('histogram')
+    for key, value in data['simulation'].items():
+        record[f'mc_{key}'] = value
+    for key, value in data['recommendation'].items():
+        record[f'rec_{key}'] = value
+
+    return record
+
+
+def run_analysis(ticker: str, timeframe: str = 'short', risk_tolerance: str = 'moderate',
+                 iterations: int = 1000, interval: str = '1d', model: str = 'normal') -> Dict[str, Any]:
+    """
+    Run the full analysis pipeline for one ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        timeframe: 'short', 'medium', or 'long'
+        risk_tolerance: 'conservative', 'moderate', or 'aggressive'
+        iterations: Monte Carlo iterations
+        interval: Bar interval for indicators and scoring
+        model: Monte Carlo return model ('normal', 'garch' or 'jump')
+
+    Returns:
+        Flat dictionary of results (an 'error' key is set on failure)
+    """
+    service = AnalysisService(iterations=iterations, return_model=model)
+    result = service.analyze(ticker, timeframe, risk_tolerance, interval=interval)
+    return flatten_result(result)
+
+
+def run_batch(tickers: List[str], timeframe: str = 'short', risk_tolerance: str = 'moderate',
+              iterations: int = 1000, workers: int = 4, processes: bool = False,
+              interval: str = '1d', model: str = 'normal') -> List[Dict[str, Any]]:
+    """
+    Analyze many tickers with a worker pool.
+
+    Args:
+        tickers: Ticker symbols
+        timeframe: 'short', 'medium', or 'long'
+        risk_tolerance: 'conservative', 'moderate', or 'aggressive'
+        iterations: Monte Carlo iterations
+        workers: Pool size
+        processes: Use a process pool instead of threads
+        interval: Bar interval for indicators and scoring
+        model: Monte Carlo return model ('normal', 'garch' or 'jump')
+
+    Returns:
+        List of result records in input order
+    """
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_analysis, ticker, timeframe, risk_tolerance, iterations, interval, model)
+            for ticker in tickers
+        ]
+        return [future.result() for future in futures]
+
+
+def write_results(records: List[Dict[str, Any]], fmt: str, output: Optional[str]):
+    """
+    Write result records as JSON, CSV or Parquet.
+
+    Args:
+        records: Result records
+        fmt: 'json', 'csv', or 'parquet'
+        output: Output path (stdout if None; not supported for Parquet)
+    """
+    if fmt == 'json':
+        text = json.dumps(records, indent=2, default=str)
+        if output:
+            with open(output, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text)
+        return
+
+    import pandas as pd
+    frame = pd.DataFrame.from_records(records)
+
+    if fmt == 'csv':
+        if output:
+            frame.to_csv(output, index=False)
+        else:
+            frame.to_csv(sys.stdout, index=False)
+    elif fmt == 'parquet':
+        if not output:
+            raise ValueError("Parquet output requires --output")
+        frame.to_parquet(output, index=False)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Run the stock analysis pipeline headless (educational use only).'
+    )
+    parser.add_argument('tickers', nargs='*', help='Ticker symbols (e.g., AAPL MSFT)')
+    parser.add_argument('--file', help='File with one ticker per line')
+    parser.add_argument('--timeframe', choices=TIMEFRAMES, default='short')
+    parser.add_argument('--risk', choices=RISK_LEVELS, default='moderate')
+    parser.add_argument('--interval', choices=tuple(INTERVAL_MINUTES), default='1d',
+                        help='Bar interval for indicators and scoring (Monte Carlo stays daily)')
+    parser.add_argument('--iterations', type=int, default=1000, help='Monte Carlo iterations')
+    parser.add_argument('--model', choices=RETURN_MODELS, default='normal',
+                        help='Monte Carlo return model (garch: volatility clustering, '
+                             'jump: jumps and the next earnings gap)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker pool size')
+    parser.add_argument('--processes', action='store_true', help='Use processes instead of threads')
+    parser.add_argument('--format', choices=('json', 'csv', 'parquet'), default='json')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print per-stage timings to stderr (thread workers only)')
+    data = parser.add_mutually_exclusive_group()
+    data.add_argument('--record', metavar='DIR', help='Record yfinance responses to DIR')
+    data.add_argument('--replay', metavar='DIR', help='Serve recorded responses from DIR (no network)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI."""
+    args = parse_args(argv)
+    if args.record or args.replay:
+        configure_provider('record' if args.record else 'replay', args.record or args.replay)
+    if args.profile:
+        profiling.enable()
+
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not tickers:
+        print("No tickers given.", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    records = run_batch(tickers, args.timeframe, args.risk, args.iterations,
+                        args.workers, args.processes, args.interval, args.model)
+    write_results(records, args.format, args.output)
+
+    failed = [r['ticker'] for r in records if r['error']]
+    print(f"Analyzed {len(records) - len(failed)}/{len(records)} tickers in "
+          f"{time.perf_counter() - start:.1f}s", file=sys.stderr)
+    if failed:
+        print(f"Failed: {', '.join(failed)}", file=sys.stderr)
+    if args.profile:
+        print(f"\n{'Stage':<46} {'Calls':>6} {'Total':>11} {'Mean':>10}", file=sys.stderr)
+        for stage, data in profiling.metrics.snapshot().items():
+            print(f"{stage:<46} {data['count']:>6} {data['total_ms']:>8.1f} ms {data['mean_ms']:>7.2f} ms",
+                  file=sys.stderr)
+
+    return 0 if len(failed) < len(records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
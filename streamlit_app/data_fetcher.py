@@ -1,60 +1,122 @@
 """
 Data fetcher module using yfinance for stock data.
 """
-import yfinance as yf
+import math
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from bars import (INTERVAL_MINUTES, MAX_LOOKBACK_DAYS, can_resample, clamp_period,
+                  normalize_interval, period_days, resample_ohlcv)
+from lookback import history_bars, history_period
+from providers import DataProvider, get_provider, slice_history
+from profiling import timed
+from symbols import SymbolDirectory, get_symbol_directory
 
 
 class DataFetcher:
-    """Fetches stock data using yfinance."""
+    """Fetches stock data using yfinance (or another data provider)."""
     
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, provider: Optional[DataProvider] = None,
+                 symbols: Optional[SymbolDirectory] = None):
         """
         Initialize data fetcher.
         
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
+            provider: Data provider (defaults to the process-wide provider)
+            symbols: Symbol directory with the negative cache (defaults to the shared one)
         """
         self.ticker = ticker.upper()
-        self.stock = None
+        self.provider = provider or get_provider()
+        self.symbols = symbols or get_symbol_directory()
         self.info = None
+        # Downloaded base series: interval -> (days covered, bars)
+        self._bars: Dict[str, Tuple[float, pd.DataFrame]] = {}
         
-    def fetch_data(self, timeframe: str = "short") -> Optional[pd.DataFrame]:
+    @timed()
+    def fetch_data(self, timeframe: str = "short", interval: str = "1d") -> Optional[pd.DataFrame]:
         """
         Fetch historical stock data based on timeframe.
         
         Args:
             timeframe: 'short', 'medium', or 'long'
+            interval: Bar interval ('5m', '1h', '1d', '1wk', ...)
             
         Returns:
-            DataFrame with OHLCV data or None if error
+            DataFrame with OHLCV data (the bars the timeframe's analysis needs,
+            see lookback.history_bars) or None if error
         """
-        try:
-            self.stock = yf.Ticker(self.ticker)
-            
-            # Determine period based on timeframe
-            period_map = {
-                "short": "60d",    # 60 days for short-term (need history for indicators)
-                "medium": "6mo",   # 6 months for medium-term
-                "long": "2y"       # 2 years for long-term
-            }
+        return self.fetch_intervals(timeframe, [interval])[normalize_interval(interval)]
+    
+    @timed()
+    def fetch_intervals(self, timeframe: str, intervals: List[str],
+                        bars: Optional[Dict[str, int]] = None) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch bars at several intervals with as few downloads as possible.
+        
+        Intervals are fetched finest first. A download covers the longest
+        history of all requested intervals it can be resampled into (within
+        its lookback limit, e.g. 5m: 60 days); coarser intervals are then
+        resampled from it. Intervals it cannot cover are downloaded on their own.
+        
+        Args:
+            timeframe: 'short', 'medium', or 'long'
+            intervals: Bar intervals
+            bars: Interval -> number of bars to return (default: what the
+                timeframe's analysis needs at that interval, see lookback.py)
             
-            period = period_map.get(timeframe, "60d")
+        Returns:
+            Dictionary of interval -> DataFrame with OHLCV data (None if error)
+        """
+        wanted = sorted({normalize_interval(i) for i in intervals}, key=INTERVAL_MINUTES.get)
+        bars = {i: (bars or {}).get(i) or history_bars(timeframe, i)[i] for i in wanted}
+        periods = {i: history_period(bars[i], i) for i in wanted}
+        
+        results = {}
+        for interval in wanted:
+            limit = MAX_LOOKBACK_DAYS[interval]
+            download = max((period_days(periods[i]) for i in wanted
+                            if can_resample(interval, i) and (limit is None or period_days(periods[i]) <= limit)),
+                           default=period_days(periods[interval]))
+            data = self._fetch_bars(interval, periods[interval], f"{math.ceil(download)}d")
+            results[interval] = data.tail(bars[interval]) if data is not None else None
+        return results
+    
+    def _fetch_bars(self, interval: str, period: str, download: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Bars for one interval, resampled from a stored base series when one covers the period.
+        
+        Args:
+            interval: Bar interval
+            period: History needed
+            download: Longer period to request if a download is needed (so the
+                series can serve other intervals too)
+        """
+        days = period_days(period)
+        try:
+            # Coarsest stored series that can produce this interval (fewest rows to aggregate)
+            for base in sorted(self._bars, key=INTERVAL_MINUTES.get, reverse=True):
+                covered, frame = self._bars[base]
+                if covered >= days and can_resample(base, interval):
+                    bars = frame if base == interval else resample_ohlcv(frame, interval)
+                    bars = slice_history(bars, period) if covered > days else bars
+                    return bars if not bars.empty else None
             
-            # Fetch data
-            data = self.stock.history(period=period)
+            fetch_period = clamp_period(download or period, interval)
+            data = self.provider.history(self.ticker, period=fetch_period, interval=interval)
             
             if data.empty:
                 return None
-                
+            
+            self._bars[interval] = (period_days(fetch_period), data)
             return data
             
         except Exception as e:
-            print(f"Error fetching data for {self.ticker}: {e}")
+            print(f"Error fetching {interval} data for {self.ticker}: {e}")
             return None
     
+    @timed()
     def get_stock_info(self) -> Dict[str, Any]:
         """
         Get stock information (company name, price, etc.).
@@ -63,10 +125,10 @@ class DataFetcher:
             Dictionary with stock info
         """
         try:
-            if self.stock is None:
-                self.stock = yf.Ticker(self.ticker)
-            
-            info = self.stock.info
+            # Reuse the info already fetched by validate_ticker()
+            if self.info is None:
+                self.info = self.provider.info(self.ticker)
+            info = self.info
             
             # Extract relevant info
             return {
@@ -97,21 +159,30 @@ class DataFetcher:
                 'revenue_growth': 0,
             }
     
+    @timed()
     def validate_ticker(self) -> bool:
         """
         Validate if ticker exists and has data.
         
+        Recent misses (and symbols missing from an authoritative directory)
+        are rejected without a request; new misses are remembered.
+        
         Returns:
             True if valid, False otherwise
         """
+        if self.symbols.is_known_miss(self.ticker):
+            return False
+        
         try:
-            stock = yf.Ticker(self.ticker)
-            info = stock.info
+            info = self.provider.info(self.ticker)
+            self.info = info
             
             # Check if we got valid data
             if 'regularMarketPrice' in info or 'currentPrice' in info:
                 return True
+            self.symbols.record_miss(self.ticker)
             return False
             
-        except:
+        except Exception as e:
+            print(f"Error validating {self.ticker}: {e}")
             return False
@@ -0,0 +1,213 @@
+"""
+Factor providers for the scoring system.
+
+Factors that are not derived from technical indicators (news sentiment, SEC
+filings, ...) are computed by providers registered here. A provider takes a
+ticker, the stock info dict and the data provider of the analysis (None for
+the process-wide provider) and returns a 0-100 score, or None when no data
+is available.
+"""
+import contextvars
+import threading
+import time
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from profiling import span
+from providers import DataProvider, get_provider
+
+FactorProvider = Callable[[str, Dict[str, Any], Optional[DataProvider]], Optional[int]]
+# Cache key: factor name, ticker and data provider (None for the process-wide one)
+CacheKey = Tuple[str, str, Optional[DataProvider]]
+
+_PROVIDERS: Dict[str, FactorProvider] = {}
+
+
+def register_factor(name: str) -> Callable[[FactorProvider], FactorProvider]:
+    """
+    Register a factor provider under a weight name.
+
+    Args:
+        name: Weight key in ScoringSystem.WEIGHTS (e.g., 'sentiment')
+
+    Returns:
+        Decorator registering the provider function
+    """
+    def decorator(provider: FactorProvider) -> FactorProvider:
+        _PROVIDERS[name] = provider
+        return provider
+    return decorator
+
+
+def get_factor_provider(name: str) -> Optional[FactorProvider]:
+    """Get the provider registered for a factor, if any."""
+    return _PROVIDERS.get(name)
+
+
+class FactorCache:
+    """Thread-safe per-ticker and per-data-provider cache of factor scores with a time-to-live."""
+
+    def __init__(self, ttl: float = 900):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds before a cached factor score expires
+        """
+        self.ttl = ttl
+        self._entries: Dict[CacheKey, Tuple[float, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, ticker: str,
+            provider: Optional[DataProvider] = None) -> Tuple[bool, Optional[int]]:
+        """
+        Look up a cached score.
+
+        Args:
+            name: Factor name
+            ticker: Stock ticker symbol
+            provider: Data provider the score was computed from (None for the process-wide one)
+
+        Returns:
+            Tuple of (hit, score)
+        """
+        with self._lock:
+            entry = self._entries.get((name, ticker, provider))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return False, None
+        return True, entry[1]
+
+    def set(self, name: str, ticker: str, score: Optional[int],
+            provider: Optional[DataProvider] = None):
+        """Store a score computed from a data provider (None for the process-wide one)."""
+        with self._lock:
+            self._entries[(name, ticker, provider)] = (time.monotonic(), score)
+
+    def clear(self):
+        """Drop all cached scores."""
+        with self._lock:
+            self._entries.clear()
+
+
+default_cache = FactorCache()
+
+
+def evaluate_factors(ticker: str, names: Iterable[str], stock_info: Dict[str, Any],
+                     cache: Optional[FactorCache] = None, max_workers: int = 4,
+                     provider: Optional[DataProvider] = None) -> Dict[str, Optional[int]]:
+    """
+    Evaluate factor providers concurrently.
+
+    Only factors with a registered provider are evaluated; cached scores are
+    returned without calling the provider again.
+
+    Args:
+        ticker: Stock ticker symbol
+        names: Factor names to evaluate
+        stock_info: Stock information dict passed to each provider
+        cache: Cache to use (defaults to the module-level cache)
+        max_workers: Maximum number of provider threads
+        provider: Data provider passed to each factor (defaults to the process-wide provider)
+
+    Returns:
+        Dictionary of factor name to score (None if unavailable)
+    """
+    cache = cache if cache is not None else default_cache
+    ticker = ticker.upper()
+    results: Dict[str, Optional[int]] = {}
+    pending = {}
+
+    for name in names:
+        factor = _PROVIDERS.get(name)
+        if factor is None:
+            continue
+        hit, score = cache.get(name, ticker, provider)
+        if hit:
+            results[name] = score
+        else:
+            pending[name] = factor
+
+    if not pending:
+        return results
+
+    def run(name: str, factor: FactorProvider) -> Optional[int]:
+        try:
+            with span(f'factor.{name}'):
+                score = factor(ticker, stock_info, provider)
+        except Exception as e:
+            print(f"Error computing {name} factor for {ticker}: {e}")
+            return None
+        return None if score is None else max(0, min(100, int(score)))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+        # Each thread runs in a copy of the caller's context so spans join the current trace
+        futures = {
+            name: pool.submit(contextvars.copy_context().run, run, name, factor)
+            for name, factor in pending.items()
+        }
+        for name, future in futures.items():
+            results[name] = future.result()
+            cache.set(name, ticker, results[name], provider)
+
+    return results
+
+
+@register_factor('sentiment')
+def score_sentiment(ticker: str, stock_info: Dict[str, Any],
+                    provider: Optional[DataProvider] = None) -> Optional[int]:
+    """Score news sentiment (0-100) from the average VADER compound score."""
+    from news_sentiment import NewsSentimentAnalyzer
+
+    news_data = NewsSentimentAnalyzer(ticker, provider).get_news_with_sentiment(limit=10)
+    if 'error' in news_data:
+        return None
+
+    compound = news_data['overall_sentiment']['compound']
+    return int(round(50 + compound * 50))
+
+
+@register_factor('sec_filings')
+def score_sec_filings(ticker: str, stock_info: Dict[str, Any],
+                      provider: Optional[DataProvider] = None) -> Optional[int]:
+    """
+    Score SEC filing activity (0-100).
+
+    Net insider buying over the last six months moves the score up, net
+    selling moves it down. Companies without a 10-K/10-Q in the last
+    120 days are penalized as they may be late filers.
+    """
+    provider = provider or get_provider()
+    filings = provider.sec_filings(ticker) or []
+    purchases = provider.insider_purchases(ticker)
+
+    if not filings and (purchases is None or purchases.empty):
+        return None
+
+    score = 50
+
+    # Insider activity ("% Net Shares Purchased (Sold)" row)
+    if purchases is not None and not purchases.empty:
+        labels = purchases.iloc[:, 0].astype(str)
+        net_rows = purchases[labels.str.startswith('% Net Shares')]
+        if not net_rows.empty:
+            net_pct = float(net_rows['Shares'].iloc[0])
+            if net_pct > 0.05:
+                score += 25
+            elif net_pct > 0:
+                score += 10
+            elif net_pct < -0.05:
+                score -= 20
+            elif net_pct < 0:
+                score -= 5
+
+    # Periodic report filed recently
+    if filings:
+        cutoff = date.today() - timedelta(days=120)
+        periodic = [f for f in filings if f.get('type') in ('10-K', '10-Q')]
+        if any(f.get('date') and f['date'] >= cutoff for f in periodic):
+            score += 10
+        else:
+            score -= 10
+
+    return score
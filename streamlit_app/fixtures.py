@@ -0,0 +1,235 @@
+"""
+Offline data fixtures.
+
+Synthetic (seeded) OHLCV, stock info and news for tests and benchmarks, plus a
+loader for recorded OHLCV files, so nothing here touches the network.
+"""
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from bars import INTERVAL_MINUTES, INTRADAY_INTERVALS, MAX_LOOKBACK_DAYS, normalize_interval, resample_ohlcv
+from providers import DataProvider, slice_history
+
+
+HEADLINES = [
+    "{name} beats earnings expectations as revenue surges",
+    "{name} shares fall after guidance cut",
+    "Analysts upgrade {name} on strong demand outlook",
+    "{name} faces regulatory probe over accounting practices",
+    "{name} announces share buyback program",
+    "{name} CEO to step down amid restructuring",
+    "{name} launches new product line",
+    "Investors worry about {name} debt levels",
+    "{name} stock hits record high",
+    "{name} misses revenue estimates, shares slide",
+]
+
+
+def synthetic_ohlcv(days: int = 300, seed: int = 1, start_price: float = 100.0,
+                    end: str = '2025-06-30') -> pd.DataFrame:
+    """
+    Random-walk OHLCV data on business days.
+
+    Args:
+        days: Number of rows
+        seed: Random seed
+        start_price: Price before the first day
+        end: Last date
+
+    Returns:
+        DataFrame with Open, High, Low, Close, Volume columns
+    """
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0005, 0.015, days)))
+    index = pd.bdate_range(end=end, periods=days)
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.003, days)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, days).astype(float),
+    }, index=index)
+
+
+def synthetic_intraday(days: int = 40, minutes: int = 5, seed: int = 1, start_price: float = 100.0,
+                       end: str = '2025-06-30', tz: str = 'America/New_York') -> pd.DataFrame:
+    """
+    Random-walk intraday bars for regular sessions (9:30-16:00 exchange time).
+
+    Args:
+        days: Number of business days
+        minutes: Bar length
+        seed: Random seed
+        start_price: Price before the first bar
+        end: Last date
+        tz: Exchange time zone (yfinance returns intraday bars tz-aware)
+
+    Returns:
+        DataFrame with Open, High, Low, Close, Volume columns
+    """
+    rng = np.random.default_rng(seed)
+    per_day = -(-390 // minutes)  # Yahoo keeps the short last bar (15:30-16:00 for 1h)
+    offsets = pd.to_timedelta(570 + minutes * np.arange(per_day), unit='min')
+    sessions = pd.bdate_range(end=end, periods=days)
+    index = pd.DatetimeIndex((sessions.values[:, None] + offsets.values[None, :]).ravel()).tz_localize(tz)
+    count = len(index)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.015 / np.sqrt(per_day), count)))
+    spread = np.abs(rng.normal(0, 0.001, count))
+    return pd.DataFrame({
+        'Open': np.r_[start_price, close[:-1]],
+        'High': close * (1 + spread),
+        'Low': close * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(10_000, 50_000, count).astype(float),
+    }, index=index)
+
+
+def load_ohlcv(path: str) -> pd.DataFrame:
+    """
+    Load recorded OHLCV data from a CSV or Parquet file.
+
+    Args:
+        path: File with a date index and Open, High, Low, Close, Volume columns
+
+    Returns:
+        DataFrame indexed by date
+    """
+    if os.path.splitext(path)[1].lower() == '.parquet':
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, index_col=0, parse_dates=True)
+    return frame[['Open', 'High', 'Low', 'Close', 'Volume']]
+
+
+def synthetic_info(ticker: str = 'TEST', price: float = 100.0) -> Dict[str, Any]:
+    """Stock info in DataFetcher.get_stock_info() layout."""
+    return {
+        'ticker': ticker,
+        'name': f'{ticker} Corp',
+        'current_price': price,
+        'previous_close': price * 0.99,
+        'volume': 3_000_000,
+        'avg_volume': 2_800_000,
+        'market_cap': 50_000_000_000,
+        'pe_ratio': 22.5,
+        'eps': price / 22.5,
+        'profit_margin': 0.21,
+        'revenue_growth': 0.08,
+    }
+
+
+def synthetic_news(count: int = 10, name: str = 'Test Corp', seed: int = 1) -> List[Dict[str, Any]]:
+    """
+    News articles in NewsSentimentAnalyzer.fetch_news() layout.
+
+    Args:
+        count: Number of articles
+        name: Company name used in headlines
+        seed: Random seed for headline order
+
+    Returns:
+        List of article dictionaries
+    """
+    rng = np.random.default_rng(seed)
+    articles = []
+    for i in range(count):
+        title = HEADLINES[rng.integers(len(HEADLINES))].format(name=name)
+        articles.append({
+            'title': title,
+            'publisher': 'Fixture Wire',
+            'link': f'https://example.com/news/{i}',
+            'published_str': f'2025-06-{30 - i % 28:02d} 09:30',
+            'thumbnail': '',
+            'summary': title,
+        })
+    return articles
+
+
+class FixtureProvider(DataProvider):
+    """
+    DataProvider serving synthetic data in raw yfinance layouts.
+
+    Each ticker gets its own seeded price series (two years of business
+    days); shorter periods are slices of it.
+    """
+
+    def __init__(self, days: int = 504, end: str = '2025-06-30'):
+        """
+        Initialize provider.
+
+        Args:
+            days: Length of each ticker's price series
+            end: Last date
+        """
+        self.days = days
+        self.end = end
+        self._histories: Dict[str, pd.DataFrame] = {}
+        self.history_calls: List[str] = []
+
+    def _seed(self, ticker: str) -> int:
+        return sum(ord(c) * 31 ** i for i, c in enumerate(ticker.upper())) % (2 ** 32)
+
+    def history(self, ticker, period=None, interval='1d', start=None, end=None):
+        ticker = ticker.upper()
+        interval = normalize_interval(interval)
+        self.history_calls.append(interval)
+        key = ticker if interval == '1d' else f'{ticker}:{interval}'
+        if key not in self._histories:
+            if interval in INTRADAY_INTERVALS:
+                # As many business days as Yahoo serves for the interval
+                days = min(self.days, MAX_LOOKBACK_DAYS[interval] * 5 // 7)
+                self._histories[key] = synthetic_intraday(days, INTERVAL_MINUTES[interval],
+                                                          seed=self._seed(ticker), end=self.end)
+            elif interval == '1d':
+                self._histories[key] = synthetic_ohlcv(self.days, seed=self._seed(ticker), end=self.end)
+            else:
+                self._histories[key] = resample_ohlcv(self.history(ticker, 'max'), interval)
+        return slice_history(self._histories[key], period, start, end)
+
+    def info(self, ticker):
+        price = float(self.history(ticker, 'max')['Close'].iloc[-1])
+        return {
+            'longName': f'{ticker.upper()} Corp',
+            'currentPrice': price,
+            'regularMarketPrice': price,
+            'previousClose': price * 0.99,
+            'volume': 3_000_000,
+            'averageVolume': 2_800_000,
+            'marketCap': 50_000_000_000,
+            'trailingPE': 22.5,
+            'forwardPE': 20.1,
+            'trailingEps': price / 22.5,
+            'profitMargins': 0.21,
+            'operatingMargins': 0.27,
+            'returnOnEquity': 0.18,
+            'revenueGrowth': 0.08,
+            'earningsGrowth': 0.11,
+            'debtToEquity': 65.0,
+            'currentRatio': 1.6,
+            'sector': 'Technology',
+            'industry': 'Software',
+        }
+
+    def news(self, ticker):
+        return [
+            {'content': {
+                'title': article['title'],
+                'provider': {'displayName': article['publisher']},
+                'canonicalUrl': {'url': article['link']},
+                'pubDate': article['published_str'].replace(' ', 'T') + ':00Z',
+                'summary': article['summary'],
+            }}
+            for article in synthetic_news(10, name=f'{ticker.upper()} Corp', seed=self._seed(ticker))
+        ]
+
+    def sec_filings(self, ticker):
+        return []
+
+    def insider_purchases(self, ticker):
+        return None
+
+    def statement(self, ticker, attribute):
+        return pd.DataFrame()
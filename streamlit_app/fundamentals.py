@@ -2,34 +2,108 @@
 Fundamental Analysis Module
 Fetches and analyzes fundamental metrics for long-term investment strategies.
 """
-import yfinance as yf
-from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from fundamentals_store import FundamentalsStore
+from providers import DataProvider, get_provider
+from profiling import timed
+
+
+# Fields used by calculate_health_score, one column each in the screening frame
+HEALTH_SCORE_FIELDS = {
+    'valuation': ('pe_trailing', 'peg_ratio', 'pb_ratio'),
+    'profitability': ('profit_margin', 'roe', 'operating_margin'),
+    'growth': ('revenue_growth', 'earnings_growth'),
+    'financial_health': ('debt_to_equity', 'current_ratio', 'free_cash_flow'),
+    'dividends': ('dividend_yield', 'payout_ratio'),
+}
+
+# Flag bits in the order calculate_health_score appends the messages
+STRENGTH_FLAGS = [
+    ('pe_trailing', lambda v: "Healthy P/E ratio (10-25)"),
+    ('peg_ratio', lambda v: f"Excellent PEG ratio ({v:.2f}) - undervalued growth"),
+    ('peg_ratio', lambda v: "Good PEG ratio (1-2)"),
+    ('profit_margin', lambda v: f"Strong profit margin ({v*100:.1f}%)"),
+    ('roe', lambda v: f"Excellent ROE ({v*100:.1f}%)"),
+    ('revenue_growth', lambda v: f"Strong revenue growth ({v*100:.1f}%)"),
+    ('earnings_growth', lambda v: f"Strong earnings growth ({v*100:.1f}%)"),
+    ('debt_to_equity', lambda v: f"Low debt-to-equity ({v:.1f})"),
+    ('current_ratio', lambda v: f"Excellent current ratio ({v:.2f})"),
+    ('free_cash_flow', lambda v: "Strong free cash flow"),
+    ('dividend_yield', lambda v: f"Healthy dividend yield ({v*100:.1f}%)"),
+    ('payout_ratio', lambda v: "Sustainable payout ratio"),
+]
+
+RED_FLAGS = [
+    ('pe_trailing', lambda v: f"High P/E ratio ({v:.1f}) - may be overvalued"),
+    ('peg_ratio', lambda v: f"High PEG ratio ({v:.2f})"),
+    ('profit_margin', lambda v: f"Negative profit margin ({v*100:.1f}%)"),
+    ('roe', lambda v: f"Negative ROE ({v*100:.1f}%)"),
+    ('operating_margin', lambda v: "Negative operating margin"),
+    ('revenue_growth', lambda v: f"Negative revenue growth ({v*100:.1f}%)"),
+    ('earnings_growth', lambda v: f"Negative earnings growth ({v*100:.1f}%)"),
+    ('debt_to_equity', lambda v: f"High debt-to-equity ratio ({v:.1f})"),
+    ('current_ratio', lambda v: f"Low current ratio ({v:.2f}) - liquidity concerns"),
+    ('free_cash_flow', lambda v: "Negative free cash flow"),
+    ('dividend_yield', lambda v: f"Very high dividend yield ({v*100:.1f}%) - sustainability risk"),
+    ('payout_ratio', lambda v: f"High payout ratio ({v*100:.0f}%) - sustainability risk"),
+]
+
+
+def parse_earnings_date(info: Dict[str, Any]) -> Optional[Any]:
+    """
+    Next earnings date of a .info payload.
+    
+    Args:
+        info: yfinance .info dictionary
+        
+    Returns:
+        'YYYY-MM-DD' if 'earningsDate' is a list of timestamps, the raw
+        value if it is something else, None if missing or invalid
+    """
+    earnings_date = info.get('earningsDate')
+    if earnings_date and isinstance(earnings_date, (list, tuple)) and len(earnings_date) > 0:
+        try:
+            earnings_date = datetime.fromtimestamp(earnings_date[0]).strftime('%Y-%m-%d')
+        except (TypeError, ValueError, OverflowError, OSError):
+            earnings_date = None
+    return earnings_date
+
 
 class FundamentalAnalyzer:
     """Analyzes fundamental metrics for stocks."""
     
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, store: Optional[FundamentalsStore] = None,
+                 provider: Optional[DataProvider] = None):
         """
         Initialize fundamental analyzer.
         
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
+            store: Snapshot store; .info is only re-downloaded once it is stale
+            provider: Data provider (defaults to the process-wide provider)
         """
         self.ticker = ticker.upper()
-        self.stock = yf.Ticker(self.ticker)
+        self.provider = provider or get_provider()
+        self.store = store
         self.info = None
         
+    @timed()
     def fetch_fundamentals(self) -> Dict[str, Any]:
         """
-        Fetch all fundamental data from yfinance.
+        Fetch all fundamental data from yfinance (or the snapshot store).
         
         Returns:
             Dictionary containing all fundamental metrics organized by category
         """
         try:
-            self.info = self.stock.info
+            if self.store is not None:
+                self.info = self.store.get_info(self.ticker, lambda: self.provider.info(self.ticker))
+            else:
+                self.info = self.provider.info(self.ticker)
             
             fundamentals = {
                 'valuation': self._get_valuation_metrics(),
@@ -110,7 +184,7 @@ class FundamentalAnalyzer:
         if ex_dividend_date:
             try:
                 ex_dividend_date = datetime.fromtimestamp(ex_dividend_date).strftime('%Y-%m-%d')
-            except:
+            except (TypeError, ValueError, OverflowError, OSError):
                 ex_dividend_date = None
         
         return {
@@ -123,12 +197,7 @@ class FundamentalAnalyzer:
     
     def _get_other_metrics(self) -> Dict[str, Any]:
         """Extract other important metrics."""
-        earnings_date = self._safe_get('earningsDate')
-        if earnings_date and isinstance(earnings_date, (list, tuple)) and len(earnings_date) > 0:
-            try:
-                earnings_date = datetime.fromtimestamp(earnings_date[0]).strftime('%Y-%m-%d')
-            except:
-                earnings_date = None
+        earnings_date = parse_earnings_date(self.info or {})
         
         return {
             'beta': self._safe_get('beta'),
@@ -157,6 +226,7 @@ class FundamentalAnalyzer:
             'other': {},
         }
     
+    @timed()
     def calculate_health_score(self, fundamentals: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
         """
         Calculate overall investment health score (0-100) and analysis.
@@ -382,6 +452,185 @@ class FundamentalAnalyzer:
         else:
             return "Fairly Valued ⚖️"
     
+    @staticmethod
+    def fundamentals_to_frame(fundamentals_by_ticker: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Flatten fetch_fundamentals() results into a screening DataFrame.
+        
+        Args:
+            fundamentals_by_ticker: Mapping of ticker to fetch_fundamentals() output
+            
+        Returns:
+            DataFrame indexed by ticker with one column per HEALTH_SCORE_FIELDS entry
+        """
+        columns = [field for fields in HEALTH_SCORE_FIELDS.values() for field in fields]
+        records = []
+        for ticker, fundamentals in fundamentals_by_ticker.items():
+            record = {}
+            for category, fields in HEALTH_SCORE_FIELDS.items():
+                group = fundamentals.get(category, {})
+                for field in fields:
+                    value = group.get(field)
+                    record[field] = np.nan if value is None else value
+            records.append(record)
+        
+        return pd.DataFrame.from_records(records, index=list(fundamentals_by_ticker), columns=columns).astype(float)
+    
+    @classmethod
+    def calculate_health_scores(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized calculate_health_score for a whole universe.
+        
+        Missing values (NaN) are treated like None in the scalar method.
+        Strengths and red flags are returned as bitmasks over STRENGTH_FLAGS
+        and RED_FLAGS; use describe_health_flags for the display strings.
+        
+        Args:
+            frame: DataFrame with HEALTH_SCORE_FIELDS columns (see fundamentals_to_frame)
+            
+        Returns:
+            DataFrame with score, max_score, earned_score, valuation_status,
+            strength_flags and red_flag_flags columns
+        """
+        n = len(frame)
+        
+        def col(name):
+            return frame[name].to_numpy(dtype=float) if name in frame else np.full(n, np.nan)
+        
+        def truthy(v):
+            # `if value:` for None/NaN/0
+            return ~np.isnan(v) & (v != 0)
+        
+        score = np.zeros(n)
+        max_score = np.zeros(n)
+        strengths = np.zeros(n, dtype=np.uint32)
+        red_flags = np.zeros(n, dtype=np.uint32)
+        
+        def rule(present, points, conditions, strength_bits=(), red_bits=()):
+            """Add points for the first matching condition, like an if/elif ladder."""
+            nonlocal score, max_score
+            max_score = max_score + np.where(present, points, 0)
+            earned = np.select([present & c for c, _ in conditions], [p for _, p in conditions], 0)
+            score = score + earned
+            for bit, cond in strength_bits:
+                strengths[present & cond] |= np.uint32(1 << bit)
+            for bit, cond in red_bits:
+                red_flags[present & cond] |= np.uint32(1 << bit)
+        
+        with np.errstate(invalid='ignore'):
+            pe, peg, pb = col('pe_trailing'), col('peg_ratio'), col('pb_ratio')
+            pm, roe, om = col('profit_margin'), col('roe'), col('operating_margin')
+            rg, eg = col('revenue_growth'), col('earnings_growth')
+            de, cr, fcf = col('debt_to_equity'), col('current_ratio'), col('free_cash_flow')
+            dy, po = col('dividend_yield'), col('payout_ratio')
+            
+            # Valuation
+            healthy_pe = (pe > 10) & (pe < 25)
+            high_pe = ~healthy_pe & (pe > 40)
+            rule(truthy(pe), 10, [(healthy_pe, 10), (pe > 40, 2), (pe > 0, 6)],
+                 [(0, healthy_pe)], [(0, high_pe)])
+            
+            excellent_peg = (peg > 0) & (peg < 1)
+            good_peg = ~excellent_peg & (peg >= 1) & (peg < 2)
+            high_peg = ~excellent_peg & ~good_peg & (peg > 3)
+            rule(truthy(peg), 10, [(excellent_peg, 10), (good_peg, 7), (high_peg, 2)],
+                 [(1, excellent_peg), (2, good_peg)], [(1, high_peg)])
+            
+            # Profitability
+            rule(truthy(pm), 8, [(pm > 0.20, 8), (pm > 0.10, 6)],
+                 [(3, pm > 0.20)], [(2, pm < 0)])
+            rule(truthy(roe), 9, [(roe > 0.15, 9), (roe > 0.10, 6)],
+                 [(4, roe > 0.15)], [(3, roe < 0)])
+            rule(truthy(om), 8, [(om > 0.15, 8), (om > 0.05, 5)],
+                 [], [(4, om < 0)])
+            
+            # Growth
+            rule(truthy(rg), 10, [(rg > 0.15, 10), (rg > 0.05, 7)],
+                 [(5, rg > 0.15)], [(5, rg < 0)])
+            rule(truthy(eg), 10, [(eg > 0.15, 10), (eg > 0.05, 7)],
+                 [(6, eg > 0.15)], [(6, eg < 0)])
+            
+            # Financial health
+            rule(~np.isnan(de), 10, [(de < 50, 10), (de < 100, 7), (de > 200, 2)],
+                 [(7, de < 50)], [(7, de > 200)])
+            rule(truthy(cr), 8, [(cr > 2.0, 8), (cr > 1.5, 6), (cr < 1.0, 2)],
+                 [(8, cr > 2.0)], [(8, cr < 1.0)])
+            rule(truthy(fcf), 7, [(fcf > 0, 7)],
+                 [(9, fcf > 1e9)], [(9, ~(fcf > 0))])
+            
+            # Dividends
+            pays_dividend = truthy(dy) & (dy > 0)
+            healthy_yield = (dy > 0.02) & (dy < 0.06)
+            rule(pays_dividend, 5, [(healthy_yield, 5), (dy > 0.08, 2)],
+                 [(10, healthy_yield)], [(10, ~healthy_yield & (dy > 0.08))])
+            rule(pays_dividend & truthy(po), 5, [((po > 0) & (po < 0.6), 5)],
+                 [(11, (po > 0) & (po < 0.6))], [(11, ~((po > 0) & (po < 0.6)) & (po > 0.8))])
+            
+            final_score = np.where(max_score > 0, (score / np.where(max_score > 0, max_score, 1)) * 100, 0)
+        
+        return pd.DataFrame({
+            'score': final_score.astype(int),
+            'max_score': max_score.astype(int),
+            'earned_score': score.astype(int),
+            'valuation_status': cls._determine_valuations(pe, peg, pb),
+            'strength_flags': strengths,
+            'red_flag_flags': red_flags,
+        }, index=frame.index)
+    
+    @staticmethod
+    def _determine_valuations(pe: np.ndarray, peg: np.ndarray, pb: np.ndarray) -> np.ndarray:
+        """Vectorized _determine_valuation over valuation columns."""
+        undervalued = np.zeros(len(pe), dtype=int)
+        overvalued = np.zeros(len(pe), dtype=int)
+        fair = np.zeros(len(pe), dtype=int)
+        
+        with np.errstate(invalid='ignore'):
+            # P/E ratio, PEG ratio (weighted double), P/B ratio
+            for values, low, high, weight in ((pe, 15, 30, 1), (peg, 1, 2, 2), (pb, 1.5, 5, 1)):
+                present = ~np.isnan(values) & (values != 0)
+                is_under = present & (values < low)
+                is_over = present & ~is_under & (values > high)
+                undervalued += is_under * weight
+                overvalued += is_over * weight
+                fair += present & ~is_under & ~is_over
+        
+        has_signals = (undervalued + overvalued + fair) > 0
+        return np.select(
+            [~has_signals,
+             (undervalued > overvalued) & (undervalued > fair),
+             (overvalued > undervalued) & (overvalued > fair)],
+            ["Insufficient data", "Undervalued ✅", "Overvalued ⚠️"],
+            "Fairly Valued ⚖️"
+        )
+    
+    @staticmethod
+    def describe_health_flags(frame: pd.DataFrame, scores: pd.DataFrame,
+                              tickers: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Build strength/red flag messages for the rows being displayed.
+        
+        Args:
+            frame: Screening DataFrame passed to calculate_health_scores
+            scores: Result of calculate_health_scores
+            tickers: Rows to describe (defaults to all)
+            
+        Returns:
+            Mapping of ticker to {'strengths': [...], 'red_flags': [...]}
+        """
+        tickers = scores.index if tickers is None else tickers
+        described = {}
+        for ticker in tickers:
+            row = frame.loc[ticker]
+            strength_bits = int(scores.at[ticker, 'strength_flags'])
+            red_bits = int(scores.at[ticker, 'red_flag_flags'])
+            described[ticker] = {
+                'strengths': [fmt(row[field]) for bit, (field, fmt) in enumerate(STRENGTH_FLAGS)
+                              if strength_bits & (1 << bit)],
+                'red_flags': [fmt(row[field]) for bit, (field, fmt) in enumerate(RED_FLAGS)
+                              if red_bits & (1 << bit)],
+            }
+        return described
+    
     def get_metric_interpretation(self, metric_name: str, value: Any) -> str:
         """
         Get human-readable interpretation of a metric.
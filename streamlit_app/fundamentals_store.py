@@ -0,0 +1,303 @@
+"""
+Fundamentals Snapshot Store
+Caches yfinance .info snapshots on disk and ranks tickers against sector peers.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get('STOCK_ANALYZER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'stock_analyzer')),
+    'fundamentals'
+)
+
+# Metric name -> (info key, higher is better)
+PEER_METRICS = {
+    'pe_trailing': ('trailingPE', False),
+    'peg_ratio': ('pegRatio', False),
+    'pb_ratio': ('priceToBook', False),
+    'profit_margin': ('profitMargins', True),
+    'operating_margin': ('operatingMargins', True),
+    'roe': ('returnOnEquity', True),
+    'revenue_growth': ('revenueGrowth', True),
+    'earnings_growth': ('earningsGrowth', True),
+    'debt_to_equity': ('debtToEquity', False),
+    'current_ratio': ('currentRatio', True),
+}
+
+# Valuation multiples are only meaningful when positive
+POSITIVE_ONLY = ('pe_trailing', 'peg_ratio', 'pb_ratio')
+
+ALL_SECTORS = '__all__'
+
+
+class FundamentalsStore:
+    """Local on-disk store of .info snapshots, refreshed at most daily per ticker."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_age: timedelta = timedelta(days=1)):
+        """
+        Initialize snapshot store.
+
+        Args:
+            directory: Directory holding one JSON snapshot per ticker
+            max_age: Age after which a snapshot is refreshed
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker.upper()}.json")
+
+    def load(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a snapshot without fetching.
+
+        Returns:
+            Dictionary with 'ticker', 'fetched_at' and 'info', or None
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self._memory:
+                return self._memory[ticker]
+
+        try:
+            with open(self._path(ticker), 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._memory[ticker] = snapshot
+        return snapshot
+
+    def save(self, ticker: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a snapshot to disk and memory."""
+        ticker = ticker.upper()
+        snapshot = {
+            'ticker': ticker,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'info': info,
+        }
+        tmp_path = self._path(ticker) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_path, self._path(ticker))
+
+        with self._lock:
+            self._memory[ticker] = snapshot
+        return snapshot
+
+    def is_fresh(self, snapshot: Optional[Dict[str, Any]]) -> bool:
+        """Check if a snapshot is younger than max_age."""
+        if not snapshot:
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(snapshot['fetched_at'])
+        except (KeyError, ValueError):
+            return False
+        return datetime.now() - fetched_at < self.max_age
+
+    def get_info(self, ticker: str, fetch: Callable[[], Dict[str, Any]],
+                 force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the .info payload, fetching only if the snapshot is stale.
+
+        A stale snapshot is still returned if the fetch fails.
+
+        Args:
+            ticker: Stock ticker symbol
+            fetch: Callable returning a fresh .info dict
+            force_refresh: Ignore the cached snapshot
+
+        Returns:
+            The .info dict or None if unavailable
+        """
+        snapshot = self.load(ticker)
+        if not force_refresh and self.is_fresh(snapshot):
+            return snapshot['info']
+
+        try:
+            info = fetch()
+        except Exception as e:
+            print(f"Error refreshing fundamentals for {ticker}: {e}")
+            info = None
+
+        if info:
+            return self.save(ticker, info)['info']
+        return snapshot['info'] if snapshot else None
+
+    def tickers(self) -> List[str]:
+        """List all tickers with a snapshot on disk."""
+        return sorted(
+            name[:-5] for name in os.listdir(self.directory) if name.endswith('.json')
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame of peer metrics for every stored ticker.
+
+        Returns:
+            DataFrame indexed by ticker with 'sector' and PEER_METRICS columns
+        """
+        rows = {}
+        for ticker in self.tickers():
+            snapshot = self.load(ticker)
+            if snapshot:
+                rows[ticker] = snapshot['info']
+        return info_to_frame(rows)
+
+
+def info_to_frame(infos: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convert .info dicts to a DataFrame of peer metrics.
+
+    Args:
+        infos: Mapping of ticker to .info dict
+
+    Returns:
+        DataFrame indexed by ticker with 'sector' and PEER_METRICS columns
+    """
+    records = []
+    for ticker, info in infos.items():
+        record = {'ticker': ticker, 'sector': info.get('sector') or 'Unknown'}
+        for metric, (key, _) in PEER_METRICS.items():
+            value = info.get(key)
+            record[metric] = value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+        records.append(record)
+
+    columns = ['ticker', 'sector'] + list(PEER_METRICS)
+    return pd.DataFrame.from_records(records, columns=columns).set_index('ticker')
+
+
+class SectorPeerEngine:
+    """Percentile ranks of fundamental metrics against sector peers."""
+
+    def __init__(self, frame: pd.DataFrame, min_peers: int = 5):
+        """
+        Build pre-sorted per-sector metric arrays.
+
+        Sectors with fewer than min_peers values for a metric are ranked
+        against the whole universe instead.
+
+        Args:
+            frame: DataFrame from info_to_frame / FundamentalsStore.to_frame
+            min_peers: Minimum peer count for a sector-level ranking
+        """
+        self.frame = frame.copy()
+        self.min_peers = min_peers
+
+        for metric in POSITIVE_ONLY:
+            if metric in self.frame:
+                col = self.frame[metric]
+                self.frame[metric] = col.where(col > 0)
+
+        self._sorted: Dict[tuple, np.ndarray] = {}
+        for metric in PEER_METRICS:
+            values = self.frame[metric].to_numpy(dtype=float)
+            self._sorted[(ALL_SECTORS, metric)] = np.sort(values[~np.isnan(values)])
+            for sector, group in self.frame.groupby('sector')[metric]:
+                arr = group.to_numpy(dtype=float)
+                arr = np.sort(arr[~np.isnan(arr)])
+                if len(arr) >= min_peers:
+                    self._sorted[(sector, metric)] = arr
+
+    @classmethod
+    def from_store(cls, store: FundamentalsStore, min_peers: int = 5) -> 'SectorPeerEngine':
+        """Build the engine from all snapshots in a store."""
+        return cls(store.to_frame(), min_peers=min_peers)
+
+    def peers(self, metric: str, sector: Optional[str]) -> np.ndarray:
+        """Sorted peer values for a metric (sector-level if enough peers)."""
+        arr = self._sorted.get((sector, metric))
+        if arr is None:
+            arr = self._sorted[(ALL_SECTORS, metric)]
+        return arr
+
+    def percentile(self, metric: str, value: Optional[float], sector: Optional[str] = None) -> Optional[float]:
+        """
+        Percentile rank (0-100) of a value among peers, via binary search.
+
+        Ties are ranked at the midpoint. Lower-is-better metrics are not
+        inverted here; see score_universe for direction handling.
+        """
+        if value is None or np.isnan(value):
+            return None
+        if metric in POSITIVE_ONLY and value <= 0:
+            return None
+        arr = self.peers(metric, sector)
+        if len(arr) == 0:
+            return None
+        left = np.searchsorted(arr, value, side='left')
+        right = np.searchsorted(arr, value, side='right')
+        return float((left + right) / 2 / len(arr) * 100)
+
+    def ticker_percentiles(self, ticker: str) -> Dict[str, Optional[float]]:
+        """Percentile ranks for every peer metric of a stored ticker."""
+        ticker = ticker.upper()
+        if ticker not in self.frame.index:
+            return {metric: None for metric in PEER_METRICS}
+        row = self.frame.loc[ticker]
+        return {
+            metric: self.percentile(metric, row[metric], row['sector'])
+            for metric in PEER_METRICS
+        }
+
+    def percentile_frame(self) -> pd.DataFrame:
+        """
+        Percentile ranks for every ticker and metric in one vectorized pass.
+
+        Returns:
+            DataFrame indexed by ticker with one percentile column per metric
+        """
+        out = pd.DataFrame(np.nan, index=self.frame.index, columns=list(PEER_METRICS))
+        sectors = self.frame['sector'].to_numpy()
+
+        for metric in PEER_METRICS:
+            values = self.frame[metric].to_numpy(dtype=float)
+            ranks = np.full(len(values), np.nan)
+            for sector in np.unique(sectors):
+                mask = (sectors == sector) & ~np.isnan(values)
+                if not mask.any():
+                    continue
+                arr = self.peers(metric, sector)
+                left = np.searchsorted(arr, values[mask], side='left')
+                right = np.searchsorted(arr, values[mask], side='right')
+                ranks[mask] = (left + right) / 2 / len(arr) * 100
+            out[metric] = ranks
+
+        return out
+
+    def score_universe(self) -> pd.DataFrame:
+        """
+        Sector-relative health score (0-100) for every ticker.
+
+        The score is the mean of the available percentiles, with
+        lower-is-better metrics (P/E, PEG, P/B, debt-to-equity) inverted.
+
+        Returns:
+            DataFrame with 'sector', 'score' and 'metrics_used' columns
+        """
+        ranks = self.percentile_frame()
+        for metric, (_, higher_is_better) in PEER_METRICS.items():
+            if not higher_is_better:
+                ranks[metric] = 100 - ranks[metric]
+
+        values = ranks.to_numpy()
+        used = (~np.isnan(values)).sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            score = np.where(used > 0, np.nansum(values, axis=1) / np.maximum(used, 1), np.nan)
+
+        return pd.DataFrame({
+            'sector': self.frame['sector'],
+            'score': np.round(score, 1),
+            'metrics_used': used,
+        }, index=self.frame.index).sort_values('score', ascending=False)
@@ -0,0 +1,173 @@
+"""
+GARCH(1,1) return model.
+
+Daily returns are r[t] = mu + e[t] with e[t] ~ N(0, s2[t]) and
+
+    s2[t] = omega + alpha * e[t-1]^2 + beta * s2[t-1]
+
+so volatility clusters: a volatile week raises tomorrow's variance, which
+then decays towards the long-run variance omega / (1 - alpha - beta) at
+rate alpha + beta per day.
+
+The fit maximizes the Gaussian likelihood with variance targeting (omega is
+set so the long-run variance equals the sample variance), leaving alpha and
+beta to the optimizer. The variance recursion is linear in e^2 and runs
+through scipy.signal.lfilter, like Wilder smoothing in kernels.py, so each
+likelihood evaluation has no Python loop over days.
+
+Fits are cached in a GarchStore (default_store) per ticker and history
+(last bar and number of returns), so a ticker is refit only when new bars
+arrive, and timeframes fitting different history lengths keep one fit each.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+# alpha + beta is kept below this (a stationary variance)
+MAX_PERSISTENCE = 0.999
+# Returns needed for a fit; shorter histories get a constant-variance model
+MIN_RETURNS = 50
+
+
+class GarchParameters(NamedTuple):
+    """Fitted GARCH(1,1) parameters of daily returns."""
+    mu: float
+    omega: float
+    alpha: float
+    beta: float
+    # Conditional variance of the next (first simulated) day
+    next_variance: float
+
+    @property
+    def persistence(self) -> float:
+        """alpha + beta: the daily decay of a variance shock."""
+        return self.alpha + self.beta
+
+    @property
+    def long_run_variance(self) -> float:
+        """Variance the conditional variance reverts to."""
+        return self.omega / (1 - self.persistence)
+
+    def expected_variances(self, days: int) -> np.ndarray:
+        """Expected conditional variance of each of the next `days` days."""
+        decay = self.persistence ** np.arange(days)
+        return self.long_run_variance + decay * (self.next_variance - self.long_run_variance)
+
+
+def conditional_variance(residuals: np.ndarray, omega: float, alpha: float, beta: float,
+                         initial: float) -> np.ndarray:
+    """
+    GARCH(1,1) conditional variances of a residual series.
+
+    Args:
+        residuals: Returns minus their mean
+        omega, alpha, beta: GARCH parameters
+        initial: Variance of the first day
+
+    Returns:
+        Variances s2[0..n], one more than the residuals (the last is the
+        forecast for the day after them)
+    """
+    from scipy.signal import lfilter
+
+    # s2[t] = (omega + alpha * e[t-1]^2) + beta * s2[t-1], starting from s2[0] = initial
+    shocks = omega + alpha * residuals ** 2
+    following, _ = lfilter([1.0], [1.0, -beta], shocks, zi=[beta * initial])
+    return np.concatenate(([initial], following))
+
+
+def fit_garch(returns: np.ndarray) -> GarchParameters:
+    """
+    Fit GARCH(1,1) to daily returns by maximum likelihood.
+
+    Args:
+        returns: Daily returns (NaNs dropped)
+
+    Returns:
+        GarchParameters; histories shorter than MIN_RETURNS get alpha = beta = 0
+        (the constant sample variance)
+    """
+    from scipy.optimize import minimize
+
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[~np.isnan(returns)]
+    mu = float(returns.mean())
+    residuals = returns - mu
+    variance = float(residuals.var(ddof=1))
+    if len(returns) < MIN_RETURNS or variance <= 0:
+        return GarchParameters(mu, variance, 0.0, 0.0, variance)
+
+    def variances(params: np.ndarray) -> np.ndarray:
+        alpha, beta = params
+        return conditional_variance(residuals, variance * (1 - alpha - beta), alpha, beta, variance)
+
+    def negative_log_likelihood(params: np.ndarray) -> float:
+        if params.sum() >= MAX_PERSISTENCE:
+            return 1e10
+        s2 = variances(params)[:-1]
+        return 0.5 * float(np.sum(np.log(s2) + residuals ** 2 / s2))
+
+    fit = minimize(negative_log_likelihood, x0=np.array([0.05, 0.90]), method='L-BFGS-B',
+                   bounds=[(0.0, MAX_PERSISTENCE), (0.0, MAX_PERSISTENCE)])
+    alpha, beta = (float(x) for x in fit.x)
+    if not np.isfinite(fit.fun) or alpha + beta >= MAX_PERSISTENCE:
+        return GarchParameters(mu, variance, 0.0, 0.0, variance)
+    omega = variance * (1 - alpha - beta)
+    return GarchParameters(mu, omega, alpha, beta, float(variances(fit.x)[-1]))
+
+
+class GarchStore:
+    """Thread-safe cache of GARCH fits per ticker and history, with a time-to-live."""
+
+    def __init__(self, ttl: float = 86400, max_entries: int = 256):
+        """
+        Initialize store.
+
+        Args:
+            ttl: Seconds before a fit is redone even without new bars
+            max_entries: Fits kept; the least recently used are dropped first
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, Tuple], Tuple[float, GarchParameters]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.fits = 0
+
+    def get(self, ticker: str, returns: np.ndarray, version: Tuple = ()) -> GarchParameters:
+        """
+        Cached fit for a ticker's history, fitted on a miss or when expired.
+
+        Args:
+            ticker: Stock ticker symbol
+            returns: Daily returns to fit on a miss
+            version: Identifies the history (e.g. last bar and number of returns)
+
+        Returns:
+            GarchParameters
+        """
+        key = (ticker.upper(), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        parameters = fit_garch(returns)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), parameters)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.fits += 1
+        return parameters
+
+    def clear(self):
+        """Drop all fits."""
+        with self._lock:
+            self._entries.clear()
+
+
+default_store = GarchStore()
@@ -0,0 +1,294 @@
+"""
+Shared HTTP session for yfinance.
+
+One process-wide session is handed to every yfinance Ticker (see
+providers.get_http_session). curl_cffi keeps one keep-alive curl handle per
+thread, so the session doubles as the connection pool. On top of it every
+request goes through:
+
+- a token bucket, so universe scans stay under Yahoo's request rate
+- retries with exponential backoff and full jitter on 429/5xx responses and
+  connection errors (Retry-After is honoured when sent)
+- a circuit breaker that fails fast after repeated failures instead of
+  piling more requests onto a throttled or unreachable endpoint
+
+Example:
+    session = ResilientSession(rate=5, burst=10)
+    yf.Ticker('AAPL', session=session).history(period='6mo')
+    session.stats()      # {'requests': 3, 'retries': 0, 'throttled_s': 0.0, ...}
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from curl_cffi import requests as curl_requests
+
+from profiling import span
+
+# Responses worth retrying: throttled or transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0,
+                  rng: Optional[random.Random] = None) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number (0 for the first retry)
+        base: Delay scale (seconds)
+        cap: Largest delay (seconds)
+        rng: Random source (defaults to the module's)
+
+    Returns:
+        Seconds to wait, uniform in [0, min(cap, base * 2**attempt)]
+    """
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free."""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Largest burst
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting for them if needed.
+
+        Tokens are reserved under the lock and the wait happens outside it,
+        so concurrent callers queue up in order instead of all waking at once.
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: requests flow; `failure_threshold` failures in a row open it.
+    open: requests are rejected until `reset_timeout` has passed.
+    half_open: one probe request goes through; success closes the circuit,
+    failure opens it again. A probe that ends without an outcome (e.g. an
+    interrupt) is released so the next request probes instead.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+
+    def before_request(self) -> bool:
+        """
+        Check that a request may be sent.
+
+        Returns:
+            True if the request is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already in flight)
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit open, retry in {remaining:.1f}s")
+            if self._probing:
+                raise CircuitOpenError("Circuit half-open, probe request in flight")
+            self._probing = True
+            return True
+
+    def release_probe(self):
+        """End the probe without an outcome; the circuit stays half-open for the next request."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """Count a failure; open the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class ResilienceMixin:
+    """
+    Rate limiting, retries and circuit breaking around Session.request().
+
+    Mixed into a session class whose request() sends one HTTP request;
+    everything that goes through get()/post() is covered.
+    """
+
+    # Exceptions treated as transient connection failures (curl_cffi's
+    # RequestException and the builtin ConnectionError/TimeoutError are OSErrors)
+    transient_errors = (OSError,)
+
+    def configure_resilience(self, rate: float = 5.0, burst: float = 10.0, max_retries: int = 4,
+                             backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                             failure_threshold: int = 5, reset_timeout: float = 30.0,
+                             clock: Callable[[], float] = time.monotonic,
+                             sleep: Callable[[float], None] = time.sleep,
+                             rng: Optional[random.Random] = None):
+        """
+        Set up limiter, retry policy and breaker.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Requests allowed back to back
+            max_retries: Retries per request after the first attempt
+            backoff_base: Backoff scale (seconds)
+            backoff_cap: Largest backoff (seconds)
+            failure_threshold: Consecutive failed requests that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+            rng: Random source for jitter
+        """
+        self.limiter = TokenBucket(rate, burst, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'rejected': 0, 'throttled_s': 0.0}
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters plus the current circuit state."""
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        snapshot['throttled_s'] = round(snapshot['throttled_s'], 3)
+        snapshot['circuit'] = self.breaker.state
+        return snapshot
+
+    def _retry_delay(self, attempt: int, response) -> float:
+        retry_after = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        return backoff_delay(attempt, self.backoff_base, self.backoff_cap, self._rng)
+
+    def request(self, method, url, *args, **kwargs):
+        """Send a request through the limiter, retry policy and circuit breaker."""
+        try:
+            probe = self.breaker.before_request()
+        except CircuitOpenError:
+            self._count('rejected')
+            raise
+
+        try:
+            return self._send(method, url, *args, **kwargs)
+        except BaseException:
+            # Non-transient errors and interrupts say nothing about the remote end,
+            # but must not leave the breaker waiting on a probe forever
+            if probe:
+                self.breaker.release_probe()
+            raise
+
+    def _send(self, method, url, *args, **kwargs):
+        """Send with rate limiting and retries, recording the outcome on the breaker."""
+        attempt = 0
+        while True:
+            self._count('throttled_s', self.limiter.acquire())
+            self._count('requests')
+            response, error = None, None
+            try:
+                with span('http.request'):
+                    response = super().request(method, url, *args, **kwargs)
+            except self.transient_errors as e:
+                error = e
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+
+            if attempt >= self.max_retries:
+                self._count('failures')
+                self.breaker.record_failure()
+                if error is not None:
+                    raise error
+                # Hand the final 429/5xx to the caller (yfinance raises its own errors)
+                return response
+
+            self._count('retries')
+            self._sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+
+class ResilientSession(ResilienceMixin, curl_requests.Session):
+    """curl_cffi session (browser impersonation, per-thread keep-alive) with resilience."""
+
+    def __init__(self, impersonate: str = 'chrome', **resilience):
+        """
+        Initialize session.
+
+        Args:
+            impersonate: Browser fingerprint for curl_cffi
+            **resilience: Options for configure_resilience()
+        """
+        super().__init__(impersonate=impersonate)
+        self.configure_resilience(**resilience)
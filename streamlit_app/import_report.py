@@ -0,0 +1,108 @@
+"""
+Import-time report.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+sums the self time per top-level package, so startup regressions (a heavy
+library imported at module level again) show up as a number.
+
+Usage:
+    python import_report.py                 # import cost of app.py
+    python import_report.py --module cli --runs 5
+    python import_report.py --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Libraries the app should only load when a feature needs them
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly', 'yfinance', 'curl_cffi', 'scipy', 'vaderSentiment')
+
+
+def measure(module: str = 'app') -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter and collect -X importtime output.
+
+    Args:
+        module: Module to import (run from this directory)
+
+    Returns:
+        Dictionary with total_ms, per-package self time (ms) and imported module names
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=here, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    packages: Dict[str, float] = {}
+    modules: List[str] = []
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        modules.append(name)
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0.0) + int(self_us) / 1000
+        if name == module:
+            total_us = int(cumulative_us)
+
+    return {
+        'module': module,
+        'total_ms': round(total_us / 1000, 1),
+        'packages': {name: round(ms, 1) for name, ms in
+                     sorted(packages.items(), key=lambda item: item[1], reverse=True)},
+        'heavy_loaded': [name for name in HEAVY_MODULES if name in modules],
+    }
+
+
+def best_of(module: str = 'app', runs: int = 3) -> Dict[str, Any]:
+    """
+    Measure several times and keep the fastest run (least disk/cache noise).
+
+    Args:
+        module: Module to import
+        runs: Number of fresh interpreters
+
+    Returns:
+        Fastest measure() result
+    """
+    return min((measure(module) for _ in range(max(runs, 1))), key=lambda result: result['total_ms'])
+
+
+def format_report(result: Dict[str, Any], top: int = 15) -> str:
+    """Human-readable report for one measurement."""
+    lines = [f"import {result['module']}: {result['total_ms']:.1f} ms", '',
+             f"{'package':<28}{'self ms':>10}"]
+    for name, ms in list(result['packages'].items())[:top]:
+        lines.append(f"{name:<28}{ms:>10.1f}")
+    lines.append('')
+    heavy = result['heavy_loaded']
+    lines.append(f"Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report import-time cost per package')
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to try; fastest is kept')
+    parser.add_argument('--top', type=int, default=15, help='Packages to list')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    result = best_of(args.module, args.runs)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(format_report(result, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
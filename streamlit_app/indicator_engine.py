@@ -0,0 +1,304 @@
+"""
+Indicator dependency graph.
+
+Indicators are registered with the inputs they need, expressed as keys of
+intermediate series (a column, its diff, a rolling mean, an EMA of a given
+span, ...). Keys nest, so they describe a DAG: the 9-period EMA of the
+difference of the 12- and 26-period EMAs of Close is
+
+    ema(sub(ema(CLOSE, 12), ema(CLOSE, 26)), 9)
+
+An IndicatorEngine belongs to one frame. It resolves the keys of all
+requested indicators into one topologically ordered plan and computes each
+intermediate once, so Bollinger Bands and any other indicator reading the
+20-period mean of Close share the same rolling pass.
+
+Example:
+    @register_indicator('momentum', inputs=lambda period: {'change': diff(CLOSE, period)}, period=10)
+    def momentum(change, period):
+        return {'value': change.iloc[-1], 'series': change}
+
+    engine = IndicatorEngine(data)
+    engine.compute('momentum')
+"""
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+import pandas as pd
+
+import kernels
+
+# ('kind', *args): args that are themselves keys are inputs
+Key = Tuple[Any, ...]
+
+
+def column(name: str) -> Key:
+    """A column of the frame."""
+    return ('column', name)
+
+
+HIGH = column('High')
+LOW = column('Low')
+CLOSE = column('Close')
+VOLUME = column('Volume')
+
+
+def diff(source: Key, periods: int = 1) -> Key:
+    """Change over `periods` bars."""
+    return ('diff', source, periods)
+
+
+def gain(source: Key) -> Key:
+    """Positive part of a series (else 0)."""
+    return ('gain', source)
+
+
+def loss(source: Key) -> Key:
+    """Magnitude of the negative part of a series (else 0)."""
+    return ('loss', source)
+
+
+def sub(left: Key, right: Key) -> Key:
+    """Difference of two series."""
+    return ('sub', left, right)
+
+
+def rolling_mean(source: Key, window: int) -> Key:
+    """Simple moving average."""
+    return ('rolling_mean', source, window)
+
+
+def rolling_std(source: Key, window: int) -> Key:
+    """Rolling sample standard deviation."""
+    return ('rolling_std', source, window)
+
+
+def ema(source: Key, span: int) -> Key:
+    """Exponential moving average (adjust=False, as used by MACD)."""
+    return ('ema', source, span)
+
+
+def rolling_max(source: Key, window: int) -> Key:
+    """Highest value over a trailing window."""
+    return ('rolling_max', source, window)
+
+
+def rolling_min(source: Key, window: int) -> Key:
+    """Lowest value over a trailing window."""
+    return ('rolling_min', source, window)
+
+
+def wilder(source: Key, period: int) -> Key:
+    """Wilder smoothing (alpha = 1/period)."""
+    return ('wilder', source, period)
+
+
+def true_range(high: Key = HIGH, low: Key = LOW, close: Key = CLOSE) -> Key:
+    """True range of the bars."""
+    return ('true_range', high, low, close)
+
+
+def plus_dm(high: Key = HIGH, low: Key = LOW) -> Key:
+    """Wilder's +DM."""
+    return ('plus_dm', high, low)
+
+
+def minus_dm(high: Key = HIGH, low: Key = LOW) -> Key:
+    """Wilder's -DM."""
+    return ('minus_dm', high, low)
+
+
+def directional_index(smoothed_dm: Key, atr: Key) -> Key:
+    """+DI / -DI from smoothed directional movement and ATR."""
+    return ('directional_index', smoothed_dm, atr)
+
+
+def directional_spread(plus_di: Key, minus_di: Key) -> Key:
+    """DX from +DI and -DI."""
+    return ('directional_spread', plus_di, minus_di)
+
+
+def percent_k(close: Key, highest: Key, lowest: Key) -> Key:
+    """Stochastic %K from rolling extremes."""
+    return ('percent_k', close, highest, lowest)
+
+
+def obv(close: Key = CLOSE, volume: Key = VOLUME) -> Key:
+    """On-balance volume."""
+    return ('obv', close, volume)
+
+
+def is_key(value: Any) -> bool:
+    return isinstance(value, tuple) and bool(value) and isinstance(value[0], str)
+
+
+# Intermediate kind -> function of the resolved args (input series, params)
+_INTERMEDIATES: Dict[str, Callable[..., pd.Series]] = {
+    'diff': lambda series, periods: series.diff(periods),
+    'gain': lambda series: series.where(series > 0, 0),
+    'loss': lambda series: -series.where(series < 0, 0),
+    'sub': lambda left, right: left - right,
+    'rolling_mean': lambda series, window: series.rolling(window=window).mean(),
+    'rolling_std': lambda series, window: series.rolling(window=window).std(),
+    'ema': lambda series, span: series.ewm(span=span, adjust=False).mean(),
+    'rolling_max': kernels.rolling_max,
+    'rolling_min': kernels.rolling_min,
+    'wilder': kernels.wilder,
+    'true_range': kernels.true_range,
+    'plus_dm': lambda high, low: kernels.directional_movement(high, low)[0],
+    'minus_dm': lambda high, low: kernels.directional_movement(high, low)[1],
+    'directional_index': kernels.directional_index,
+    'directional_spread': kernels.directional_spread,
+    'percent_k': kernels.percent_k,
+    'obv': kernels.on_balance_volume,
+}
+
+
+def register_intermediate(kind: str) -> Callable:
+    """
+    Register an intermediate series kind.
+
+    Args:
+        kind: First element of the keys it computes
+
+    Returns:
+        Decorator registering a function of the key's args, with input keys
+        replaced by their series
+    """
+    def decorator(func: Callable[..., pd.Series]) -> Callable[..., pd.Series]:
+        _INTERMEDIATES[kind] = func
+        return func
+    return decorator
+
+
+class IndicatorSpec(NamedTuple):
+    name: str
+    inputs: Callable[..., Dict[str, Key]]
+    compute: Callable[..., Dict[str, Any]]
+    defaults: Dict[str, Any]
+
+
+_INDICATORS: Dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(name: str, inputs: Callable[..., Dict[str, Key]], **defaults) -> Callable:
+    """
+    Register an indicator.
+
+    Args:
+        name: Key in the indicators dict (e.g., 'rsi')
+        inputs: Function of the parameters returning argument name -> input key
+        **defaults: Default parameters
+
+    Returns:
+        Decorator registering compute(**input_series, **params) -> result dict
+    """
+    def decorator(compute: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        _INDICATORS[name] = IndicatorSpec(name, inputs, compute, defaults)
+        return compute
+    return decorator
+
+
+def get_indicator(name: str) -> IndicatorSpec:
+    """Registered indicator (KeyError if unknown)."""
+    return _INDICATORS[name]
+
+
+def indicator_names() -> List[str]:
+    """Registered indicators in registration order."""
+    return list(_INDICATORS)
+
+
+class IndicatorEngine:
+    """Memoized evaluation of indicator inputs for one OHLCV frame."""
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Initialize engine.
+
+        Args:
+            data: DataFrame with OHLCV data (read, never modified)
+        """
+        self.data = data
+        self._memo: Dict[Key, pd.Series] = {}
+        # Keys in the order they were computed (each appears once)
+        self.computed: List[Key] = []
+
+    def plan(self, keys: Iterable[Key]) -> List[Key]:
+        """
+        Resolve keys and their inputs into evaluation order.
+
+        Args:
+            keys: Requested intermediate keys
+
+        Returns:
+            Unique keys, every input before the keys that read it
+        """
+        order: List[Key] = []
+        seen = set()
+
+        def visit(key: Key):
+            if key in seen:
+                return
+            seen.add(key)
+            for arg in key[1:]:
+                if is_key(arg):
+                    visit(arg)
+            order.append(key)
+
+        for key in keys:
+            visit(key)
+        return order
+
+    def get(self, key: Key) -> pd.Series:
+        """Series for a key, computing it and any missing inputs once."""
+        if key not in self._memo:
+            self.evaluate([key])
+        return self._memo[key]
+
+    def evaluate(self, keys: Iterable[Key]):
+        """Compute every key (and input) not yet memoized."""
+        for key in self.plan(keys):
+            if key in self._memo:
+                continue
+            kind, args = key[0], key[1:]
+            if kind == 'column':
+                value = self.data[args[0]]
+            else:
+                if kind not in _INTERMEDIATES:
+                    raise KeyError(f"Unknown intermediate: {kind}")
+                value = _INTERMEDIATES[kind](*(self._memo[arg] if is_key(arg) else arg for arg in args))
+            self._memo[key] = value
+            self.computed.append(key)
+
+    def inputs(self, name: str, **params) -> Dict[str, Key]:
+        """Input keys of an indicator for the given parameters."""
+        spec = get_indicator(name)
+        return spec.inputs(**{**spec.defaults, **params})
+
+    def compute(self, name: str, **params) -> Dict[str, Any]:
+        """
+        Calculate a registered indicator.
+
+        Args:
+            name: Indicator name
+            **params: Overrides of the registered defaults
+
+        Returns:
+            The indicator's result dict
+        """
+        spec = get_indicator(name)
+        params = {**spec.defaults, **params}
+        keys = spec.inputs(**params)
+        self.evaluate(keys.values())
+        return spec.compute(**{arg: self._memo[key] for arg, key in keys.items()}, **params)
+
+    def compute_all(self, names: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate several indicators (default: all registered) over one plan.
+
+        Returns:
+            Indicator name -> result dict
+        """
+        names = indicator_names() if names is None else list(names)
+        self.evaluate(key for name in names for key in self.inputs(name).values())
+        return {name: self.compute(name) for name in names}
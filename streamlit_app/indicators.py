@@ -3,7 +3,252 @@ Technical indicators calculation module.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+import kernels
+from indicator_engine import (
+    CLOSE, HIGH, LOW, VOLUME, IndicatorEngine, diff, directional_index, directional_spread, ema, gain,
+    indicator_names, loss, minus_dm, obv, percent_k, plus_dm, register_indicator, rolling_max,
+    rolling_mean, rolling_min, rolling_std, sub, true_range, wilder,
+)
+from lookback import indicator_bars
+from profiling import span, timed
+
+
+class IndicatorBlock:
+    """
+    Indicator series stored column-wise in one read-only float32 array.
+    
+    The array is Fortran-ordered so each column is contiguous; column() and
+    series() return views into it, not copies.
+    """
+    
+    __slots__ = ('index', 'values', '_positions')
+    
+    def __init__(self, index: pd.Index, columns: Dict[str, Any]):
+        """
+        Pack series into one block.
+        
+        Args:
+            index: Shared index of all columns
+            columns: Column name -> values (Series or array aligned with index)
+        """
+        self.index = index
+        self.values = np.empty((len(index), len(columns)), dtype=np.float32, order='F')
+        self._positions = {}
+        for position, (name, column) in enumerate(columns.items()):
+            self.values[:, position] = np.asarray(column, dtype=np.float32)
+            self._positions[name] = position
+        self.values.flags.writeable = False
+    
+    @property
+    def columns(self):
+        """Column names in storage order."""
+        return list(self._positions)
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the value block in bytes."""
+        return self.values.nbytes
+    
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one column."""
+        return self.values[:, self._positions[name]]
+    
+    def series(self, name: str) -> pd.Series:
+        """Column as a pandas Series sharing the block's memory."""
+        return pd.Series(self.column(name), index=self.index, name=name, copy=False)
+    
+    def latest(self, name: str) -> Optional[float]:
+        """Last value of a column as a Python float (None if NaN)."""
+        value = float(self.values[-1, self._positions[name]])
+        return None if np.isnan(value) else value
+    
+    def to_frame(self) -> pd.DataFrame:
+        """All columns as a DataFrame over the same block."""
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+
+def compact_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Numeric columns of a frame as one float32 block (e.g. OHLCV kept for charts).
+    
+    Args:
+        frame: DataFrame with numeric columns
+        
+    Returns:
+        float32 DataFrame with the same index and columns
+    """
+    return IndicatorBlock(frame.index, {name: frame[name] for name in frame.columns}).to_frame()
+
+
+# Built-in indicators. Each declares its input series; shared intermediates
+# (e.g. diff(CLOSE), rolling_mean(CLOSE, 20)) are computed once per frame.
+
+@register_indicator('rsi', period=14,
+                    inputs=lambda period: {'gain': rolling_mean(gain(diff(CLOSE)), period),
+                                           'loss': rolling_mean(loss(diff(CLOSE)), period)})
+def _rsi(gain, loss, period):
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return {'value': rsi.iloc[-1], 'series': rsi}
+
+
+def _macd_inputs(fast, slow, signal):
+    macd_line = sub(ema(CLOSE, fast), ema(CLOSE, slow))
+    signal_line = ema(macd_line, signal)
+    histogram = sub(macd_line, signal_line)
+    return {'macd_line': macd_line, 'signal_line': signal_line, 'histogram': histogram,
+            'histogram_change': diff(histogram)}
+
+
+@register_indicator('macd', fast=12, slow=26, signal=9, inputs=_macd_inputs)
+def _macd(macd_line, signal_line, histogram, histogram_change, fast, slow, signal):
+    return {
+        'macd_line': macd_line.iloc[-1],
+        'signal_line': signal_line.iloc[-1],
+        'histogram': histogram.iloc[-1],
+        'histogram_change': histogram_change.iloc[-1],
+        'macd_series': macd_line,
+        'signal_series': signal_line,
+        'histogram_series': histogram,
+    }
+
+
+@register_indicator('bollinger', period=20, std_dev=2,
+                    inputs=lambda period, std_dev: {'close': CLOSE,
+                                                    'sma': rolling_mean(CLOSE, period),
+                                                    'std': rolling_std(CLOSE, period)})
+def _bollinger(close, sma, std, period, std_dev):
+    upper_band = sma + (std * std_dev)
+    lower_band = sma - (std * std_dev)
+    return {
+        'upper': upper_band.iloc[-1],
+        'middle': sma.iloc[-1],
+        'lower': lower_band.iloc[-1],
+        'current': close.iloc[-1],
+        'upper_series': upper_band,
+        'middle_series': sma,
+        'lower_series': lower_band,
+    }
+
+
+@register_indicator('sma', short_period=50, long_period=200,
+                    inputs=lambda short_period, long_period: {'close': CLOSE,
+                                                              'sma_50': rolling_mean(CLOSE, short_period),
+                                                              'sma_200': rolling_mean(CLOSE, long_period)})
+def _sma(close, sma_50, sma_200, short_period, long_period):
+    return {
+        'sma_50': sma_50.iloc[-1] if len(sma_50) >= short_period else None,
+        'sma_200': sma_200.iloc[-1] if len(sma_200) >= long_period else None,
+        'current': close.iloc[-1],
+        'sma_50_series': sma_50,
+        'sma_200_series': sma_200,
+    }
+
+
+@register_indicator('volume', period=20,
+                    inputs=lambda period: {'volume': VOLUME, 'avg_volume': rolling_mean(VOLUME, period)})
+def _volume(volume, avg_volume, period):
+    current_volume = volume.iloc[-1]
+    avg_vol = avg_volume.iloc[-1]
+    volume_change_pct = ((current_volume - avg_vol) / avg_vol) * 100 if avg_vol > 0 else 0
+    return {
+        'current': current_volume,
+        'average': avg_vol,
+        'change_pct': volume_change_pct,
+        'series': volume,
+        'avg_series': avg_volume,
+    }
+
+
+# Further indicators from the strategy spec (vectorized kernels, see kernels.py).
+# They carry their own signal text and are added to calculate_all() by the registry.
+
+def _stochastic_k(k_period):
+    return percent_k(CLOSE, rolling_max(HIGH, k_period), rolling_min(LOW, k_period))
+
+
+@register_indicator('stochastic', k_period=14, d_period=3,
+                    inputs=lambda k_period, d_period: {'percent_k': _stochastic_k(k_period),
+                                                       'percent_d': rolling_mean(_stochastic_k(k_period), d_period)})
+def _stochastic(percent_k, percent_d, k_period, d_period):
+    value = percent_k.iloc[-1]
+    if value < 20:
+        signal = "OVERSOLD"
+    elif value > 80:
+        signal = "OVERBOUGHT"
+    else:
+        signal = "NEUTRAL"
+    return {
+        'value': value,
+        'percent_d': percent_d.iloc[-1],
+        'k_series': percent_k,
+        'd_series': percent_d,
+        'signal': signal,
+    }
+
+
+@register_indicator('atr', period=14,
+                    inputs=lambda period: {'close': CLOSE, 'atr': wilder(true_range(), period)})
+def _atr(close, atr, period):
+    value = atr.iloc[-1]
+    percent = value / close.iloc[-1] * 100
+    if percent > 4:
+        signal = "HIGH VOLATILITY"
+    elif percent < 1.5:
+        signal = "LOW VOLATILITY"
+    else:
+        signal = "NORMAL VOLATILITY"
+    return {'value': value, 'percent': percent, 'series': atr, 'signal': signal}
+
+
+def _adx_inputs(period):
+    atr = wilder(true_range(), period)
+    plus_di = directional_index(wilder(plus_dm(), period), atr)
+    minus_di = directional_index(wilder(minus_dm(), period), atr)
+    return {'adx': wilder(directional_spread(plus_di, minus_di), period), 'plus_di': plus_di, 'minus_di': minus_di}
+
+
+@register_indicator('adx', period=14, inputs=_adx_inputs)
+def _adx(adx, plus_di, minus_di, period):
+    value = adx.iloc[-1]
+    if not value >= 20:
+        signal = "NO CLEAR TREND"
+    else:
+        strength = "STRONG " if value >= 40 else ""
+        signal = f"{strength}BULLISH TREND" if plus_di.iloc[-1] > minus_di.iloc[-1] else f"{strength}BEARISH TREND"
+    return {
+        'value': value,
+        'plus_di': plus_di.iloc[-1],
+        'minus_di': minus_di.iloc[-1],
+        'series': adx,
+        'signal': signal,
+    }
+
+
+@register_indicator('obv', period=20, inputs=lambda period: {'obv': obv(), 'change': diff(obv(), period)})
+def _obv(obv, change, period):
+    change = change.iloc[-1]
+    if change > 0:
+        signal = "BULLISH (accumulation)"
+    elif change < 0:
+        signal = "BEARISH (distribution)"
+    else:
+        signal = "NEUTRAL"
+    return {'value': obv.iloc[-1], 'change': change, 'series': obv, 'signal': signal}
+
+
+@register_indicator('vwap', inputs=lambda: {'high': HIGH, 'low': LOW, 'close': CLOSE, 'volume': VOLUME})
+def _vwap(high, low, close, volume):
+    # Intraday bars restart each session; daily bars are anchored at the first bar
+    dates = close.index.normalize() if isinstance(close.index, pd.DatetimeIndex) else None
+    sessions = dates if dates is not None and dates.has_duplicates else None
+    vwap = kernels.vwap(high, low, close, volume, sessions=sessions)
+    value = vwap.iloc[-1]
+    current = close.iloc[-1]
+    signal = "ABOVE VWAP (bullish)" if current >= value else "BELOW VWAP (bearish)"
+    return {'value': value, 'current': current, 'series': vwap, 'signal': signal}
 
 
 class TechnicalIndicators:
@@ -16,24 +261,74 @@ class TechnicalIndicators:
         Args:
             data: DataFrame with OHLCV data
         """
-        self.data = data.copy()
+        # Only read, never modified, so no defensive copy
+        self.data = data
+        self.engine = IndicatorEngine(data)
         self.indicators = {}
+        # Registered indicators calculate_all() had too few bars for
+        self.skipped: List[str] = []
+        self.block: Optional[IndicatorBlock] = None
         
+    @timed()
     def calculate_all(self) -> Dict[str, Any]:
         """
         Calculate all technical indicators.
         
+        Inputs of every registered indicator are resolved into one plan and
+        computed once; indicators registered beyond the built-in five are
+        added under their own name. Indicators needing more bars than the
+        data has (see lookback.indicator_bars) are skipped and listed in
+        self.skipped. Series are then packed into one float32 IndicatorBlock (self.block)
+        and replaced by views into it; latest values become Python floats.
+        
         Returns:
             Dictionary with all calculated indicators
         """
-        self.calculate_rsi()
-        self.calculate_macd()
-        self.calculate_bollinger_bands()
-        self.calculate_sma()
-        self.calculate_volume_metrics()
+        builtin = {
+            'rsi': self.calculate_rsi,
+            'macd': self.calculate_macd,
+            'bollinger': self.calculate_bollinger_bands,
+            'sma': self.calculate_sma,
+            'volume': self.calculate_volume_metrics,
+        }
+        names = [name for name in indicator_names()
+                 if indicator_bars([name], converged=False) <= len(self.data)]
+        self.skipped = [name for name in indicator_names() if name not in names]
+        with span('indicators.intermediates'):
+            self.engine.evaluate(key for name in names for key in self.engine.inputs(name).values())
+        for name in names:
+            if name in builtin:
+                builtin[name]()
+            else:
+                self.indicators[name] = self.engine.compute(name)
+        self.compact()
         
         return self.indicators
     
+    def compact(self) -> IndicatorBlock:
+        """
+        Move all indicator series into one float32 block.
+        
+        Series entries (keys ending in 'series') become zero-copy views named
+        '<indicator>.<key>'; NumPy scalars become Python floats.
+        
+        Returns:
+            The IndicatorBlock
+        """
+        columns = {}
+        for name, values in self.indicators.items():
+            for key, value in values.items():
+                if isinstance(value, pd.Series):
+                    columns[f'{name}.{key}'] = value
+                elif isinstance(value, np.number):
+                    values[key] = float(value)
+        self.block = IndicatorBlock(self.data.index, columns)
+        for column in self.block.columns:
+            name, key = column.split('.', 1)
+            self.indicators[name][key] = self.block.series(column)
+        return self.block
+    
+    @timed()
     def calculate_rsi(self, period: int = 14) -> float:
         """
         Calculate RSI (Relative Strength Index).
@@ -44,22 +339,10 @@ class TechnicalIndicators:
         Returns:
             Current RSI value
         """
-        close = self.data['Close']
-        delta = close.diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        current_rsi = rsi.iloc[-1]
-        
-        self.indicators['rsi'] = {
-            'value': current_rsi,
-            'series': rsi,
-            'signal': self._interpret_rsi(current_rsi)
-        }
+        result = self.engine.compute('rsi', period=period)
+        current_rsi = result['value']
+        result['signal'] = self._interpret_rsi(current_rsi)
+        self.indicators['rsi'] = result
         
         return current_rsi
     
@@ -72,6 +355,7 @@ class TechnicalIndicators:
         else:
             return "NEUTRAL"
     
+    @timed()
     def calculate_macd(self, fast: int = 12, slow: int = 26, signal: int = 9):
         """
         Calculate MACD (Moving Average Convergence Divergence).
@@ -81,35 +365,21 @@ class TechnicalIndicators:
             slow: Slow EMA period
             signal: Signal line period
         """
-        close = self.data['Close']
-        
-        ema_fast = close.ewm(span=fast, adjust=False).mean()
-        ema_slow = close.ewm(span=slow, adjust=False).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        histogram = macd_line - signal_line
-        
-        self.indicators['macd'] = {
-            'macd_line': macd_line.iloc[-1],
-            'signal_line': signal_line.iloc[-1],
-            'histogram': histogram.iloc[-1],
-            'macd_series': macd_line,
-            'signal_series': signal_line,
-            'histogram_series': histogram,
-            'signal': self._interpret_macd(macd_line.iloc[-1], signal_line.iloc[-1], 
-                                           histogram.iloc[-1], histogram.iloc[-2])
-        }
+        result = self.engine.compute('macd', fast=fast, slow=slow, signal=signal)
+        result['signal'] = self._interpret_macd(result['macd_line'], result['signal_line'],
+                                                result['histogram_change'])
+        self.indicators['macd'] = result
     
-    def _interpret_macd(self, macd: float, signal: float, hist: float, prev_hist: float) -> str:
-        """Interpret MACD signal."""
-        if macd > signal and hist > prev_hist:
+    def _interpret_macd(self, macd: float, signal: float, hist_change: float) -> str:
+        """Interpret MACD signal (histogram_change: change of the histogram over the last bar)."""
+        if macd > signal and hist_change > 0:
             return "BULLISH"
-        elif macd < signal and hist < prev_hist:
+        elif macd < signal and hist_change < 0:
             return "BEARISH"
         else:
             return "NEUTRAL"
     
+    @timed()
     def calculate_bollinger_bands(self, period: int = 20, std_dev: int = 2):
         """
         Calculate Bollinger Bands.
@@ -118,27 +388,10 @@ class TechnicalIndicators:
             period: Moving average period
             std_dev: Number of standard deviations
         """
-        close = self.data['Close']
-        
-        sma = close.rolling(window=period).mean()
-        std = close.rolling(window=period).std()
-        
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
-        
-        current_price = close.iloc[-1]
-        
-        self.indicators['bollinger'] = {
-            'upper': upper_band.iloc[-1],
-            'middle': sma.iloc[-1],
-            'lower': lower_band.iloc[-1],
-            'current': current_price,
-            'upper_series': upper_band,
-            'middle_series': sma,
-            'lower_series': lower_band,
-            'signal': self._interpret_bollinger(current_price, upper_band.iloc[-1], 
-                                                lower_band.iloc[-1], sma.iloc[-1])
-        }
+        result = self.engine.compute('bollinger', period=period, std_dev=std_dev)
+        result['signal'] = self._interpret_bollinger(result['current'], result['upper'],
+                                                     result['lower'], result['middle'])
+        self.indicators['bollinger'] = result
     
     def _interpret_bollinger(self, price: float, upper: float, lower: float, middle: float) -> str:
         """Interpret Bollinger Bands signal."""
@@ -151,6 +404,7 @@ class TechnicalIndicators:
         else:
             return "ABOVE MIDDLE (bullish)"
     
+    @timed()
     def calculate_sma(self, short_period: int = 50, long_period: int = 200):
         """
         Calculate Simple Moving Averages.
@@ -159,23 +413,9 @@ class TechnicalIndicators:
             short_period: Short-term SMA period
             long_period: Long-term SMA period
         """
-        close = self.data['Close']
-        
-        sma_50 = close.rolling(window=short_period).mean()
-        sma_200 = close.rolling(window=long_period).mean()
-        
-        current_price = close.iloc[-1]
-        
-        self.indicators['sma'] = {
-            'sma_50': sma_50.iloc[-1] if len(sma_50) >= short_period else None,
-            'sma_200': sma_200.iloc[-1] if len(sma_200) >= long_period else None,
-            'current': current_price,
-            'sma_50_series': sma_50,
-            'sma_200_series': sma_200,
-            'signal': self._interpret_sma(current_price, 
-                                         sma_50.iloc[-1] if len(sma_50) >= short_period else None,
-                                         sma_200.iloc[-1] if len(sma_200) >= long_period else None)
-        }
+        result = self.engine.compute('sma', short_period=short_period, long_period=long_period)
+        result['signal'] = self._interpret_sma(result['current'], result['sma_50'], result['sma_200'])
+        self.indicators['sma'] = result
     
     def _interpret_sma(self, price: float, sma_50: float, sma_200: float) -> str:
         """Interpret SMA signal."""
@@ -193,6 +433,7 @@ class TechnicalIndicators:
         else:
             return "NEUTRAL"
     
+    @timed()
     def calculate_volume_metrics(self, period: int = 20):
         """
         Calculate volume metrics.
@@ -200,22 +441,9 @@ class TechnicalIndicators:
         Args:
             period: Period for average volume
         """
-        volume = self.data['Volume']
-        
-        avg_volume = volume.rolling(window=period).mean()
-        current_volume = volume.iloc[-1]
-        avg_vol = avg_volume.iloc[-1]
-        
-        volume_change_pct = ((current_volume - avg_vol) / avg_vol) * 100 if avg_vol > 0 else 0
-        
-        self.indicators['volume'] = {
-            'current': current_volume,
-            'average': avg_vol,
-            'change_pct': volume_change_pct,
-            'series': volume,
-            'avg_series': avg_volume,
-            'signal': self._interpret_volume(volume_change_pct)
-        }
+        result = self.engine.compute('volume', period=period)
+        result['signal'] = self._interpret_volume(result['change_pct'])
+        self.indicators['volume'] = result
     
     def _interpret_volume(self, change_pct: float) -> str:
         """Interpret volume signal."""
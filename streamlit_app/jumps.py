@@ -0,0 +1,150 @@
+"""
+Merton jump-diffusion return model.
+
+Daily log returns are a normal diffusion plus a compound Poisson sum of
+normal jumps:
+
+    log(1 + r[t]) = mu + sigma * z[t] + sum of N[t] jumps,  N[t] ~ Poisson(intensity)
+
+with each jump ~ N(jump_mean, jump_std^2). Given N jumps, their sum is
+N(N * jump_mean, N * jump_std^2), so a day's jump total is one normal draw
+scaled by the day's count, and whole (paths, days) arrays of counts and
+sizes are sampled at once.
+
+Calibration starts from a threshold split of the history: log returns
+further than JUMP_THRESHOLD robust standard deviations (median absolute
+deviation) from the median are jumps, the rest are the diffusion. Small
+jumps hide inside the threshold, so the split is refined by EM on the
+mixture of no-jump days N(mu, sigma^2) and one-jump days
+N(mu + jump_mean, sigma^2 + jump_std^2), which for intensities of a few
+percent per day is the Poisson model up to rare two-jump days.
+
+An earnings report is a jump known to happen on one day; earnings_move()
+gives the standard deviation used for it.
+"""
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+# Robust standard deviations from the median beyond which a return is a jump
+JUMP_THRESHOLD = 3.0
+# Jump days needed to estimate a jump size distribution
+MIN_JUMPS = 2
+# MAD -> standard deviation of a normal
+MAD_SCALE = 1.4826
+# EM refinement of the calibration
+EM_ITERATIONS = 200
+EM_TOLERANCE = 1e-9
+
+
+class JumpParameters(NamedTuple):
+    """Calibrated jump-diffusion parameters of daily log returns."""
+    mu: float
+    sigma: float
+    # Expected jumps per day
+    intensity: float
+    jump_mean: float
+    jump_std: float
+
+    @property
+    def log_mean(self) -> float:
+        """Mean daily log return, jumps included."""
+        return self.mu + self.intensity * self.jump_mean
+
+    @property
+    def log_variance(self) -> float:
+        """Variance of the daily log return, jumps included."""
+        return self.sigma ** 2 + self.intensity * (self.jump_mean ** 2 + self.jump_std ** 2)
+
+
+def fit_jumps(returns: np.ndarray, threshold: float = JUMP_THRESHOLD) -> JumpParameters:
+    """
+    Calibrate the jump diffusion from daily returns.
+
+    Args:
+        returns: Daily simple returns (NaNs dropped)
+        threshold: Robust standard deviations beyond which a return is a jump
+
+    Returns:
+        JumpParameters; intensity 0 if fewer than MIN_JUMPS jump days are found
+    """
+    log_returns = np.log1p(np.asarray(returns, dtype=np.float64))
+    log_returns = log_returns[~np.isnan(log_returns)]
+    center = np.median(log_returns)
+    scale = MAD_SCALE * np.median(np.abs(log_returns - center))
+    is_jump = np.abs(log_returns - center) > threshold * scale if scale > 0 else np.zeros(len(log_returns), bool)
+
+    no_jumps = JumpParameters(float(log_returns.mean()), float(log_returns.std(ddof=1)), 0.0, 0.0, 0.0)
+    if is_jump.sum() < MIN_JUMPS:
+        return no_jumps
+    diffusion, jumps = log_returns[~is_jump], log_returns[is_jump]
+    weight = is_jump.mean()
+    means = np.array([diffusion.mean(), jumps.mean()])
+    variances = np.array([diffusion.var(ddof=1), jumps.var(ddof=1)])
+
+    previous = -np.inf
+    for _ in range(EM_ITERATIONS):
+        # E step: probability that each day had a jump
+        deviations = log_returns[:, np.newaxis] - means
+        densities = np.exp(-deviations ** 2 / (2 * variances)) / np.sqrt(2 * np.pi * variances)
+        mixture = densities * [1 - weight, weight]
+        total = mixture.sum(axis=1)
+        responsibility = mixture[:, 1] / total
+        # M step, keeping the jump days at least as volatile as the diffusion
+        if responsibility.sum() < MIN_JUMPS:
+            return no_jumps
+        if responsibility.mean() >= 0.5:
+            break
+        weight = responsibility.mean()
+        shares = np.column_stack([1 - responsibility, responsibility])
+        means = (shares * log_returns[:, np.newaxis]).sum(axis=0) / shares.sum(axis=0)
+        variances = (shares * (log_returns[:, np.newaxis] - means) ** 2).sum(axis=0) / shares.sum(axis=0)
+        variances[1] = max(variances[1], variances[0])
+        likelihood = float(np.log(total).sum())
+        if likelihood - previous < EM_TOLERANCE * abs(likelihood):
+            break
+        previous = likelihood
+
+    return JumpParameters(
+        mu=float(means[0]),
+        sigma=float(np.sqrt(variances[0])),
+        intensity=float(weight),
+        jump_mean=float(means[1] - means[0]),
+        jump_std=float(np.sqrt(variances[1] - variances[0])),
+    )
+
+
+def earnings_move(parameters: JumpParameters) -> float:
+    """
+    Standard deviation of the log return added on an earnings day.
+
+    The root mean square of the calibrated jumps (an earnings gap is a jump
+    of unknown direction); JUMP_THRESHOLD diffusion standard deviations if
+    the history had no jumps.
+    """
+    if parameters.intensity > 0:
+        return float(np.hypot(parameters.jump_mean, parameters.jump_std))
+    return JUMP_THRESHOLD * parameters.sigma
+
+
+def trading_days_until(event: Union[str, date, datetime, None], last_bar: Union[str, date, datetime]) -> Optional[int]:
+    """
+    Trading day of an event counted from the day after the last bar.
+
+    Args:
+        event: Event date (e.g. FundamentalAnalyzer's 'earnings_date', 'YYYY-MM-DD')
+        last_bar: Date of the last price bar
+
+    Returns:
+        1 for the next trading day, 2 for the one after, ...; None if the
+        event is unknown or not after the last bar
+    """
+    if event is None:
+        return None
+    start = np.datetime64(str(last_bar)[:10], 'D') + 1
+    end = np.datetime64(str(event)[:10], 'D') + 1
+    if end <= start:
+        return None
+    days = int(np.busday_count(start, end))
+    return days if days > 0 else None
@@ -0,0 +1,250 @@
+"""
+Vectorized indicator kernels.
+
+Stochastic oscillator, true range / ATR, ADX, on-balance volume and VWAP as
+NumPy array operations with no Python loop over rows:
+
+- rolling highs/lows reduce over strided windows (sliding_window_view)
+- Wilder smoothing is the first-order recursive filter
+  s[t] = s[t-1] + (x[t] - s[t-1]) / period, run through scipy.signal.lfilter
+- OBV and VWAP are cumulative sums (VWAP restarting each session)
+
+Every kernel takes one ticker (1-D, or a pandas Series) or a panel of
+dates x tickers (2-D, or a DataFrame such as yf.download(...)['Close'])
+and works along the first axis. pandas inputs come back as pandas with the
+same index/columns. Leading NaNs (e.g. from a diff) are skipped; gaps
+inside a panel should be dropped or forward-filled first, as a NaN inside
+a recursive filter propagates to every later value.
+
+Example:
+    panel = yf.download(['AAPL', 'MSFT'], period='1y')
+    atr = average_true_range(panel['High'], panel['Low'], panel['Close'])
+"""
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _values(x: Any) -> np.ndarray:
+    """float64 array of an array-like (pandas or NumPy)."""
+    return np.asarray(x, dtype=np.float64)
+
+
+def _like(result: np.ndarray, template: Any, name: Optional[str] = None) -> Any:
+    """Wrap a result in the pandas type of the template, if it was pandas."""
+    import pandas as pd
+
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(result, index=template.index, columns=template.columns)
+    if isinstance(template, pd.Series):
+        return pd.Series(result, index=template.index, name=name if name is not None else template.name)
+    return result
+
+
+def _padded(windowed: np.ndarray, n: int) -> np.ndarray:
+    """Rolling results (one per full window) NaN-padded back to n rows."""
+    out = np.full((n,) + windowed.shape[1:], np.nan)
+    out[n - len(windowed):] = windowed
+    return out
+
+
+def _rolling(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    if len(x) < window:
+        return np.full(x.shape, np.nan)
+    windows = sliding_window_view(x, window, axis=0)  # (n - window + 1, ..., window)
+    return _padded(reduce(windows, axis=-1), len(x))
+
+
+def rolling_max(x: Any, window: int) -> Any:
+    """Highest value of each trailing window (NaN until the first full window)."""
+    return _like(_rolling(_values(x), window, np.max), x)
+
+
+def rolling_min(x: Any, window: int) -> Any:
+    """Lowest value of each trailing window (NaN until the first full window)."""
+    return _like(_rolling(_values(x), window, np.min), x)
+
+
+def rolling_mean(x: Any, window: int) -> Any:
+    """Mean of each trailing window (NaN until the first full window)."""
+    return _like(_rolling(_values(x), window, np.mean), x)
+
+
+def _leading_invalid(x: np.ndarray) -> int:
+    """Number of leading rows with a NaN in any column."""
+    valid = ~np.isnan(x).reshape(len(x), -1).any(axis=1)
+    return int(np.argmax(valid)) if valid.any() else len(x)
+
+
+def wilder(x: Any, period: int = 14) -> Any:
+    """
+    Wilder's smoothing (an EMA with alpha = 1/period).
+
+    Seeded with the mean of the first `period` valid rows; earlier rows are NaN.
+
+    Args:
+        x: Series/array, or dates x tickers panel
+        period: Smoothing period
+
+    Returns:
+        Smoothed values, same shape (and pandas type) as x
+    """
+    from scipy.signal import lfilter
+
+    values = _values(x)
+    out = np.full(values.shape, np.nan)
+    first = _leading_invalid(values)
+    seed_end = first + period
+    if seed_end <= len(values):
+        alpha = 1.0 / period
+        seed = values[first:seed_end].mean(axis=0)
+        out[seed_end - 1] = seed
+        # y[t] = alpha * x[t] + (1 - alpha) * y[t-1], starting from the seed
+        zi = np.expand_dims((1 - alpha) * seed, 0)
+        out[seed_end:], _ = lfilter([alpha], [1.0, alpha - 1.0], values[seed_end:], axis=0, zi=zi)
+    return _like(out, x)
+
+
+def _previous(x: np.ndarray) -> np.ndarray:
+    """x shifted down one row (first row NaN)."""
+    out = np.empty_like(x)
+    out[0] = np.nan
+    out[1:] = x[:-1]
+    return out
+
+
+def true_range(high: Any, low: Any, close: Any) -> Any:
+    """
+    True range: the largest of high - low and the gaps from the previous close.
+
+    The first row has no previous close and is NaN (as in TA-Lib), so ATR and
+    the ADX directional movement are seeded over the same rows.
+    """
+    h, l, c = _values(high), _values(low), _values(close)
+    prev_close = _previous(c)
+    return _like(np.maximum.reduce([h - l, np.abs(h - prev_close), np.abs(l - prev_close)]), close, 'true_range')
+
+
+def average_true_range(high: Any, low: Any, close: Any, period: int = 14) -> Any:
+    """Wilder-smoothed true range (ATR)."""
+    return wilder(true_range(high, low, close), period)
+
+
+def percent_k(close: Any, highest: Any, lowest: Any) -> Any:
+    """
+    Stochastic %K from precomputed rolling highs and lows.
+
+    Returns:
+        Close within the window's range, 0-100; NaN where the range is zero
+    """
+    c, hh, ll = _values(close), _values(highest), _values(lowest)
+    span = hh - ll
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(span > 0, 100 * (c - ll) / span, np.nan)
+    return _like(result, close, 'percent_k')
+
+
+def stochastic(high: Any, low: Any, close: Any, k_period: int = 14, d_period: int = 3) -> Tuple[Any, Any]:
+    """
+    Stochastic oscillator.
+
+    Args:
+        high, low, close: Series/arrays, or dates x tickers panels
+        k_period: Lookback of the highest high / lowest low
+        d_period: Moving average of %K giving %D
+
+    Returns:
+        Tuple of (%K, %D) in 0-100
+    """
+    h, l = _values(high), _values(low)
+    k = _values(percent_k(close, _rolling(h, k_period, np.max), _rolling(l, k_period, np.min)))
+    return _like(k, close, 'percent_k'), _like(_rolling(k, d_period, np.mean), close, 'percent_d')
+
+
+def directional_movement(high: Any, low: Any) -> Tuple[Any, Any]:
+    """
+    Wilder's +DM and -DM (the larger of the up/down moves, else 0).
+
+    Returns:
+        Tuple of (+DM, -DM); the first row (no previous bar) is NaN
+    """
+    h, l = _values(high), _values(low)
+    up = h - _previous(h)
+    down = _previous(l) - l
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    plus_dm[0] = minus_dm[0] = np.nan
+    return _like(plus_dm, high, 'plus_dm'), _like(minus_dm, high, 'minus_dm')
+
+
+def directional_index(smoothed_dm: Any, atr: Any) -> Any:
+    """+DI or -DI: Wilder-smoothed directional movement as a percentage of ATR."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _like(100 * _values(smoothed_dm) / _values(atr), smoothed_dm)
+
+
+def directional_spread(plus_di: Any, minus_di: Any) -> Any:
+    """DX: |+DI - -DI| / (+DI + -DI) in 0-100, the quantity ADX smooths."""
+    p, m = _values(plus_di), _values(minus_di)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _like(100 * np.abs(p - m) / (p + m), plus_di, 'dx')
+
+
+def average_directional_index(high: Any, low: Any, close: Any, period: int = 14,
+                              atr: Any = None) -> Tuple[Any, Any, Any]:
+    """
+    Wilder's ADX with the directional indicators.
+
+    Args:
+        high, low, close: Series/arrays, or dates x tickers panels
+        period: Smoothing period
+        atr: Precomputed average_true_range(high, low, close, period) to reuse
+
+    Returns:
+        Tuple of (ADX, +DI, -DI) in 0-100; ADX is NaN for the first 2 * period - 1 rows
+    """
+    plus_dm, minus_dm = directional_movement(_values(high), _values(low))
+    smoothed_tr = _values(atr if atr is not None else average_true_range(high, low, close, period))
+    plus_di = directional_index(wilder(plus_dm, period), smoothed_tr)
+    minus_di = directional_index(wilder(minus_dm, period), smoothed_tr)
+    adx = wilder(directional_spread(plus_di, minus_di), period)
+    return _like(adx, close, 'adx'), _like(plus_di, close, 'plus_di'), _like(minus_di, close, 'minus_di')
+
+
+def on_balance_volume(close: Any, volume: Any) -> Any:
+    """On-balance volume: running sum of volume signed by the close-to-close move (starts at 0)."""
+    c, v = _values(close), _values(volume)
+    direction = np.sign(c - _previous(c))
+    direction[0] = 0
+    return _like(np.cumsum(direction * v, axis=0), close, 'obv')
+
+
+def vwap(high: Any, low: Any, close: Any, volume: Any, sessions: Any = None) -> Any:
+    """
+    Volume-weighted average price of the typical price (high + low + close) / 3.
+
+    Args:
+        high, low, close, volume: Series/arrays, or dates x tickers panels
+        sessions: One label per row (e.g. the trading date of intraday bars);
+            the average restarts when the label changes. None accumulates
+            over the whole series (anchored VWAP).
+
+    Returns:
+        VWAP, same shape as close
+    """
+    typical = (_values(high) + _values(low) + _values(close)) / 3
+    v = _values(volume)
+    pv = typical * v
+    cum_pv = np.cumsum(pv, axis=0)
+    cum_v = np.cumsum(v, axis=0)
+    if sessions is not None:
+        labels = np.asarray(sessions)
+        starts = np.r_[True, labels[1:] != labels[:-1]]
+        # Row at which each row's session began, and the totals before it
+        start_row = np.maximum.accumulate(np.where(starts, np.arange(len(labels)), 0))
+        cum_pv = cum_pv - (cum_pv - pv)[start_row]
+        cum_v = cum_v - (cum_v - v)[start_row]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = cum_pv / cum_v
+    return _like(result, close, 'vwap')
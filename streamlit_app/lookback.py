@@ -0,0 +1,152 @@
+"""
+Lookback planning: how much history an analysis needs.
+
+Every registered indicator declares its inputs as intermediate keys (see
+indicator_engine.py), so the bars needed before its latest value is valid
+follow from the keys: a rolling window of w needs w - 1 earlier bars, a diff
+of p needs p, and recursive averages (EMA, Wilder smoothing) additionally
+need enough bars for the arbitrary starting value to fade out, i.e. until
+its remaining weight (1 - alpha)^n is below WARMUP_TOLERANCE.
+
+The Monte Carlo simulation estimates drift and volatility from the last
+ESTIMATION_BARS daily returns of the timeframe. DataFetcher requests the
+calendar range covering the larger of the two needs and keeps exactly
+that many bars; TechnicalIndicators skips any indicator the data is too
+short for (e.g. a recent IPO) instead of computing an all-NaN series.
+
+Example:
+    indicator_bars()                 # 200 with the default indicators (SMA 200)
+    history_bars('long')             # {'1d': 253}: 252 returns for the simulation
+    history_period(200, '1h')        # '50d'
+"""
+import math
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from bars import INTERVAL_MINUTES, INTRADAY_INTERVALS, normalize_interval
+from indicator_engine import Key, get_indicator, indicator_names, is_key
+
+# Remaining weight of the seed value tolerated in recursive averages
+WARMUP_TOLERANCE = 0.01
+
+# Daily returns the Monte Carlo simulation estimates drift/volatility from
+ESTIMATION_BARS = {
+    'short': 42,    # ~2 months
+    'medium': 126,  # ~6 months
+    'long': 252,    # 1 year
+}
+
+TRADING_DAYS_PER_YEAR = 252
+SESSION_MINUTES = 390
+# Calendar days added to intraday/daily ranges for holidays
+CALENDAR_MARGIN_DAYS = 7
+
+
+def recursive_warmup(alpha: float, tolerance: float = WARMUP_TOLERANCE) -> int:
+    """Bars until a recursive average's starting value weighs less than the tolerance."""
+    return math.ceil(math.log(tolerance) / math.log(1 - alpha))
+
+
+# Intermediate kind -> rule(lookback of its inputs, non-key args, converged) -> lookback
+LookbackRule = Callable[[int, Tuple, bool], int]
+
+_RULES: Dict[str, LookbackRule] = {
+    'column': lambda inputs, args, converged: 0,
+    'diff': lambda inputs, args, converged: inputs + args[0],
+    'rolling_mean': lambda inputs, args, converged: inputs + args[0] - 1,
+    'rolling_std': lambda inputs, args, converged: inputs + args[0] - 1,
+    'rolling_max': lambda inputs, args, converged: inputs + args[0] - 1,
+    'rolling_min': lambda inputs, args, converged: inputs + args[0] - 1,
+    'ema': lambda inputs, args, converged: inputs + (recursive_warmup(2 / (args[0] + 1)) if converged else 0),
+    'wilder': lambda inputs, args, converged: (inputs + args[0] - 1
+                                               + (recursive_warmup(1 / args[0]) if converged else 0)),
+    # Need the previous bar
+    'true_range': lambda inputs, args, converged: inputs + 1,
+    'plus_dm': lambda inputs, args, converged: inputs + 1,
+    'minus_dm': lambda inputs, args, converged: inputs + 1,
+}
+
+
+def register_lookback(kind: str) -> Callable[[LookbackRule], LookbackRule]:
+    """
+    Register the lookback rule of a custom intermediate kind.
+
+    Kinds without a rule are assumed to need no bars beyond their inputs.
+
+    Returns:
+        Decorator registering rule(inputs_lookback, args, converged) -> bars
+    """
+    def decorator(rule: LookbackRule) -> LookbackRule:
+        _RULES[kind] = rule
+        return rule
+    return decorator
+
+
+def key_lookback(key: Key, converged: bool = True) -> int:
+    """
+    Bars needed before the first usable value of an intermediate.
+
+    Args:
+        key: Intermediate key
+        converged: Include the warm-up of recursive averages (else only the
+            bars before the first non-NaN value)
+    """
+    inputs = max((key_lookback(arg, converged) for arg in key[1:] if is_key(arg)), default=0)
+    args = tuple(arg for arg in key[1:] if not is_key(arg))
+    rule = _RULES.get(key[0])
+    return rule(inputs, args, converged) if rule else inputs
+
+
+def indicator_bars(names: Optional[Iterable[str]] = None, converged: bool = True) -> int:
+    """
+    Bars needed for the latest value of indicators (with their default parameters).
+
+    Args:
+        names: Indicator names (default: all registered)
+        converged: See key_lookback
+
+    Returns:
+        Number of bars, including the latest one
+    """
+    import indicators  # noqa: F401 - registers the built-in indicators
+
+    names = indicator_names() if names is None else names
+    lookbacks = [key_lookback(key, converged) for name in names
+                 for key in get_indicator(name).inputs(**get_indicator(name).defaults).values()]
+    return max(lookbacks, default=0) + 1
+
+
+def history_bars(timeframe: str, interval: str = '1d') -> Dict[str, int]:
+    """
+    Bars an analysis needs per interval.
+
+    Args:
+        timeframe: 'short', 'medium', or 'long'
+        interval: Bar interval of the indicators
+
+    Returns:
+        Interval -> bars: the indicators' interval, plus daily bars for the
+        Monte Carlo estimation window (one interval if both are daily)
+    """
+    interval = normalize_interval(interval)
+    needs = {interval: indicator_bars(), '1d': ESTIMATION_BARS.get(timeframe, ESTIMATION_BARS['short']) + 1}
+    if interval == '1d':
+        needs['1d'] = max(needs['1d'], indicator_bars())
+    return needs
+
+
+def history_period(bars: int, interval: str = '1d') -> str:
+    """
+    yfinance period ('Nd') covering a number of bars.
+
+    Trading sessions are converted to calendar days (252 sessions a year)
+    with a margin for holidays; weekly and monthly bars get one extra bar.
+    """
+    interval = normalize_interval(interval)
+    if interval == '1wk':
+        return f"{(bars + 1) * 7}d"
+    if interval == '1mo':
+        return f"{(bars + 1) * 31}d"
+    sessions = bars
+    if interval in INTRADAY_INTERVALS:
+        sessions = math.ceil(bars / math.ceil(SESSION_MINUTES / INTERVAL_MINUTES[interval]))
+    return f"{math.ceil(sessions * 365.25 / TRADING_DAYS_PER_YEAR) + CALENDAR_MARGIN_DAYS}d"
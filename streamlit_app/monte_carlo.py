@@ -1,56 +1,488 @@
 """
 Monte Carlo simulation for stock price prediction.
+
+Daily returns are drawn from a normal distribution with the historical drift
+and volatility, so the price after n days is a product of n i.i.d. factors
+(1 + r). Its log is a sum of n i.i.d. terms and close to normal; matching a
+lognormal to the mean and variance of 1 + r gives every summary statistic in
+closed form (run_analytic). Path simulation (run_simulation) is only needed
+for the chart and for return models without such a form.
+
+Paths are simulated in vectorized batches. run_adaptive() adds batches until
+the bull probability and the 10/50/90 percentiles are known to a requested
+precision, so calm stocks stop after a few hundred paths and volatile ones
+get more.
+
+Path-dependent risk (does the stop-loss hit before the target, how soon,
+how deep the drawdown gets) is accumulated chunk by chunk in PathRisk, so
+run_path_risk() can report it without ever holding all paths.
+
+Several horizons come from one path set: paths are simulated to the longest
+horizon and each shorter horizon reads its day's column, so a 1-week,
+1-month and 6-month view costs one 6-month run. Their percentiles are taken
+with a single np.partition over the horizon columns.
+
+model='garch' replaces the constant volatility with a GARCH(1,1) fit
+(garch.py), so simulations start from the current volatility regime. Paths
+are stepped one day at a time with all paths at once: the conditional
+variance of day t + 1 needs the shocks of day t, but nothing couples paths,
+so the Python loop runs over days only. The closed form then only matches
+the expected variance over the horizon, not the fat tails, so analyses
+simulate paths for it.
+
+model='jump' adds Merton jumps calibrated from the history (jumps.py) and,
+given earnings_day, a jump of the typical jump size on that day. Jump
+counts and sizes are drawn as (paths, days) arrays like the diffusion.
+
+precision='float32' simulates normal-return paths in float32, half the
+memory traffic of float64. Products of float32 factors would accumulate
+rounding day by day, so the paths are cumulative sums of log returns,
+exponentiated at the end. float32_error() bounds the rounding error; when
+the horizon and volatility push it past FLOAT32_TOLERANCE, the simulation
+falls back to float64.
 """
+import math
+from statistics import NormalDist
+
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from garch import GarchParameters, GarchStore, default_store, fit_garch
+from jumps import JumpParameters, earnings_move, fit_jumps
+from profiling import timed
+
+# Daily return models: i.i.d. normal, normal with GARCH(1,1) variance, or
+# normal with Poisson jumps
+RETURN_MODELS = ('normal', 'garch', 'jump')
+
+# Percentiles whose confidence intervals run_adaptive() tracks
+TRACKED_PERCENTILES = (10, 50, 90)
+# z of the two-sided 95% confidence intervals
+CONFIDENCE_Z = 1.96
+
+# Floating-point precisions of simulated paths
+PRECISIONS = ('float64', 'float32')
+# Largest relative price error allowed in float32 (a cent on a $100 price)
+FLOAT32_TOLERANCE = 1e-4
+# Smallest float32 daily return with a finite log (-1 would be a price of 0)
+FLOAT32_RETURN_FLOOR = np.nextafter(np.float32(-1), np.float32(0))
+
+# Percentile of each per-horizon price statistic
+HORIZON_PERCENTILES = {
+    'percentile_10': 10,
+    'bear_target': 35,
+    'median_price': 50,
+    'bull_target': 65,
+    'percentile_90': 90,
+}
+
+# Stop-loss of the recommendation, as a fraction of the current price
+STOP_LOSS_FACTOR = 0.97
+
+# Paths processed at once when accumulating path statistics
+CHUNK_SIZE = 2000
+
+
+def float32_error(days: int, drift: float, volatility: float) -> float:
+    """
+    Bound of the relative price error of float32 log-space paths.
+    
+    Each day's log return is rounded (relative error eps), and so is each
+    partial sum of the cumulative sum, whose size grows like
+    volatility * sqrt(t) + |drift| * t. Summing the worst case over the days
+    gives the bound; the actual error is usually far smaller, as roundings
+    partly cancel.
+    
+    Args:
+        days: Number of days simulated
+        drift, volatility: Mean and standard deviation of daily returns
+        
+    Returns:
+        Relative error bound of the final prices
+    """
+    eps = float(np.finfo(np.float32).eps)
+    partial_sums = volatility * 2 / 3 * days ** 1.5 + abs(drift) * days ** 2 / 2
+    return eps * (1 + volatility * days + partial_sums)
+
+
+class PathRisk:
+    """
+    Path-dependent statistics of simulated prices, accumulated chunk by chunk.
+    
+    Only counts, sums and one maximum drawdown per path are kept, never the
+    paths themselves. Prices are daily closes, so a level counts as hit on
+    the first day a close reaches it.
+    """
+    
+    def __init__(self, current_price: float, stop_loss: float, target: float):
+        """
+        Initialize accumulator.
+        
+        Args:
+            current_price: Starting price
+            stop_loss: Price level below which the stop-loss triggers
+            target: Price level at or above which the target is reached
+        """
+        self.current_price = current_price
+        self.stop_loss = stop_loss
+        self.target = target
+        self.paths = 0
+        self.stop_hits = 0
+        self.target_hits = 0
+        self.stop_first = 0
+        self.target_first = 0
+        self.stop_days = 0.0
+        self.target_days = 0.0
+        self.drawdowns: List[np.ndarray] = []
+    
+    def update(self, paths: np.ndarray):
+        """
+        Add a chunk of paths.
+        
+        Args:
+            paths: (paths, days) array of prices, excluding the starting price
+        """
+        stop_day = self._first_day(paths <= self.stop_loss)
+        target_day = self._first_day(paths >= self.target)
+        hit_stop = np.isfinite(stop_day)
+        hit_target = np.isfinite(target_day)
+        
+        self.paths += len(paths)
+        self.stop_hits += int(hit_stop.sum())
+        self.target_hits += int(hit_target.sum())
+        self.stop_first += int((stop_day < target_day).sum())
+        self.target_first += int((target_day < stop_day).sum())
+        self.stop_days += float(stop_day[hit_stop].sum())
+        self.target_days += float(target_day[hit_target].sum())
+        
+        # Drawdown from the highest price so far (the starting price included),
+        # stepping through the days with all paths at once
+        peak = np.full(len(paths), float(self.current_price))
+        drawdown = np.zeros(len(paths))
+        for prices in paths.T:
+            np.maximum(peak, prices, out=peak)
+            np.maximum(drawdown, 1 - prices / peak, out=drawdown)
+        self.drawdowns.append(drawdown)
+    
+    @staticmethod
+    def _first_day(hits: np.ndarray) -> np.ndarray:
+        """Day (1-based) of each path's first hit, inf if never hit."""
+        return np.where(hits.any(axis=1), hits.argmax(axis=1) + 1, np.inf)
+    
+    def result(self) -> Dict[str, float]:
+        """
+        Statistics of all paths added so far.
+        
+        Returns:
+            Dictionary with the levels, hit probabilities (percent; 'stop_first'
+            and 'target_first' count paths hitting that level before the other),
+            mean days to each level among the paths reaching it (NaN if none)
+            and the max drawdown distribution (percent)
+        """
+        n = max(self.paths, 1)
+        drawdowns = np.concatenate(self.drawdowns) * 100 if self.drawdowns else np.full(1, np.nan)
+        median, percentile_90 = np.percentile(drawdowns, [50, 90])
+        return {
+            'stop_loss': self.stop_loss,
+            'target': self.target,
+            'stop_probability': self.stop_hits / n * 100,
+            'target_probability': self.target_hits / n * 100,
+            'stop_first_probability': self.stop_first / n * 100,
+            'target_first_probability': self.target_first / n * 100,
+            'days_to_stop': self.stop_days / self.stop_hits if self.stop_hits else float('nan'),
+            'days_to_target': self.target_days / self.target_hits if self.target_hits else float('nan'),
+            'max_drawdown_mean': float(drawdowns.mean()),
+            'max_drawdown_median': float(median),
+            'max_drawdown_90': float(percentile_90),
+        }
 
 
 class MonteCarloSimulator:
     """Run Monte Carlo simulations for stock price predictions."""
     
-    def __init__(self, data: pd.DataFrame, iterations: int = 1000):
+    def __init__(self, data: pd.DataFrame, iterations: int = 1000, estimation_window: Optional[int] = None,
+                 seed: Optional[int] = None, model: str = 'normal', ticker: Optional[str] = None,
+                 store: Optional[GarchStore] = None, earnings_day: Optional[int] = None,
+                 precision: str = 'float64'):
         """
         Initialize Monte Carlo simulator.
         
         Args:
             data: Historical price data
             iterations: Number of simulation iterations
+            estimation_window: Number of most recent returns drift and volatility
+                are estimated from (default: all)
+            seed: Seed of the simulator's own random generator (default: the
+                global NumPy random state, as set by np.random.seed)
+            model: Daily return model, one of RETURN_MODELS
+            ticker: Ticker of the data; GARCH fits are cached per ticker in the
+                store (without a ticker, per simulator)
+            store: GARCH parameter store (default: garch.default_store)
+            earnings_day: Simulated day (1 = next trading day) of a known
+                earnings report; model='jump' adds a jump on it
+            precision: 'float64', or 'float32' for normal-return paths within
+                FLOAT32_TOLERANCE (see simulation_dtype)
         """
+        if model not in RETURN_MODELS:
+            raise ValueError(f"Unknown return model: {model}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
         self.data = data
         self.iterations = iterations
+        self.estimation_window = estimation_window
+        self.rng = np.random.default_rng(seed) if seed is not None else np.random
+        self.model = model
+        self.ticker = ticker
+        self.store = store or default_store
+        self.earnings_day = earnings_day
+        self.precision = precision
+        self._parameters: Optional[Tuple[float, float]] = None
+        self._garch: Optional[GarchParameters] = None
+        self._jumps: Optional[JumpParameters] = None
+        
+    @property
+    def has_closed_form(self) -> bool:
+        """True if run_analytic matches the simulated distribution (not just its mean and variance)."""
+        return self.model == 'normal'
+    
+    def simulation_dtype(self, days: int) -> type:
+        """
+        dtype paths over `days` days are simulated in.
         
-    def run_simulation(self, days: int, current_price: float) -> Dict:
+        float32 if requested, the model is 'normal' and float32_error() stays
+        within FLOAT32_TOLERANCE; float64 otherwise.
+        """
+        if self.precision == 'float32' and self.model == 'normal':
+            drift, volatility = self.estimate_parameters()
+            if float32_error(days, drift, volatility) <= FLOAT32_TOLERANCE:
+                return np.float32
+        return np.float64
+        
+    def simulate_paths(self, paths: int, days: int, current_price: float) -> np.ndarray:
+        """
+        Simulate price paths.
+        
+        Args:
+            paths: Number of paths
+            days: Number of days to simulate
+            current_price: Starting price
+            
+        Returns:
+            (paths, days) array of prices, excluding the starting price, of
+            dtype simulation_dtype(days)
+        """
+        if self.simulation_dtype(days) == np.float32:
+            return self._simulate_float32(paths, days, current_price)
+        if self.model == 'garch':
+            return self._simulate_garch(paths, days, current_price)
+        if self.model == 'jump':
+            return self._simulate_jumps(paths, days, current_price)
+        drift, volatility = self.estimate_parameters()
+        # One array, updated in place: daily growth factors, the first scaled by the starting price
+        prices = self.rng.normal(drift, volatility, (paths, days))
+        prices += 1
+        prices[:, 0] *= current_price
+        # Multiplied left to right from the starting price, one day at a time
+        return np.cumprod(prices, axis=1, out=prices)
+    
+    def _simulate_float32(self, paths: int, days: int, current_price: float) -> np.ndarray:
+        """Normal-return paths as float32 cumulative log returns, in one array updated in place."""
+        drift, volatility = self.estimate_parameters()
+        if isinstance(self.rng, np.random.Generator):
+            prices = self.rng.standard_normal((paths, days), dtype=np.float32)
+        else:
+            # The global random state only draws float64
+            prices = self.rng.standard_normal((paths, days)).astype(np.float32)
+        prices *= np.float32(volatility)
+        prices += np.float32(drift)
+        np.maximum(prices, FLOAT32_RETURN_FLOOR, out=prices)
+        np.log1p(prices, out=prices)
+        np.cumsum(prices, axis=1, out=prices)
+        np.exp(prices, out=prices)
+        prices *= np.float32(current_price)
+        return prices
+    
+    def _simulate_garch(self, paths: int, days: int, current_price: float) -> np.ndarray:
+        """GARCH(1,1) price paths, stepping all paths through one day at a time."""
+        garch = self.garch_parameters()
+        prices = np.empty((days, paths))
+        price = np.full(paths, float(current_price))
+        variance = np.full(paths, garch.next_variance)
+        for day in range(days):
+            shock = self.rng.standard_normal(paths)
+            shock *= np.sqrt(variance)
+            price *= 1 + garch.mu + shock
+            prices[day] = price
+            # Tomorrow's variance from today's shock
+            variance *= garch.beta
+            variance += garch.omega + garch.alpha * shock ** 2
+        return prices.T
+    
+    def _simulate_jumps(self, paths: int, days: int, current_price: float) -> np.ndarray:
+        """Jump-diffusion price paths, with every draw made for all paths and days at once."""
+        jumps = self.jump_parameters()
+        log_returns = self.rng.normal(jumps.mu, jumps.sigma, (paths, days))
+        if jumps.intensity > 0:
+            # The sum of n normal jumps is normal with n times their mean and variance
+            counts = self.rng.poisson(jumps.intensity, (paths, days))
+            log_returns += counts * jumps.jump_mean + np.sqrt(counts) * jumps.jump_std * self.rng.standard_normal((paths, days))
+        if self.earnings_day is not None and 1 <= self.earnings_day <= days:
+            log_returns[:, self.earnings_day - 1] += self.rng.normal(0.0, earnings_move(jumps), paths)
+        return current_price * np.exp(np.cumsum(log_returns, axis=1))
+    
+    @timed()
+    def run_simulation(self, days: int, current_price: float, stop_loss: Optional[float] = None,
+                       target: Optional[float] = None, horizons: Optional[Iterable[int]] = None) -> Dict:
         """
         Run Monte Carlo simulation.
         
         Args:
             days: Number of days to simulate
             current_price: Starting price
+            stop_loss: Stop-loss level of the path statistics (default: STOP_LOSS_FACTOR x current price)
+            target: Target level of the path statistics (default: the simulated bull target)
+            horizons: Further horizons (days) to report statistics for; paths
+                are simulated once, to the longest of them and days
             
         Returns:
-            Dictionary with simulation results
+            Dictionary with simulation results and PathRisk statistics at
+            days, and 'horizons': horizon -> statistics (see _horizon_statistics)
+        """
+        horizons = self._horizons(days, horizons)
+        paths = self.simulate_paths(self.iterations, horizons[-1], current_price)
+        result = self._summarize(paths, days, current_price, horizons)
+        return self._add_path_risk(result, stop_loss, target)
+    
+    @timed()
+    def run_path_risk(self, days: int, current_price: float, stop_loss: Optional[float] = None,
+                      target: Optional[float] = None, paths: Optional[int] = None) -> Dict[str, float]:
         """
-        # Calculate historical returns
-        returns = self.data['Close'].pct_change().dropna()
+        Path statistics alone, simulated chunk by chunk without keeping the paths.
         
-        # Calculate drift (mean return) and volatility (std of returns)
-        drift = returns.mean()
-        volatility = returns.std()
+        Args:
+            days: Number of days to simulate
+            current_price: Starting price
+            stop_loss: Stop-loss level (default: STOP_LOSS_FACTOR x current price)
+            target: Target level (default: the closed-form bull target)
+            paths: Number of paths (default: iterations)
+            
+        Returns:
+            PathRisk statistics
+        """
+        paths = self.iterations if paths is None else paths
+        if stop_loss is None:
+            stop_loss = current_price * STOP_LOSS_FACTOR
+        if target is None:
+            target = self.run_analytic(days, current_price)['bull_target']
+        risk = PathRisk(current_price, stop_loss, target)
+        for start in range(0, paths, CHUNK_SIZE):
+            risk.update(self.simulate_paths(min(CHUNK_SIZE, paths - start), days, current_price))
+        return risk.result()
+    
+    @timed()
+    def run_adaptive(self, days: int, current_price: float, probability_tolerance: float = 2.5,
+                     price_tolerance: float = 1.5, batch_size: int = 250,
+                     max_iterations: int = 20000, stop_loss: Optional[float] = None,
+                     target: Optional[float] = None) -> Dict:
+        """
+        Simulate batches of paths until the statistics are precise enough.
         
-        # Run simulations
-        simulations = np.zeros((self.iterations, days))
+        After each batch, the standard error of the bull probability and the
+        95% confidence intervals of the 10th/50th/90th percentiles (from order
+        statistics, no distribution assumed) are checked against the tolerances.
         
-        for i in range(self.iterations):
-            # Generate random returns based on historical distribution
-            daily_returns = np.random.normal(drift, volatility, days)
-            
-            # Calculate price path
-            price_path = [current_price]
-            for ret in daily_returns:
-                price_path.append(price_path[-1] * (1 + ret))
+        Args:
+            days: Number of days to simulate
+            current_price: Starting price
+            probability_tolerance: Largest standard error of the bull probability (percentage points)
+            price_tolerance: Largest half-width of the percentile confidence
+                intervals (percent of the current price)
+            batch_size: Paths per batch
+            max_iterations: Paths after which to stop regardless
+            stop_loss, target: Levels of the path statistics (see run_simulation)
             
-            simulations[i] = price_path[1:]  # Exclude starting price
+        Returns:
+            Dictionary with simulation results and PathRisk statistics, plus 'iterations' (paths used),
+            'probability_error', 'price_error' (achieved precision, in the
+            units of the tolerances) and 'converged'
+        
+        Raises:
+            ValueError: If batch_size or max_iterations is not positive
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive: {batch_size}")
+        if max_iterations <= 0:
+            raise ValueError(f"max_iterations must be positive: {max_iterations}")
+        batches = []
+        paths = 0
+        while True:
+            batch = min(batch_size, max_iterations - paths)
+            batches.append(self.simulate_paths(batch, days, current_price))
+            paths += batch
+            final_prices = np.concatenate([b[:, -1] for b in batches])
+            probability_error, price_error = self._precision(final_prices, current_price)
+            converged = probability_error <= probability_tolerance and price_error <= price_tolerance
+            if converged or paths >= max_iterations:
+                break
+        
+        result = self._add_path_risk(self._summarize(np.concatenate(batches), days, current_price), stop_loss, target)
+        result.update({
+            'iterations': paths,
+            'probability_error': probability_error,
+            'price_error': price_error,
+            'converged': converged,
+        })
+        return result
+    
+    def _add_path_risk(self, result: Dict, stop_loss: Optional[float], target: Optional[float]) -> Dict:
+        """Add PathRisk statistics of the result's paths, chunk by chunk."""
+        current_price = result['current_price']
+        risk = PathRisk(current_price,
+                        current_price * STOP_LOSS_FACTOR if stop_loss is None else stop_loss,
+                        result['bull_target'] if target is None else target)
+        simulations = result['simulations']
+        for start in range(0, len(simulations), CHUNK_SIZE):
+            risk.update(simulations[start:start + CHUNK_SIZE])
+        result.update(risk.result())
+        return result
+    
+    def _precision(self, final_prices: np.ndarray, current_price: float) -> Tuple[float, float]:
+        """
+        Sampling error of the tracked statistics.
+        
+        Returns:
+            Tuple of (standard error of the bull probability in percentage points,
+            largest percentile CI half-width in percent of the current price)
+        """
+        n = len(final_prices)
+        p = np.mean(final_prices > current_price)
+        probability_error = math.sqrt(p * (1 - p) / n) * 100
+        
+        ordered = np.sort(final_prices)
+        half_widths = []
+        for percentile in TRACKED_PERCENTILES:
+            q = percentile / 100
+            # Ranks bounding the percentile with 95% confidence (binomial count of paths below it)
+            margin = CONFIDENCE_Z * math.sqrt(n * q * (1 - q))
+            low = max(int(math.floor(n * q - margin)), 0)
+            high = min(int(math.ceil(n * q + margin)), n - 1)
+            half_widths.append((ordered[high] - ordered[low]) / 2)
+        return probability_error, max(half_widths) / current_price * 100
+    
+    def _summarize(self, paths: np.ndarray, days: int, current_price: float,
+                   horizons: Optional[List[int]] = None) -> Dict:
+        """
+        Statistics of simulated prices.
+        
+        Args:
+            paths: (paths, n) array of prices, n at least every horizon
+            days: Horizon of the main statistics, 'simulations' and 'final_prices'
+            current_price: Starting price
+            horizons: Sorted horizons of 'horizons' (default: [days])
+        """
+        drift, volatility = self.return_parameters()
+        simulations = paths[:, :days]
         
         # Calculate statistics
         final_prices = simulations[:, -1]
@@ -82,9 +514,191 @@ class MonteCarloSimulator:
             'drift': drift,
             'volatility': volatility,
             'current_price': current_price,
-            'days': days
+            'days': days,
+            'horizons': self._horizon_statistics(paths, horizons or [days], current_price)
         }
     
+    @staticmethod
+    def _horizons(days: int, horizons: Optional[Iterable[int]]) -> List[int]:
+        """days and the requested horizons, sorted and without duplicates."""
+        return sorted({int(days), *(int(h) for h in horizons or ())})
+    
+    def _horizon_statistics(self, paths: np.ndarray, horizons: List[int],
+                            current_price: float) -> Dict[int, Dict[str, float]]:
+        """
+        Price statistics at several horizons of one path set.
+        
+        The horizon columns are partitioned together at the order statistics
+        every percentile needs, then interpolated linearly between them as in
+        np.percentile, so all horizons cost one partial sort.
+        
+        Args:
+            paths: (paths, n) array of prices, n at least max(horizons)
+            horizons: Horizons in days
+            current_price: Starting price
+            
+        Returns:
+            Dictionary of horizon -> median/mean price, 10th/90th percentile,
+            bull/bear probability and bull/bear target
+        """
+        columns = paths[:, [h - 1 for h in horizons]]
+        positions = np.array(list(HORIZON_PERCENTILES.values())) / 100 * (len(columns) - 1)
+        below = np.floor(positions).astype(int)
+        above = np.minimum(below + 1, len(columns) - 1)
+        ordered = np.partition(columns, np.union1d(below, above), axis=0)
+        weight = (positions - below)[:, np.newaxis]
+        percentiles = ordered[below] + (ordered[above] - ordered[below]) * weight
+        
+        bull = np.mean(columns > current_price, axis=0) * 100
+        means = columns.mean(axis=0)
+        statistics = {}
+        for i, horizon in enumerate(horizons):
+            statistics[horizon] = {key: float(percentiles[j, i]) for j, key in enumerate(HORIZON_PERCENTILES)}
+            statistics[horizon].update({
+                'mean_price': float(means[i]),
+                'bull_probability': float(bull[i]),
+                'bear_probability': float(100 - bull[i]),
+            })
+        return statistics
+        
+    def _returns(self) -> np.ndarray:
+        """Daily returns of the estimation window."""
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        returns = close[1:] / close[:-1] - 1
+        returns = returns[~np.isnan(returns)]
+        if self.estimation_window:
+            returns = returns[-self.estimation_window:]
+        return returns
+    
+    def estimate_parameters(self) -> Tuple[float, float]:
+        """
+        Estimate the daily return distribution from the price history.
+        
+        Returns:
+            Tuple of (drift, volatility): mean and standard deviation of daily
+            returns (computed once per simulator)
+        """
+        if self._parameters is None:
+            returns = self._returns()
+            self._parameters = (float(returns.mean()), float(returns.std(ddof=1)))
+        return self._parameters
+    
+    def garch_parameters(self) -> GarchParameters:
+        """
+        GARCH(1,1) fit of the daily returns.
+        
+        Fitted on the whole history (a shorter estimation window is too short
+        for a stable fit), once per ticker and history in the store.
+        """
+        if self._garch is None:
+            close = self.data['Close'].to_numpy(dtype=np.float64)
+            returns = close[1:] / close[:-1] - 1
+            if self.ticker:
+                self._garch = self.store.get(self.ticker, returns, version=(str(self.data.index[-1]), len(returns)))
+            else:
+                self._garch = fit_garch(returns)
+        return self._garch
+    
+    def jump_parameters(self) -> JumpParameters:
+        """Jump-diffusion calibration of the daily returns (computed once per simulator)."""
+        if self._jumps is None:
+            self._jumps = fit_jumps(self._returns())
+        return self._jumps
+    
+    def return_parameters(self, days: int = 1) -> Tuple[float, float]:
+        """
+        Drift and volatility of the return model.
+        
+        Args:
+            days: Horizon the volatility is averaged over (GARCH variance
+                reverts to its long-run level along it; an earnings jump
+                within it is spread over its days)
+            
+        Returns:
+            Tuple of (drift, volatility) of daily returns; for GARCH the RMS of
+            the expected daily volatilities over the next `days` days, for
+            jumps the mean and standard deviation of 1 + r matching the log
+            return moments
+        """
+        if self.model == 'garch':
+            garch = self.garch_parameters()
+            return garch.mu, math.sqrt(float(garch.expected_variances(days).mean()))
+        if self.model == 'jump':
+            jumps = self.jump_parameters()
+            variance = jumps.log_variance
+            if self.earnings_day is not None and 1 <= self.earnings_day <= days:
+                variance += earnings_move(jumps) ** 2 / days
+            growth = math.exp(jumps.log_mean + variance / 2)
+            return growth - 1, growth * math.sqrt(math.expm1(variance))
+        return self.estimate_parameters()
+    
+    @timed()
+    def run_analytic(self, days: int, current_price: float, horizons: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Closed-form summary statistics of the simulation, without simulating.
+        
+        log(1 + r) is matched to a normal with the mean and variance of the
+        lognormal having the same first two moments as 1 + r, so the log return
+        over n days has mean n * m and variance n * s^2. Quantiles add the
+        Cornish-Fisher term for the skew of log(1 + r) (about -3 * volatility),
+        which matters for short horizons. The mean price is exact; medians,
+        percentiles and the bull probability agree with run_simulation within
+        its sampling error.
+        
+        With model='garch' or 'jump', the drift and volatility are those of
+        return_parameters() for each horizon, which match the simulated mean
+        and variance but not the fatter tails.
+        
+        Args:
+            days: Number of days to simulate
+            current_price: Starting price
+            horizons: Further horizons (days) to report statistics for
+            
+        Returns:
+            Dictionary with the run_simulation statistics ('simulations' and
+            'final_prices' are None)
+        """
+        drift, volatility = self.return_parameters()
+        return {
+            'simulations': None,
+            'final_prices': None,
+            **self._closed_form(days, current_price),
+            'drift': drift,
+            'volatility': volatility,
+            'current_price': current_price,
+            'days': days,
+            'horizons': {h: self._closed_form(h, current_price) for h in self._horizons(days, horizons)}
+        }
+    
+    def _closed_form(self, days: int, current_price: float) -> Dict[str, float]:
+        """Closed-form price statistics at one horizon (see run_analytic)."""
+        drift, volatility = self.return_parameters(days)
+        growth = 1 + drift
+        s2 = math.log1p((volatility / growth) ** 2)
+        center = days * (math.log(growth) - s2 / 2)
+        spread = math.sqrt(days * s2)
+        skew = -3 * volatility / growth / math.sqrt(days)
+        normal = NormalDist()
+        
+        def percentile(q: float) -> float:
+            z = normal.inv_cdf(q / 100)
+            return current_price * math.exp(center + spread * (z + (z * z - 1) * skew / 6))
+        
+        if spread > 0:
+            # z at which the log return is 0, inverting the Cornish-Fisher expansion to first order
+            k = -center / spread
+            bull_prob = (1 - normal.cdf(k - (k * k - 1) * skew / 6)) * 100
+        else:
+            bull_prob = 100.0 if center > 0 else 0.0
+        
+        statistics = {key: percentile(q) for key, q in HORIZON_PERCENTILES.items()}
+        statistics.update({
+            'mean_price': current_price * growth ** days,
+            'bull_probability': bull_prob,
+            'bear_probability': 100 - bull_prob,
+        })
+        return statistics
+    
     def _calculate_probabilities(self, final_prices: np.ndarray, current_price: float) -> Tuple[float, float]:
         """
         Calculate bull and bear probabilities.
@@ -105,6 +719,7 @@ class MonteCarloSimulator:
         
         return bull_prob, bear_prob
     
+    @timed()
     def get_scenarios(self, simulation_results: Dict) -> Dict:
         """
         Generate bull and bear scenario descriptions.
@@ -2,25 +2,53 @@
 News & Sentiment Analysis Module
 Fetches news from yfinance and analyzes sentiment using VADER
 """
-import yfinance as yf
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import functools
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from providers import DataProvider, get_provider
+from profiling import timed
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentiment_analyzer():
+    """
+    Shared VADER analyzer.
+    
+    vaderSentiment is imported and its lexicon parsed on first use only,
+    then the instance is reused for the rest of the process.
+    
+    Returns:
+        SentimentIntensityAnalyzer
+    """
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
 
 class NewsSentimentAnalyzer:
     """Fetch and analyze news sentiment for stocks."""
     
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, provider: Optional[DataProvider] = None, analyzer=None):
         """
         Initialize analyzer.
         
         Args:
             ticker: Stock ticker symbol
+            provider: Data provider (defaults to the process-wide provider)
+            analyzer: VADER analyzer (defaults to the shared instance, loaded on first use)
         """
         self.ticker = ticker
-        self.analyzer = SentimentIntensityAnalyzer()
+        self.provider = provider or get_provider()
+        self._analyzer = analyzer
+    
+    @property
+    def analyzer(self):
+        """VADER analyzer used for scoring."""
+        if self._analyzer is None:
+            self._analyzer = get_sentiment_analyzer()
+        return self._analyzer
     
+    @timed()
     def fetch_news(self, limit: int = 10) -> List[Dict]:
         """
         Fetch recent news articles.
@@ -32,8 +60,7 @@ class NewsSentimentAnalyzer:
             List of news articles with metadata
         """
         try:
-            stock = yf.Ticker(self.ticker)
-            news = stock.news
+            news = self.provider.news(self.ticker)
             
             if not news:
                 return []
@@ -70,20 +97,20 @@ class NewsSentimentAnalyzer:
                         from dateutil import parser
                         pub_date = parser.parse(content['pubDate'])
                         pub_date_str = pub_date.strftime('%Y-%m-%d %H:%M')
-                    except:
+                    except (ValueError, OverflowError):
                         pub_date_str = content['pubDate'][:16].replace('T', ' ')
                 elif 'displayTime' in content:
                     try:
                         from dateutil import parser
                         pub_date = parser.parse(content['displayTime'])
                         pub_date_str = pub_date.strftime('%Y-%m-%d %H:%M')
-                    except:
+                    except (ValueError, OverflowError):
                         pub_date_str = content['displayTime'][:16].replace('T', ' ')
                 elif 'providerPublishTime' in article:
                     try:
                         pub_date = datetime.fromtimestamp(article['providerPublishTime'])
                         pub_date_str = pub_date.strftime('%Y-%m-%d %H:%M')
-                    except:
+                    except (TypeError, ValueError, OverflowError, OSError):
                         pass
                 
                 # Get thumbnail
@@ -113,6 +140,7 @@ class NewsSentimentAnalyzer:
             traceback.print_exc()
             return []
     
+    @timed()
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment of text using VADER.
@@ -146,6 +174,7 @@ class NewsSentimentAnalyzer:
             'emoji': emoji
         }
     
+    @timed()
     def get_news_with_sentiment(self, limit: int = 10) -> Dict:
         """
         Fetch news and analyze sentiment for each article.
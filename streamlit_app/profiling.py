@@ -0,0 +1,258 @@
+"""
+Lightweight stage timing.
+
+Wrap a stage in `with span('name'):` or decorate a function with @timed().
+When profiling is enabled, each span is added to per-stage metrics
+(count, total time, latency histogram) and to the current trace, which
+gives a per-request waterfall. When disabled, span() returns a shared
+no-op object and @timed functions make two flag checks, so instrumentation
+can stay in hot paths.
+
+Enable process-wide with enable(), or by setting STOCK_ANALYZER_PROFILE=1.
+trace(name, enable=True) profiles a single request (its context and threads
+started from copies of it) without touching the process-wide flag.
+
+Example:
+    with trace('analysis') as t:
+        with span('fetch'):
+            ...
+    t.waterfall()        # [{'name': 'fetch', 'start_ms': 0.0, 'duration_ms': 12.3, 'depth': 0}, ...]
+    prometheus_text()    # stock_analyzer_stage_seconds_bucket{stage="fetch",le="0.025"} 1 ...
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_enabled = os.environ.get('STOCK_ANALYZER_PROFILE', '') not in ('', '0')
+# Profiling switched on for the current context only (see trace)
+_context_enabled: ContextVar[bool] = ContextVar('profiling_enabled', default=False)
+
+# Histogram bucket upper bounds (seconds)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = 'stock_analyzer_stage_seconds'
+
+
+def enable():
+    """Turn profiling on."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Turn profiling off."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """True if profiling is on, process-wide or in the current context."""
+    return _enabled or _context_enabled.get()
+
+
+class StageMetrics:
+    """Thread-safe per-stage counters and latency histograms."""
+
+    def __init__(self):
+        self._stages: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        """Record one timing."""
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    entry[3][i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Copy of all stage metrics.
+
+        Returns:
+            Dictionary of stage -> count, total_ms, mean_ms, max_ms, buckets
+            (non-cumulative counts per BUCKETS bound)
+        """
+        with self._lock:
+            stages = {name: (e[0], e[1], e[2], list(e[3])) for name, e in self._stages.items()}
+        return {
+            name: {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total * 1000 / count, 3),
+                'max_ms': round(peak * 1000, 3),
+                'buckets': buckets,
+            }
+            for name, (count, total, peak, buckets) in sorted(stages.items())
+        }
+
+    def reset(self):
+        """Drop all metrics."""
+        with self._lock:
+            self._stages.clear()
+
+
+metrics = StageMetrics()
+
+
+class Trace:
+    """Spans recorded during one request."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+
+    @property
+    def total_ms(self) -> float:
+        """Trace duration so far (ms)."""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def waterfall(self) -> List[Dict[str, Any]]:
+        """
+        Spans ordered by start time.
+
+        Returns:
+            List of name, start_ms (from trace start), duration_ms, depth, thread
+        """
+        return sorted(self.spans, key=lambda s: s['start_ms'])
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('profiling_trace', default=None)
+_depth: ContextVar[int] = ContextVar('profiling_depth', default=0)
+
+
+class _Span:
+    __slots__ = ('name', 'start', 'token')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.token = _depth.set(_depth.get() + 1)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _depth.reset(self.token)
+        metrics.observe(self.name, end - self.start)
+        current = _current_trace.get()
+        if current is not None:
+            current.spans.append({
+                'name': self.name,
+                'start_ms': round((self.start - current.started) * 1000, 3),
+                'duration_ms': round((end - self.start) * 1000, 3),
+                'depth': _depth.get(),
+                'thread': threading.current_thread().name,
+            })
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """
+    Time a block of code.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Context manager (a shared no-op when profiling is disabled)
+    """
+    if not (_enabled or _context_enabled.get()):
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing every call of a function as a span.
+
+    Args:
+        name: Stage name (defaults to the function's qualified name)
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (_enabled or _context_enabled.get()):
+                return func(*args, **kwargs)
+            with _Span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace(name: str, enable: bool = False) -> Iterator[Optional[Trace]]:
+    """
+    Collect the spans of one request.
+
+    Args:
+        name: Trace name
+        enable: Profile this request even when profiling is disabled
+            process-wide (only in the current context)
+
+    Yields:
+        Trace (None when profiling is disabled and enable is False)
+    """
+    if not (_enabled or enable):
+        yield None
+        return
+    current = Trace(name)
+    token = _current_trace.set(current)
+    scope = _context_enabled.set(True) if enable else None
+    try:
+        yield current
+    finally:
+        current.finished = time.perf_counter()
+        if scope is not None:
+            _context_enabled.reset(scope)
+        _current_trace.reset(token)
+
+
+def metrics_json() -> Dict[str, Any]:
+    """Stage metrics as a JSON-safe dictionary."""
+    return {'enabled': _enabled, 'bucket_bounds_s': list(BUCKETS), 'stages': metrics.snapshot()}
+
+
+def prometheus_text() -> str:
+    """Stage metrics in the Prometheus text exposition format."""
+    lines = [f"# HELP {METRIC_NAME} Time spent in each analysis stage.",
+             f"# TYPE {METRIC_NAME} histogram"]
+    for stage, data in metrics.snapshot().items():
+        label = stage.replace('\\', '\\\\').replace('"', '\\"')
+        cumulative = 0
+        for bound, count in zip(BUCKETS, data['buckets']):
+            cumulative += count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="+Inf"}} {data["count"]}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {data["total_ms"] / 1000:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {data["count"]}')
+    return '\n'.join(lines) + '\n'
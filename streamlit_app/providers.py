@@ -0,0 +1,468 @@
+"""
+Market data providers.
+
+All market data (price history, info, news, SEC filings, statements) goes
+through a DataProvider, so the app can run against live yfinance, record
+yfinance responses to disk, or replay recordings without any network.
+
+Select the process-wide provider with set_provider(), or with environment
+variables:
+    STOCK_ANALYZER_PROVIDER    'live' (default), 'record' or 'replay'
+    STOCK_ANALYZER_RECORDINGS  Recording directory (default: <cache>/recordings)
+
+Recording layout (one directory per ticker):
+    history_<interval>_<range>.values.npy   float64 OHLCV matrix (memory-mapped on replay)
+    history_<interval>_<range>.index.npy    int64 timestamps (ns)
+    history_<interval>_<range>.json         column names and timezone
+    info.json, news.json, sec_filings.json
+    <statement attribute>.parquet, insider_purchases.parquet
+"""
+import functools
+import glob
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fundamentals_store import DEFAULT_CACHE_DIR
+from profiling import timed
+
+
+DEFAULT_RECORDINGS_DIR = os.environ.get(
+    'STOCK_ANALYZER_RECORDINGS', os.path.join(DEFAULT_CACHE_DIR, 'recordings')
+)
+
+
+class MissingRecording(LookupError):
+    """Raised by ReplayProvider when a response was never recorded."""
+
+
+class DataProvider(ABC):
+    """Interface for market data sources (subclasses implement every method)."""
+
+    @abstractmethod
+    def history(self, ticker: str, period: Optional[str] = None, interval: str = '1d',
+                start: Optional[Any] = None, end: Optional[Any] = None) -> pd.DataFrame:
+        """OHLCV history, as yfinance Ticker.history()."""
+
+    @abstractmethod
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Quote and company info, as yfinance Ticker.info."""
+
+    @abstractmethod
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        """Raw news items, as yfinance Ticker.news."""
+
+    @abstractmethod
+    def sec_filings(self, ticker: str) -> List[Dict[str, Any]]:
+        """SEC filings, as yfinance Ticker.sec_filings."""
+
+    @abstractmethod
+    def insider_purchases(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Insider purchase summary, as yfinance Ticker.insider_purchases."""
+
+    @abstractmethod
+    def statement(self, ticker: str, attribute: str) -> Optional[pd.DataFrame]:
+        """
+        Financial statement by yfinance Ticker attribute name.
+
+        Args:
+            ticker: Stock ticker symbol
+            attribute: e.g. 'quarterly_income_stmt', 'balance_sheet'
+        """
+
+
+@functools.lru_cache(maxsize=None)
+def _yfinance():
+    """yfinance module, imported on first live request."""
+    import yfinance
+    return yfinance
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_session():
+    """
+    HTTP session shared by all live yfinance requests in this process.
+
+    Returns:
+        Pooled, rate-limited, retrying ResilientSession
+    """
+    from http_session import ResilientSession
+    return ResilientSession()
+
+
+def http_session_stats() -> Optional[Dict[str, Any]]:
+    """Counters of the shared HTTP session, or None if no live request was made yet."""
+    if get_http_session.cache_info().currsize == 0:
+        return None
+    return get_http_session().stats()
+
+
+class YFinanceProvider(DataProvider):
+    """Live data from yfinance."""
+
+    def __init__(self, session=None):
+        """
+        Initialize provider.
+
+        Args:
+            session: HTTP session for yfinance (defaults to the shared session)
+        """
+        self._session = session
+
+    @property
+    def session(self):
+        """HTTP session used for requests, created on first use."""
+        if self._session is None:
+            self._session = get_http_session()
+        return self._session
+
+    def _ticker(self, ticker: str):
+        return _yfinance().Ticker(ticker, session=self.session)
+
+    @timed('yfinance.history')
+    def history(self, ticker, period=None, interval='1d', start=None, end=None):
+        kwargs = {'interval': interval}
+        if start is not None or end is not None:
+            kwargs.update(start=start, end=end)
+        else:
+            kwargs['period'] = period or '1mo'
+        return self._ticker(ticker).history(**kwargs)
+
+    @timed('yfinance.info')
+    def info(self, ticker):
+        return self._ticker(ticker).info
+
+    @timed('yfinance.news')
+    def news(self, ticker):
+        return self._ticker(ticker).news
+
+    @timed('yfinance.sec_filings')
+    def sec_filings(self, ticker):
+        return self._ticker(ticker).sec_filings
+
+    @timed('yfinance.insider_purchases')
+    def insider_purchases(self, ticker):
+        return self._ticker(ticker).insider_purchases
+
+    @timed('yfinance.statement')
+    def statement(self, ticker, attribute):
+        return getattr(self._ticker(ticker), attribute)
+
+
+def _history_key(period: Optional[str], interval: str, start: Any, end: Any) -> str:
+    if start is not None or end is not None:
+        span = f"{pd.Timestamp(start).date() if start is not None else ''}" \
+               f"_{pd.Timestamp(end).date() if end is not None else ''}"
+    else:
+        span = period or '1mo'
+    return f"history_{interval}_{span}"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class RecordingProvider(DataProvider):
+    """Pass-through provider that records every response to disk."""
+
+    def __init__(self, directory: str = DEFAULT_RECORDINGS_DIR, inner: Optional[DataProvider] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            directory: Recording directory
+            inner: Provider to record (live yfinance if not given)
+        """
+        self.directory = directory
+        self.inner = inner or YFinanceProvider()
+
+    def _dir(self, ticker: str) -> str:
+        path = os.path.join(self.directory, ticker.upper())
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _write_json(self, ticker: str, name: str, value: Any):
+        path = os.path.join(self._dir(ticker), f"{name}.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump(value, f, default=_json_default)
+        os.replace(path + '.tmp', path)
+
+    def _write_frame(self, ticker: str, name: str, frame: Optional[pd.DataFrame]):
+        if frame is None:
+            self._write_json(ticker, name + '.parquet', {'missing': True})
+            return
+        path = os.path.join(self._dir(ticker), f"{name}.parquet")
+        table = frame.copy()
+        datetime_columns = isinstance(table.columns, pd.DatetimeIndex)
+        table.columns = [str(c) for c in table.columns]
+        index_name = table.index.name or '__index__'
+        table = table.rename_axis(index_name).reset_index()
+        table.attrs = {}
+        table.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+        self._write_json(ticker, name + '.parquet', {'index': index_name, 'datetime_columns': datetime_columns})
+
+    def history(self, ticker, period=None, interval='1d', start=None, end=None):
+        frame = self.inner.history(ticker, period, interval, start, end)
+        if frame is None or frame.empty:
+            return frame
+
+        key = _history_key(period, interval, start, end)
+        base = os.path.join(self._dir(ticker), key)
+        index = frame.index
+        tz = str(index.tz) if getattr(index, 'tz', None) is not None else None
+        nanos = (index.tz_convert('UTC').tz_localize(None) if tz else index).as_unit('ns').asi8
+        np.save(base + '.values.npy', frame.to_numpy(dtype=np.float64))
+        np.save(base + '.index.npy', nanos)
+        with open(base + '.json', 'w') as f:
+            json.dump({'columns': [str(c) for c in frame.columns], 'tz': tz, 'index': index.name}, f)
+        return frame
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        self._write_json(ticker, 'info', info)
+        return info
+
+    def news(self, ticker):
+        news = self.inner.news(ticker)
+        self._write_json(ticker, 'news', news or [])
+        return news
+
+    def sec_filings(self, ticker):
+        filings = self.inner.sec_filings(ticker)
+        self._write_json(ticker, 'sec_filings', filings or [])
+        return filings
+
+    def insider_purchases(self, ticker):
+        frame = self.inner.insider_purchases(ticker)
+        self._write_frame(ticker, 'insider_purchases', frame)
+        return frame
+
+    def statement(self, ticker, attribute):
+        frame = self.inner.statement(ticker, attribute)
+        self._write_frame(ticker, attribute, frame)
+        return frame
+
+
+class ReplayProvider(DataProvider):
+    """
+    Serve recorded responses without network access.
+
+    Price histories are memory-mapped and built into DataFrames once per
+    recording; later calls return cheap shallow copies. A history request
+    without an exact recording is served by slicing the longest recording
+    with the same interval.
+    """
+
+    def __init__(self, directory: str = DEFAULT_RECORDINGS_DIR):
+        """
+        Initialize replay.
+
+        Args:
+            directory: Recording directory (written by RecordingProvider)
+        """
+        self.directory = directory
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._objects: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str, name: str) -> str:
+        return os.path.join(self.directory, ticker.upper(), name)
+
+    def _load_history(self, base: str) -> pd.DataFrame:
+        with self._lock:
+            frame = self._frames.get(base)
+        if frame is None:
+            with open(base + '.json') as f:
+                meta = json.load(f)
+            values = np.load(base + '.values.npy', mmap_mode='r')
+            index = pd.DatetimeIndex(np.load(base + '.index.npy', mmap_mode='r').view('datetime64[ns]'),
+                                     name=meta.get('index'))
+            if meta['tz']:
+                index = index.tz_localize('UTC').tz_convert(meta['tz'])
+            frame = pd.DataFrame(values, index=index, columns=meta['columns'], copy=False)
+            with self._lock:
+                self._frames[base] = frame
+        return frame.copy(deep=False)
+
+    def history(self, ticker, period=None, interval='1d', start=None, end=None):
+        base = self._path(ticker, _history_key(period, interval, start, end))
+        if os.path.exists(base + '.values.npy'):
+            return self._load_history(base)
+
+        # Fall back to the longest recording with the same interval
+        candidates = glob.glob(self._path(ticker, f"history_{interval}_*.values.npy"))
+        if not candidates:
+            raise MissingRecording(f"No {interval} history recorded for {ticker.upper()}")
+        longest = max(candidates, key=lambda p: np.load(p, mmap_mode='r').shape[0])
+        frame = self._load_history(longest[:-len('.values.npy')])
+        return slice_history(frame, period, start, end)
+
+    def _load_json(self, ticker: str, name: str) -> Any:
+        path = self._path(ticker, f"{name}.json")
+        with self._lock:
+            if path in self._objects:
+                return self._objects[path]
+        if not os.path.exists(path):
+            raise MissingRecording(f"No {name} recorded for {ticker.upper()}")
+        with open(path) as f:
+            value = json.load(f)
+        with self._lock:
+            self._objects[path] = value
+        return value
+
+    def _load_frame(self, ticker: str, name: str) -> Optional[pd.DataFrame]:
+        path = self._path(ticker, f"{name}.parquet")
+        with self._lock:
+            if path in self._objects:
+                return self._objects[path]
+        meta = self._load_json(ticker, name + '.parquet')
+        if meta.get('missing'):
+            return None
+        frame = pd.read_parquet(path).set_index(meta['index'])
+        if meta['index'] == '__index__':
+            frame.index.name = None
+        if meta['datetime_columns']:
+            frame.columns = pd.to_datetime(frame.columns)
+        with self._lock:
+            self._objects[path] = frame
+        return frame
+
+    def info(self, ticker):
+        return dict(self._load_json(ticker, 'info'))
+
+    def news(self, ticker):
+        return self._load_json(ticker, 'news')
+
+    def sec_filings(self, ticker):
+        filings = [dict(f) for f in self._load_json(ticker, 'sec_filings')]
+        for filing in filings:
+            if isinstance(filing.get('date'), str):
+                filing['date'] = date.fromisoformat(filing['date'][:10])
+        return filings
+
+    def insider_purchases(self, ticker):
+        return self._load_frame(ticker, 'insider_purchases')
+
+    def statement(self, ticker, attribute):
+        return self._load_frame(ticker, attribute)
+
+
+def slice_history(frame: pd.DataFrame, period: Optional[str] = None,
+                  start: Optional[Any] = None, end: Optional[Any] = None) -> pd.DataFrame:
+    """
+    Cut a history down to a yfinance period ('60d', '6mo', '2y', 'ytd', 'max') or date range.
+
+    Args:
+        frame: OHLCV history
+        period: yfinance period string
+        start: Range start (inclusive)
+        end: Range end (exclusive, as in yfinance)
+
+    Returns:
+        Sliced DataFrame
+    """
+    if frame.empty:
+        return frame
+
+    index = frame.index
+    if start is not None or end is not None:
+        mask = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            mask &= index >= _localize(start, index)
+        if end is not None:
+            mask &= index < _localize(end, index)
+        return frame[mask]
+
+    period = period or '1mo'
+    last = index[-1]
+    if period == 'max':
+        return frame
+    if period == 'ytd':
+        cutoff = last.normalize().replace(month=1, day=1)
+    elif period.endswith('mo'):
+        cutoff = last - pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith('d'):
+        cutoff = last - pd.DateOffset(days=int(period[:-1]))
+    elif period.endswith('wk'):
+        cutoff = last - pd.DateOffset(weeks=int(period[:-2]))
+    elif period.endswith('y'):
+        cutoff = last - pd.DateOffset(years=int(period[:-1]))
+    else:
+        raise ValueError(f"Unsupported period: {period}")
+    return frame[index > cutoff]
+
+
+def _localize(value: Any, index: pd.DatetimeIndex) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    if index.tz is not None and stamp.tz is None:
+        return stamp.tz_localize(index.tz)
+    if index.tz is None and stamp.tz is not None:
+        return stamp.tz_localize(None)
+    return stamp
+
+
+_provider: Optional[DataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def make_provider(mode: str = 'live', directory: str = DEFAULT_RECORDINGS_DIR) -> DataProvider:
+    """
+    Build a provider by name.
+
+    Args:
+        mode: 'live', 'record' or 'replay'
+        directory: Recording directory (record/replay)
+
+    Returns:
+        DataProvider
+    """
+    if mode == 'live':
+        return YFinanceProvider()
+    if mode == 'record':
+        return RecordingProvider(directory)
+    if mode == 'replay':
+        return ReplayProvider(directory)
+    raise ValueError(f"Unknown provider mode: {mode}")
+
+
+def configure_provider(mode: str, directory: str = DEFAULT_RECORDINGS_DIR):
+    """
+    Select the provider for this process and any worker processes it starts.
+
+    Args:
+        mode: 'live', 'record' or 'replay'
+        directory: Recording directory (record/replay)
+    """
+    global DEFAULT_RECORDINGS_DIR
+    os.environ['STOCK_ANALYZER_PROVIDER'] = mode
+    os.environ['STOCK_ANALYZER_RECORDINGS'] = directory
+    DEFAULT_RECORDINGS_DIR = directory
+    set_provider(make_provider(mode, directory))
+
+
+def get_provider() -> DataProvider:
+    """Process-wide provider (configured from the environment on first use)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = make_provider(os.environ.get('STOCK_ANALYZER_PROVIDER', 'live'),
+                                      DEFAULT_RECORDINGS_DIR)
+        return _provider
+
+
+def set_provider(provider: Optional[DataProvider]):
+    """Replace the process-wide provider (None re-reads the environment on next use)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
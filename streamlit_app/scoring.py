@@ -1,7 +1,11 @@
 """
 Scoring system for stock analysis based on technical indicators.
 """
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional
+
+from factors import FactorCache, evaluate_factors
+from profiling import timed
+from providers import DataProvider
 
 
 class ScoringSystem:
@@ -34,25 +38,42 @@ class ScoringSystem:
         }
     }
     
-    def __init__(self, timeframe: str, risk_tolerance: str):
+    # Weights scored directly from indicators or stock info; everything else
+    # is computed by a factor provider (see factors.py)
+    BUILTIN_FACTORS = ('rsi', 'macd', 'bollinger', 'sma', 'volume', 'fundamentals')
+    
+    def __init__(self, timeframe: str, risk_tolerance: str, factor_cache: Optional[FactorCache] = None,
+                 provider: Optional[DataProvider] = None):
         """
         Initialize scoring system.
         
         Args:
             timeframe: 'short', 'medium', or 'long'
             risk_tolerance: 'conservative', 'moderate', or 'aggressive'
+            factor_cache: Cache for provider factors (defaults to shared cache)
+            provider: Data provider for provider factors (defaults to the process-wide provider)
         """
         self.timeframe = timeframe
         self.risk_tolerance = risk_tolerance
         self.weights = self.WEIGHTS.get(timeframe, self.WEIGHTS['short'])
+        self.factor_cache = factor_cache
+        self.provider = provider
         
-    def calculate_score(self, indicators: Dict[str, Any], stock_info: Dict[str, Any] = None) -> Dict[str, Any]:
+    @timed()
+    def calculate_score(self, indicators: Dict[str, Any], stock_info: Dict[str, Any] = None,
+                        ticker: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate overall score based on indicators.
         
+        Provider factors (sentiment, SEC filings) are only evaluated when
+        their weight is non-zero for the timeframe and a ticker is known.
+        Factors without data are left out of both the total and max score,
+        and the final score is normalized to 0-100.
+        
         Args:
             indicators: Dictionary of calculated indicators
             stock_info: Stock information for fundamentals (optional)
+            ticker: Ticker for provider factors (defaults to stock_info['ticker'])
             
         Returns:
             Dictionary with score, signal, and breakdown
@@ -109,8 +130,25 @@ class ScoringSystem:
             total_score += scores['fundamentals']['weighted']
             max_score += weight
         
+        # Provider factors (sentiment, SEC filings, ...)
+        if ticker is None and stock_info:
+            ticker = stock_info.get('ticker')
+        factor_names = [name for name, weight in self.weights.items()
+                        if weight > 0 and name not in self.BUILTIN_FACTORS]
+        if ticker and factor_names:
+            factor_scores = evaluate_factors(ticker, factor_names, stock_info or {},
+                                             cache=self.factor_cache, provider=self.provider)
+            for name in factor_names:
+                factor_score = factor_scores.get(name)
+                if factor_score is None:
+                    continue
+                weight = self.weights[name]
+                scores[name] = {'score': factor_score, 'max': weight, 'weighted': (factor_score / 100) * weight}
+                total_score += scores[name]['weighted']
+                max_score += weight
+        
         # Calculate final score (0-100)
-        final_score = int(total_score) if max_score > 0 else 0
+        final_score = int(total_score * 100 / max_score) if max_score > 0 else 0
         
         # Determine signal
         signal, confidence = self._determine_signal(final_score, scores)
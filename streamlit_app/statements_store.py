@@ -0,0 +1,308 @@
+"""
+Historical Financial Statements Store
+Ingests yfinance financial statements and stores them point-in-time, so
+fundamentals can be reconstructed as they were known on any past date.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fundamentals import FundamentalAnalyzer
+from fundamentals_store import DEFAULT_CACHE_DIR
+from providers import DataProvider, get_provider
+
+
+DEFAULT_STATEMENTS_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_DIR), 'statements')
+
+# (statement, frequency) -> yfinance Ticker attribute
+STATEMENT_SOURCES = {
+    ('income', 'quarterly'): 'quarterly_income_stmt',
+    ('income', 'annual'): 'income_stmt',
+    ('balance', 'quarterly'): 'quarterly_balance_sheet',
+    ('balance', 'annual'): 'balance_sheet',
+    ('cashflow', 'quarterly'): 'quarterly_cashflow',
+    ('cashflow', 'annual'): 'cashflow',
+}
+
+# Filing deadlines (10-Q / 10-K) used when the filing date is unknown
+REPORTING_LAG = {
+    'quarterly': timedelta(days=45),
+    'annual': timedelta(days=90),
+}
+
+COLUMNS = ['known_date', 'period_end', 'statement', 'frequency', 'item', 'value']
+
+
+class StatementStore:
+    """Compact columnar (Parquet) point-in-time statement files, one per ticker."""
+
+    def __init__(self, directory: str = DEFAULT_STATEMENTS_DIR):
+        """
+        Initialize statement store.
+
+        Args:
+            directory: Directory holding one Parquet file per ticker
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker.upper()}.parquet")
+
+    def ingest(self, ticker: str, provider: Optional[DataProvider] = None,
+               ingested_at: Optional[datetime] = None) -> int:
+        """
+        Pull quarterly and annual statements and merge them into the store.
+
+        New periods are stamped as known at period end plus the filing
+        deadline (or at ingestion time, if earlier). Values that changed
+        since the last ingestion (restatements) are stamped with the
+        ingestion time, so earlier as-of lookups still see the original.
+
+        Args:
+            ticker: Stock ticker symbol
+            provider: Data provider (defaults to the process-wide provider)
+            ingested_at: Ingestion timestamp (defaults to now)
+
+        Returns:
+            Number of rows added
+        """
+        ticker = ticker.upper()
+        provider = provider or get_provider()
+        ingested_at = pd.Timestamp(ingested_at or datetime.now()).normalize()
+
+        frames = []
+        for (statement, frequency), attr in STATEMENT_SOURCES.items():
+            try:
+                raw = provider.statement(ticker, attr)
+            except Exception as e:
+                print(f"Error fetching {frequency} {statement} statement for {ticker}: {e}")
+                continue
+            if raw is None or raw.empty:
+                continue
+
+            long = raw.stack().rename('value').rename_axis(['item', 'period_end']).reset_index()
+            long = long.dropna(subset=['value'])
+            long['period_end'] = pd.to_datetime(long['period_end']).dt.tz_localize(None).dt.normalize()
+            long['statement'] = statement
+            long['frequency'] = frequency
+            long['known_date'] = np.minimum(long['period_end'] + REPORTING_LAG[frequency], ingested_at)
+            frames.append(long)
+
+        if not frames:
+            return 0
+
+        new = pd.concat(frames, ignore_index=True)
+        new['value'] = new['value'].astype(float)
+        existing = self._read(ticker)
+
+        if existing is not None and not existing.empty:
+            # Keep only rows whose latest stored value differs (or is absent)
+            key = ['statement', 'frequency', 'item', 'period_end']
+            latest = existing.sort_values('known_date').groupby(key, observed=True).tail(1)
+            merged = new.merge(latest[key + ['value']], on=key, how='left', suffixes=('', '_stored'))
+            changed = merged['value_stored'].notna() & ~np.isclose(merged['value'], merged['value_stored'])
+            added = merged[merged['value_stored'].isna() | changed].copy()
+            added.loc[changed[added.index], 'known_date'] = ingested_at
+            added = added[COLUMNS]
+            combined = pd.concat([existing, added], ignore_index=True)
+        else:
+            added = new[COLUMNS]
+            combined = added
+
+        self._write(ticker, combined)
+        return len(added)
+
+    def _read(self, ticker: str) -> Optional[pd.DataFrame]:
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        frame = pd.read_parquet(path)
+        for col in ('statement', 'frequency', 'item'):
+            frame[col] = frame[col].astype(str)
+        return frame
+
+    def _write(self, ticker: str, frame: pd.DataFrame):
+        frame = frame.sort_values(['known_date', 'statement', 'frequency', 'item', 'period_end'])
+        frame = frame.reset_index(drop=True).astype({
+            'statement': 'category', 'frequency': 'category', 'item': 'category', 'value': 'float64',
+        })
+        tmp_path = self._path(ticker) + '.tmp'
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self._path(ticker))
+
+    def load(self, ticker: str) -> Optional['StatementHistory']:
+        """Load a ticker's point-in-time history (no network)."""
+        frame = self._read(ticker)
+        if frame is None:
+            return None
+        return StatementHistory(ticker, frame)
+
+    def tickers(self) -> List[str]:
+        """List all tickers with stored statements."""
+        return sorted(name[:-8] for name in os.listdir(self.directory) if name.endswith('.parquet'))
+
+
+class StatementHistory:
+    """Point-in-time view over one ticker's stored statements."""
+
+    def __init__(self, ticker: str, frame: pd.DataFrame):
+        """
+        Initialize with stored rows.
+
+        Args:
+            ticker: Stock ticker symbol
+            frame: Rows with COLUMNS
+        """
+        self.ticker = ticker.upper()
+        self.frame = frame.sort_values('known_date', kind='stable').reset_index(drop=True)
+        self._known = self.frame['known_date'].to_numpy(dtype='datetime64[ns]')
+
+    def as_of(self, date: Any) -> pd.DataFrame:
+        """
+        Statement rows as known on a date.
+
+        Uses binary search on the sorted known_date index, then keeps the
+        latest known value of each item and period.
+
+        Args:
+            date: As-of date
+
+        Returns:
+            Long DataFrame with statement, frequency, item, period_end, value
+        """
+        cutoff = np.datetime64(pd.Timestamp(date).normalize(), 'ns')
+        visible = self.frame.iloc[:np.searchsorted(self._known, cutoff, side='right')]
+        key = ['statement', 'frequency', 'item', 'period_end']
+        return visible.groupby(key, observed=True, sort=False).tail(1)[key + ['value']]
+
+    def statement_as_of(self, date: Any, statement: str, frequency: str) -> pd.DataFrame:
+        """
+        One statement as known on a date, in yfinance layout.
+
+        Returns:
+            DataFrame with items as rows and period ends as columns (newest first)
+        """
+        rows = self.as_of(date)
+        rows = rows[(rows['statement'] == statement) & (rows['frequency'] == frequency)]
+        if rows.empty:
+            return pd.DataFrame()
+        wide = rows.pivot(index='item', columns='period_end', values='value')
+        return wide[sorted(wide.columns, reverse=True)]
+
+    def fundamentals_as_of(self, date: Any, price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Rebuild the fetch_fundamentals() metrics that statements can provide.
+
+        Flows use the trailing four quarters when available, falling back
+        to the latest annual statement. Valuation ratios need a price.
+
+        Args:
+            date: As-of date
+            price: Share price on that date (for P/E)
+
+        Returns:
+            Dictionary in FundamentalAnalyzer.fetch_fundamentals() layout
+        """
+        income_q = self.statement_as_of(date, 'income', 'quarterly')
+        income_a = self.statement_as_of(date, 'income', 'annual')
+        balance_q = self.statement_as_of(date, 'balance', 'quarterly')
+        balance_a = self.statement_as_of(date, 'balance', 'annual')
+        cash_q = self.statement_as_of(date, 'cashflow', 'quarterly')
+        cash_a = self.statement_as_of(date, 'cashflow', 'annual')
+
+        def ttm(quarterly, annual, item):
+            if item in quarterly.index:
+                values = quarterly.loc[item].dropna()
+                if len(values) >= 4:
+                    return float(values.iloc[:4].sum())
+            if item in annual.index:
+                values = annual.loc[item].dropna()
+                if len(values):
+                    return float(values.iloc[0])
+            return None
+
+        def latest(quarterly, annual, item):
+            for statement in (quarterly, annual):
+                if item in statement.index:
+                    values = statement.loc[item].dropna()
+                    if len(values):
+                        return float(values.iloc[0])
+            return None
+
+        def yoy(item):
+            # Latest quarter vs. the same quarter a year earlier, else annual
+            for statement, lag in ((income_q, 4), (income_a, 1)):
+                if item in statement.index:
+                    values = statement.loc[item].dropna()
+                    if len(values) > lag and values.iloc[lag] != 0:
+                        return float(values.iloc[0] / abs(values.iloc[lag]) - 1)
+            return None
+
+        def ratio(a, b, scale=1.0):
+            if a is None or not b:
+                return None
+            return a / b * scale
+
+        revenue = ttm(income_q, income_a, 'Total Revenue')
+        net_income = ttm(income_q, income_a, 'Net Income')
+        operating_income = ttm(income_q, income_a, 'Operating Income')
+        eps = ttm(income_q, income_a, 'Diluted EPS')
+        equity = latest(balance_q, balance_a, 'Stockholders Equity')
+        dividends_paid = ttm(cash_q, cash_a, 'Cash Dividends Paid')
+
+        return {
+            'valuation': {
+                'pe_trailing': ratio(price, eps) if eps and eps > 0 else None,
+            },
+            'profitability': {
+                'profit_margin': ratio(net_income, revenue),
+                'operating_margin': ratio(operating_income, revenue),
+                'roe': ratio(net_income, equity),
+                'roa': ratio(net_income, latest(balance_q, balance_a, 'Total Assets')),
+            },
+            'growth': {
+                'revenue_growth': yoy('Total Revenue'),
+                'earnings_growth': yoy('Net Income'),
+                'eps': eps,
+            },
+            'financial_health': {
+                'debt_to_equity': ratio(latest(balance_q, balance_a, 'Total Debt'), equity, 100),
+                'current_ratio': ratio(latest(balance_q, balance_a, 'Current Assets'),
+                                       latest(balance_q, balance_a, 'Current Liabilities')),
+                'free_cash_flow': ttm(cash_q, cash_a, 'Free Cash Flow'),
+                'operating_cash_flow': ttm(cash_q, cash_a, 'Operating Cash Flow'),
+                'total_debt': latest(balance_q, balance_a, 'Total Debt'),
+            },
+            'dividends': {
+                'payout_ratio': ratio(-dividends_paid, net_income) if dividends_paid else None,
+            },
+            'other': {},
+        }
+
+    def health_score_history(self, dates: Iterable[Any], prices: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Health score as it would have been computed on each date.
+
+        Args:
+            dates: As-of dates
+            prices: Optional close prices (for P/E), looked up as of each date
+
+        Returns:
+            DataFrame indexed by date with calculate_health_scores columns
+        """
+        dates = pd.DatetimeIndex(pd.to_datetime(list(dates))).normalize()
+        fundamentals = {}
+        for date in dates:
+            price = None
+            if prices is not None and len(prices):
+                index = prices.index.tz_localize(None) if prices.index.tz is not None else prices.index
+                pos = index.searchsorted(date, side='right') - 1
+                price = float(prices.iloc[pos]) if pos >= 0 else None
+            fundamentals[date] = self.fundamentals_as_of(date, price)
+
+        frame = FundamentalAnalyzer.fundamentals_to_frame(fundamentals)
+        return FundamentalAnalyzer.calculate_health_scores(frame)
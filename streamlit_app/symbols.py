@@ -0,0 +1,247 @@
+"""
+Local symbol directory.
+
+Known tickers with name and exchange, kept as sorted lists so lookups are a
+binary search and prefix autocomplete is a range scan, with no network call.
+Misses confirmed by the data provider go into a short-TTL negative cache so
+typos and delisted symbols are not re-fetched on every rerun.
+
+The bundled data/symbols.csv is a seed of common tickers and only gives
+hints. Point STOCK_ANALYZER_SYMBOLS at a full listing (CSV, or NASDAQ Trader
+nasdaqlisted.txt / otherlisted.txt) to make the directory authoritative:
+symbols missing from it are then rejected without a request.
+
+Example:
+    directory = get_symbol_directory()
+    directory.get('aapl')          # SymbolInfo(symbol='AAPL', name='Apple Inc.', exchange='NASDAQ')
+    directory.complete('app')      # tickers starting with APP, then names starting with "app"
+"""
+import csv
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+DEFAULT_SYMBOLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'symbols.csv')
+
+# NASDAQ Trader exchange codes (otherlisted.txt)
+NASDAQ_TRADER_EXCHANGES = {'A': 'NYSE American', 'N': 'NYSE', 'P': 'NYSE Arca', 'Z': 'Cboe BZX', 'V': 'IEX'}
+
+
+class SymbolInfo(NamedTuple):
+    symbol: str
+    name: str
+    exchange: str
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Upper-case, trimmed ticker."""
+    return symbol.strip().upper()
+
+
+def _read_rows(path: str) -> Iterable[Dict[str, str]]:
+    """Rows of a symbols CSV or a pipe-delimited NASDAQ Trader listing."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        first = handle.readline()
+        handle.seek(0)
+        if '|' not in first:
+            for row in csv.DictReader(handle):
+                yield {'symbol': row['symbol'], 'name': row.get('name', ''), 'exchange': row.get('exchange', '')}
+            return
+        for row in csv.DictReader(handle, delimiter='|'):
+            symbol = row.get('Symbol') or row.get('ACT Symbol') or ''
+            if not symbol or symbol.startswith('File Creation Time') or row.get('Test Issue') == 'Y':
+                continue
+            exchange = NASDAQ_TRADER_EXCHANGES.get(row.get('Exchange', ''), 'NASDAQ') if 'Exchange' in row else 'NASDAQ'
+            # Share classes are BRK.B in the listing, BRK-B on Yahoo
+            yield {'symbol': symbol.replace('.', '-'), 'name': row.get('Security Name', ''), 'exchange': exchange}
+
+
+class SymbolDirectory:
+    """Sorted ticker directory with prefix autocomplete and a negative cache."""
+
+    def __init__(self, entries: Iterable[SymbolInfo] = (), authoritative: bool = False,
+                 miss_ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Build directory.
+
+        Args:
+            entries: Known symbols (duplicates keep the first)
+            authoritative: True if the entries are a complete listing, so
+                unknown symbols can be rejected without asking the provider
+            miss_ttl: Seconds a confirmed miss is remembered
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.authoritative = authoritative
+        self.miss_ttl = miss_ttl
+        self._clock = clock
+        self._misses: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.path: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._index = self._build(entries)
+
+    @staticmethod
+    def _build(entries: Iterable[SymbolInfo]):
+        unique: Dict[str, SymbolInfo] = {}
+        for entry in entries:
+            symbol = normalize_symbol(entry.symbol)
+            if symbol and symbol not in unique:
+                unique[symbol] = SymbolInfo(symbol, entry.name.strip(), entry.exchange.strip())
+        entries = sorted(unique.values())
+        # Parallel sorted lists: symbols for lookup, casefolded names (with
+        # positions into entries) for name search. Swapped as one tuple so
+        # readers never see a half-refreshed index.
+        symbols = [entry.symbol for entry in entries]
+        name_order = sorted(range(len(entries)), key=lambda i: entries[i].name.casefold())
+        names = [entries[i].name.casefold() for i in name_order]
+        return symbols, entries, names, name_order
+
+    @classmethod
+    def from_file(cls, path: str, authoritative: bool = False, **kwargs) -> 'SymbolDirectory':
+        """
+        Load a symbols CSV (symbol,name,exchange) or NASDAQ Trader listing.
+
+        Args:
+            path: File to read
+            authoritative: See __init__
+            **kwargs: Other __init__ options
+
+        Returns:
+            SymbolDirectory remembering the file for refresh()
+        """
+        directory = cls((SymbolInfo(**row) for row in _read_rows(path)), authoritative, **kwargs)
+        directory.path = path
+        directory._mtime = os.path.getmtime(path)
+        return directory
+
+    def refresh(self) -> bool:
+        """
+        Reload from the source file if it changed on disk.
+
+        Returns:
+            True if the directory was reloaded
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        mtime = os.path.getmtime(self.path)
+        if mtime == self._mtime:
+            return False
+        index = self._build(SymbolInfo(**row) for row in _read_rows(self.path))
+        with self._lock:
+            self._index = index
+            self._mtime = mtime
+            self._misses.clear()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._index[0])
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """Entry for a symbol (binary search), or None if unknown."""
+        symbol = normalize_symbol(symbol)
+        symbols, entries, _, _ = self._index
+        i = bisect_left(symbols, symbol)
+        if i < len(symbols) and symbols[i] == symbol:
+            return entries[i]
+        return None
+
+    def complete(self, prefix: str, limit: int = 8) -> List[SymbolInfo]:
+        """
+        Autocomplete suggestions.
+
+        Args:
+            prefix: Typed text
+            limit: Maximum suggestions
+
+        Returns:
+            Symbols starting with the prefix (in order), then symbols whose
+            name starts with it
+        """
+        if not prefix.strip():
+            return []
+        symbols, entries, names, name_order = self._index
+        symbol_prefix = normalize_symbol(prefix)
+        matches: List[SymbolInfo] = []
+        seen = set()
+        i = bisect_left(symbols, symbol_prefix)
+        while i < len(symbols) and len(matches) < limit and symbols[i].startswith(symbol_prefix):
+            matches.append(entries[i])
+            seen.add(i)
+            i += 1
+
+        name_prefix = prefix.strip().casefold()
+        j = bisect_left(names, name_prefix)
+        while j < len(names) and len(matches) < limit and names[j].startswith(name_prefix):
+            if name_order[j] not in seen:
+                matches.append(entries[name_order[j]])
+            j += 1
+        return matches
+
+    def record_miss(self, symbol: str):
+        """Remember that the provider has no data for a symbol (for miss_ttl seconds)."""
+        with self._lock:
+            self._misses[normalize_symbol(symbol)] = self._clock() + self.miss_ttl
+
+    def is_known_miss(self, symbol: str) -> bool:
+        """
+        True if the symbol should be rejected without a request: a recent
+        confirmed miss, or unknown to an authoritative directory.
+        """
+        symbol = normalize_symbol(symbol)
+        with self._lock:
+            expires = self._misses.get(symbol)
+            if expires is not None:
+                if self._clock() < expires:
+                    return True
+                del self._misses[symbol]
+        return self.authoritative and symbol not in self
+
+
+@functools.lru_cache(maxsize=None)
+def _load_symbol_directory() -> SymbolDirectory:
+    path = os.environ.get('STOCK_ANALYZER_SYMBOLS')
+    if path:
+        return SymbolDirectory.from_file(path, authoritative=True)
+    return SymbolDirectory.from_file(DEFAULT_SYMBOLS_FILE)
+
+
+def get_symbol_directory() -> SymbolDirectory:
+    """
+    Process-wide symbol directory.
+
+    Loads STOCK_ANALYZER_SYMBOLS (authoritative) if set, else the bundled seed,
+    and reloads it when the file changes on disk (which also clears the
+    negative cache, so newly listed tickers are accepted without a restart).
+    """
+    directory = _load_symbol_directory()
+    directory.refresh()
+    return directory
+
+
+def main():
+    """Build a symbols CSV from listing files (python -m symbols FILE... -o OUTPUT)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a symbols CSV from listing files')
+    parser.add_argument('files', nargs='+', help='Symbol CSVs or NASDAQ Trader nasdaqlisted.txt / otherlisted.txt')
+    parser.add_argument('-o', '--output', default=DEFAULT_SYMBOLS_FILE, help='CSV to write')
+    args = parser.parse_args()
+
+    directory = SymbolDirectory(SymbolInfo(**row) for path in args.files for row in _read_rows(path))
+    with open(args.output, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(SymbolInfo._fields)
+        writer.writerows(directory._index[1])
+    print(f"Wrote {len(directory)} symbols to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
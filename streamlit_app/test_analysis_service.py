@@ -0,0 +1,128 @@
+"""
+Test script for the analysis service layer.
+Runs offline with a fake DataFetcher serving synthetic OHLCV data.
+"""
+import json
+import sys
+
+import analysis_service
+from analysis_service import AnalysisResult, AnalysisService, build_recommendation
+from fixtures import synthetic_ohlcv
+
+
+class FakeFetcher:
+    """DataFetcher stand-in (no network)."""
+
+    def __init__(self, ticker):
+        self.ticker = ticker.upper()
+
+    def validate_ticker(self):
+        return self.ticker != 'ZZZZ'
+
+    def get_stock_info(self):
+        return {'name': 'Test Corp', 'current_price': 100.0, 'previous_close': 99.0}
+
+    def fetch_data(self, timeframe='short'):
+        return synthetic_ohlcv()
+
+
+def with_fake_fetcher(test_func):
+    """Run a test with analysis_service.DataFetcher replaced by FakeFetcher."""
+    def wrapper():
+        original = analysis_service.DataFetcher
+        analysis_service.DataFetcher = FakeFetcher
+        try:
+            return test_func()
+        finally:
+            analysis_service.DataFetcher = original
+    wrapper.__name__ = test_func.__name__
+    wrapper.__doc__ = test_func.__doc__
+    return wrapper
+
+
+@with_fake_fetcher
+def test_result_roundtrip():
+    """Results serialize to JSON and back without pandas objects."""
+    print("\nTesting AnalysisResult serialization...")
+
+    result = AnalysisService(iterations=200).analyze('test', 'short', 'moderate')
+
+    if not result.ok or result.series is not None:
+        print(f"✗ Unexpected result: error={result.error}, series={result.series is not None}")
+        return False
+
+    text = result.to_json()
+    restored = AnalysisResult.from_json(text)
+    if restored.to_dict() != json.loads(text):
+        print("✗ JSON round-trip changed the result")
+        return False
+
+    with_series = AnalysisService(iterations=200).analyze('test', 'short', 'moderate', include_series=True)
+    if with_series.series is None or 'series' in with_series.to_dict():
+        print("✗ Series not attached or leaked into serialization")
+        return False
+
+    print(f"✓ {result.ticker}: {result.signal} ({result.score}/100), {len(text)} bytes of JSON")
+    return True
+
+
+@with_fake_fetcher
+def test_errors_and_cache():
+    """Invalid tickers return an error; cached results are reused."""
+    print("\nTesting errors and cache...")
+
+    service = AnalysisService(iterations=200, cache_ttl=60)
+
+    if service.analyze('ZZZZ').ok:
+        print("✗ Invalid ticker not reported")
+        return False
+
+    first = service.analyze('TEST', 'short', 'moderate')
+    second = service.analyze('TEST', 'short', 'moderate')
+    if first is not second:
+        print("✗ Cached result not reused")
+        return False
+
+    print("✓ Error reported and cache hit")
+    return True
+
+
+def test_recommendation():
+    """BUY recommendations carry entry, stop-loss and position size."""
+    print("\nTesting recommendation...")
+
+    scenarios = {
+        'bull': {'target': 110.0, 'change_pct': 10.0},
+        'bear': {'target': 95.0, 'change_pct': -5.0},
+    }
+    rec = build_recommendation('BUY', 100.0, scenarios, 'conservative')
+    if (rec.entry_low, rec.entry_high, rec.stop_loss) != (99.0, 101.0, 97.0) or rec.risk_reward != 2.0:
+        print(f"✗ Unexpected recommendation: {rec}")
+        return False
+    if rec.position_size != '2-3% of portfolio':
+        print(f"✗ Unexpected position size: {rec.position_size}")
+        return False
+
+    print("✓ Entry 99.00-101.00, stop 97.00, risk/reward 1:2.0")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Result serialization", test_result_roundtrip),
+        ("Errors and cache", test_errors_and_cache),
+        ("Recommendation", test_recommendation),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Test script for the local HTTP API.
+Runs offline against a slow fake AnalysisService.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from analysis_service import AnalysisResult, ScenarioResult
+from api_server import AnalysisApi
+
+
+class SlowService:
+    """AnalysisService stand-in that counts calls and takes 50 ms each."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def analyze(self, ticker, timeframe='short', risk_tolerance='moderate'):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        if ticker == 'ZZZZ':
+            return AnalysisResult(ticker, timeframe, risk_tolerance, error=f"Invalid ticker symbol: {ticker}")
+        return AnalysisResult(
+            ticker, timeframe, risk_tolerance, score=64, signal='BUY', confidence='Medium', max_score=100,
+            breakdown={'rsi': {'score': 70, 'weighted': 17.5, 'max': 25}},
+            simulation={'median_price': 102.0, 'bull_probability': 55.0},
+            scenarios={'bull': ScenarioResult(55.0, 105.0, 5.0, 7, 'up'),
+                       'bear': ScenarioResult(45.0, 97.0, -3.0, 7, 'down')},
+        )
+
+
+def test_single_flight():
+    """Concurrent identical requests run one analysis; repeats hit the cache."""
+    print("\nTesting request coalescing...")
+
+    service = SlowService()
+    api = AnalysisApi(service, cache_ttl=60)
+
+    async def run():
+        burst = await asyncio.gather(*[
+            api.handle('GET', '/score?ticker=aapl&timeframe=short&risk=moderate') for _ in range(20)
+        ])
+        repeat = await api.handle('GET', '/simulate?ticker=AAPL')
+        return burst, repeat
+
+    burst, repeat = asyncio.run(run())
+    api.close()
+
+    if service.calls != 1:
+        print(f"✗ Expected 1 analysis, got {service.calls}")
+        return False
+    if any(status != 200 or body['score'] != 64 for status, body in burst):
+        print("✗ Unexpected score responses")
+        return False
+    if repeat[0] != 200 or repeat[1]['scenarios']['bull']['target'] != 105.0:
+        print(f"✗ Unexpected simulate response: {repeat}")
+        return False
+
+    metrics = api.metrics_payload()
+    if metrics['single_flight']['coalesced'] != 19 or metrics['cache']['hits'] != 1:
+        print(f"✗ Unexpected metrics: {metrics}")
+        return False
+
+    print(f"✓ 20 requests -> 1 analysis, p99 {metrics['endpoints']['/score']['p99_ms']:.1f} ms")
+    return True
+
+
+def test_cancelled_leader():
+    """Cancelling the request that runs an analysis does not strand the requests waiting on it."""
+    print("\nTesting cancellation...")
+
+    service = SlowService()
+    api = AnalysisApi(service, cache_ttl=60)
+
+    async def run():
+        leader = asyncio.create_task(api.get_result(('AAPL', 'short', 'moderate')))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(api.get_result(('AAPL', 'short', 'moderate')))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await asyncio.wait_for(waiter, timeout=2)
+        return leader.cancelled(), result
+
+    try:
+        leader_cancelled, result = asyncio.run(run())
+    except asyncio.TimeoutError:
+        print("✗ Waiter hung after the leader was cancelled")
+        return False
+    finally:
+        api.close()
+
+    if not leader_cancelled or result.score != 64 or len(api.single_flight) != 0:
+        print(f"✗ Unexpected outcome: leader cancelled {leader_cancelled}, score {result.score}")
+        return False
+
+    print(f"✓ Waiter took over after the leader was cancelled ({service.calls} analyses)")
+    return True
+
+
+def test_cache_bound():
+    """The result cache keeps at most cache_size entries, evicting the least recently used."""
+    print("\nTesting cache bound...")
+
+    service = SlowService()
+    api = AnalysisApi(service, cache_ttl=60, cache_size=2)
+
+    async def run():
+        for ticker in ('AAPL', 'MSFT', 'AAPL', 'NVDA', 'AAPL', 'MSFT'):
+            await api.get_result((ticker, 'short', 'moderate'))
+
+    asyncio.run(run())
+    api.close()
+
+    # MSFT is evicted by NVDA (AAPL was used more recently), so it is analyzed twice
+    cached = [key[0] for key in api._cache]
+    if service.calls != 4 or cached != ['AAPL', 'MSFT']:
+        print(f"✗ {service.calls} analyses, cached {cached}")
+        return False
+
+    print(f"✓ {len(cached)} entries kept, {service.calls} analyses for 6 requests")
+    return True
+
+
+def test_errors():
+    """Bad parameters and failed analyses map to 4xx responses."""
+    print("\nTesting error responses...")
+
+    api = AnalysisApi(SlowService(), cache_ttl=60)
+
+    async def run():
+        return [
+            (await api.handle('GET', '/score'))[0],
+            (await api.handle('GET', '/score?ticker=AAPL&timeframe=weekly'))[0],
+            (await api.handle('GET', '/score?ticker=ZZZZ'))[0],
+            (await api.handle('GET', '/nowhere'))[0],
+            (await api.handle('POST', '/score?ticker=AAPL'))[0],
+        ]
+
+    statuses = asyncio.run(run())
+    api.close()
+
+    if statuses != [400, 400, 422, 404, 405]:
+        print(f"✗ Unexpected statuses: {statuses}")
+        return False
+
+    print(f"✓ Statuses {statuses}")
+    return True
+
+
+def test_http_roundtrip():
+    """Requests over a real socket, with keep-alive."""
+    print("\nTesting HTTP server...")
+
+    api = AnalysisApi(SlowService(), cache_ttl=60)
+
+    async def run():
+        server = await api.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for target in ('/health', '/analyze?ticker=MSFT', '/metrics'):
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b'\r\n':
+                name, _, value = line.decode().partition(':')
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            responses.append((int(status_line.split()[1]), json.loads(body)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = asyncio.run(run())
+    api.close()
+
+    health, analyze, metrics = responses
+    if health != (200, {'status': 'ok'}) or analyze[0] != 200 or analyze[1]['signal'] != 'BUY':
+        print(f"✗ Unexpected responses: {responses[:2]}")
+        return False
+    if metrics[1]['endpoints']['/analyze']['count'] != 1:
+        print(f"✗ Unexpected metrics: {metrics[1]}")
+        return False
+
+    print("✓ /health, /analyze and /metrics served over one connection")
+    return True
+
+
+def test_bad_content_length():
+    """Malformed, negative and oversized Content-Length headers get a 400 and close the connection."""
+    print("\nTesting Content-Length validation...")
+
+    api = AnalysisApi(SlowService(), cache_ttl=60)
+
+    async def send(length):
+        server = await api.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET /health HTTP/1.1\r\nHost: localhost\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        try:
+            response = await asyncio.wait_for(reader.read(), timeout=2)
+        except asyncio.TimeoutError:
+            response = b''  # connection left hanging
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return int(response.split()[1]) if response else None
+
+    async def run():
+        return [await send(length) for length in ('abc', '-5', str(2 ** 40))]
+
+    statuses = asyncio.run(run())
+    api.close()
+
+    if statuses != [400, 400, 400]:
+        print(f"✗ Unexpected statuses: {statuses}")
+        return False
+
+    print(f"✓ Statuses {statuses}")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Single flight", test_single_flight),
+        ("Cancelled leader", test_cancelled_leader),
+        ("Cache bound", test_cache_bound),
+        ("Error responses", test_errors),
+        ("HTTP round-trip", test_http_roundtrip),
+        ("Bad Content-Length", test_bad_content_length),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-interval bars.
+Checks OHLCV resampling against pandas, and that DataFetcher derives coarser
+intervals from one download (offline, fixture data).
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analysis_service import AnalysisService
+from bars import clamp_period, resample_ohlcv
+from data_fetcher import DataFetcher
+from fixtures import FixtureProvider, synthetic_intraday, synthetic_ohlcv
+from lookback import history_bars
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def reference(frame, rule, **kwargs):
+    """Same bars via pandas resample."""
+    return frame.resample(rule, **kwargs).agg(AGG).dropna()
+
+
+def same_bars(ours, theirs):
+    return (len(ours) == len(theirs) and ours.index.equals(theirs.index)
+            and np.allclose(ours[list(AGG)].to_numpy(float), theirs[list(AGG)].to_numpy(float)))
+
+
+def test_resample_matches_pandas():
+    """Intraday, daily, weekly and monthly bars match pandas resample."""
+    print("\nTesting resampling...")
+    intraday = synthetic_intraday(20, 5)
+    daily = synthetic_ohlcv(300)
+    session_open = pd.Timestamp('2025-01-02 09:30', tz='America/New_York')
+    cases = {
+        '5m->15m': (resample_ohlcv(intraday, '15m'), reference(intraday, '15min', origin=session_open)),
+        '5m->1h': (resample_ohlcv(intraday, '1h'), reference(intraday, '1h', origin=session_open)),
+        '5m->1d': (resample_ohlcv(intraday, '1d'), reference(intraday, '1D')),
+        '1d->1wk': (resample_ohlcv(daily, '1wk'), reference(daily, 'W-MON', label='left', closed='left')),
+        '1d->1mo': (resample_ohlcv(daily, '1mo'), reference(daily, 'MS')),
+    }
+    failed = [name for name, (ours, theirs) in cases.items() if not same_bars(ours, theirs)]
+    if failed:
+        print(f"✗ Mismatch: {failed}")
+        return False
+
+    hourly = resample_ohlcv(intraday, '1h')
+    times = sorted(set(hourly.index.strftime('%H:%M')))
+    print(f"  hourly bar starts: {times}")
+    if times[0] != '09:30' or len(hourly) != 20 * 7:
+        print("✗ Hourly bars not anchored at the session open")
+        return False
+
+    gappy = intraday.copy()
+    gappy.iloc[3:6, gappy.columns.get_loc('Close')] = np.nan
+    if resample_ohlcv(gappy, '1d')['Close'].isna().any():
+        print("✗ Missing bars leaked into the result")
+        return False
+    print(f"✓ {len(cases)} resamplings match pandas")
+    return True
+
+
+def test_single_download():
+    """Coarser intervals come from the finest covering download."""
+    print("\nTesting multi-interval fetch...")
+    provider = FixtureProvider()
+    fetcher = DataFetcher('AAPL', provider)
+    bars = fetcher.fetch_intervals('short', ['1d', '1h', '15m', '5m'])
+    print(f"  downloads: {provider.history_calls}, rows: { {k: len(v) for k, v in bars.items()} }")
+    # 200 daily bars reach back further than Yahoo serves 5m bars: daily is its own download
+    if provider.history_calls != ['5m', '1d']:
+        print("✗ Expected one 5m and one 1d download")
+        return False
+    base = fetcher._bars['5m'][1]
+    if not same_bars(bars['1h'], resample_ohlcv(base, '1h').tail(len(bars['1h']))) or len(bars['5m']) != 200:
+        print("✗ Derived bars differ")
+        return False
+
+    # 1m only reaches back 7 days: downloaded separately, clamped
+    bars = fetcher.fetch_intervals('short', ['1m', '30m'])
+    if provider.history_calls != ['5m', '1d', '1m'] or bars['1m'].index[0] < bars['1m'].index[-1] - pd.Timedelta(days=7):
+        print(f"✗ Unexpected downloads: {provider.history_calls}")
+        return False
+    if clamp_period('2y', '1h') != '730d' or clamp_period('6mo', '1d') != '6mo':
+        print("✗ Unexpected period clamping")
+        return False
+    print("✓ One download per base series")
+    return True
+
+
+def test_analysis_on_intraday():
+    """Indicators and scoring run on hourly bars; Monte Carlo stays on daily bars."""
+    print("\nTesting analysis on hourly bars...")
+    service = AnalysisService(iterations=200, provider=FixtureProvider())
+    daily = service.analyze('AAPL', 'short', 'moderate', include_series=True)
+    hourly = service.analyze('AAPL', 'short', 'moderate', include_series=True, interval='1h')
+    if not (daily.ok and hourly.ok) or hourly.interval != '1h':
+        print(f"✗ Analysis failed: {daily.error} / {hourly.error}")
+        return False
+    print(f"  daily score {daily.score} ({len(daily.series.data)} bars), "
+          f"hourly score {hourly.score} ({len(hourly.series.data)} bars)")
+    planned = {'1h': history_bars('short', '1h')['1h'], '1d': history_bars('short', '1d')['1d']}
+    spacing = hourly.series.data.index.to_series().diff().median()
+    if (len(hourly.series.data) != planned['1h'] or len(daily.series.data) != planned['1d']
+            or spacing >= pd.Timedelta(days=1) or hourly.simulation['days'] != 7):
+        print(f"✗ Hourly analysis did not use the planned hourly bars: {planned}")
+        return False
+    bad = service.analyze('AAPL', interval='7m')
+    if bad.ok or 'Unsupported interval' not in bad.error:
+        print("✗ Bad interval accepted")
+        return False
+    print("✓ Analysis runs at any resolution")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("BAR INTERVAL TESTS")
+    print("=" * 60)
+
+    results = {
+        'Resample matches pandas': test_resample_matches_pandas(),
+        'Single download': test_single_download(),
+        'Analysis on intraday bars': test_analysis_on_intraday(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Test script for the benchmark suite.
+Checks registration, baseline round-trips and regression flagging (offline).
+"""
+import os
+import sys
+import tempfile
+
+from benchmark import BENCHMARKS, compare, load_baseline, run_benchmarks, save_baseline
+
+
+def test_hot_paths_registered():
+    """Every hot path has at least one benchmark."""
+    print("\nTesting benchmark registry...")
+
+    prefixes = ('indicators.calculate_all', 'scoring.calculate_score', 'monte_carlo.run_simulation',
+                'charts.create_price_chart', 'charts.create_monte_carlo_chart', 'sentiment.')
+    missing = [p for p in prefixes if not any(name.startswith(p) for name in BENCHMARKS)]
+    if missing:
+        print(f"✗ No benchmarks for: {missing}")
+        return False
+
+    print(f"✓ {len(BENCHMARKS)} benchmarks registered")
+    return True
+
+
+def test_baseline_roundtrip():
+    """Results saved as a baseline compare as OK against themselves."""
+    print("\nTesting baseline round-trip...")
+
+    results = run_benchmarks('scoring', repeat=2, verbose=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'baseline.json')
+        save_baseline(results, path)
+        baseline = load_baseline(path)
+
+    rows = compare(results, baseline)
+    if len(rows) != 3 or any(row['status'] != 'ok' for row in rows):
+        print(f"✗ Unexpected comparison: {rows}")
+        return False
+
+    print(f"✓ {len(rows)} scoring benchmarks round-tripped")
+    return True
+
+
+def test_regression_flagged():
+    """Slowdowns beyond the tolerance are flagged."""
+    print("\nTesting regression detection...")
+
+    baseline = {'results': {'a': {'median_ms': 10.0}, 'b': {'median_ms': 10.0}, 'c': {'median_ms': 10.0}}}
+    results = {'a': {'median_ms': 14.0}, 'b': {'median_ms': 11.0}, 'c': {'median_ms': 5.0},
+               'd': {'median_ms': 1.0}}
+    statuses = {row['name']: row['status'] for row in compare(results, baseline, tolerance=0.25)}
+
+    expected = {'a': 'regression', 'b': 'ok', 'c': 'faster', 'd': 'new'}
+    if statuses != expected:
+        print(f"✗ Expected {expected}, got {statuses}")
+        return False
+
+    print("✓ +40% flagged, +10% within tolerance")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Hot paths registered", test_hot_paths_registered),
+        ("Baseline round-trip", test_baseline_roundtrip),
+        ("Regression flagged", test_regression_flagged),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Test script for the headless CLI.
+Checks that it stays free of UI imports, writes every output format and
+flattens results of short histories (offline, fixture data).
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from analysis_service import AnalysisService
+from cli import flatten_result, write_results
+from fixtures import FixtureProvider
+
+
+RECORDS = [
+    {'ticker': 'AAPL', 'score': 72, 'signal': 'BUY', 'mc_bull_probability': 58.1, 'error': None},
+    {'ticker': 'ZZZZ', 'score': None, 'signal': None, 'mc_bull_probability': None, 'error': 'invalid ticker'},
+]
+
+
+def test_no_ui_imports():
+    """Importing the CLI must not pull in Streamlit or Plotly."""
+    print("\nTesting CLI imports...")
+
+    code = "import sys, cli; print(','.join(m for m in ('streamlit', 'plotly') if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0 or result.stdout.strip():
+        print(f"✗ UI modules imported: {result.stdout.strip() or result.stderr}")
+        return False
+
+    print("✓ No Streamlit/Plotly imports")
+    return True
+
+
+def test_output_formats():
+    """JSON, CSV and Parquet outputs round-trip."""
+    print("\nTesting output formats...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'out.json')
+        csv_path = os.path.join(tmp, 'out.csv')
+        parquet_path = os.path.join(tmp, 'out.parquet')
+
+        write_results(RECORDS, 'json', json_path)
+        write_results(RECORDS, 'csv', csv_path)
+        write_results(RECORDS, 'parquet', parquet_path)
+
+        with open(json_path) as f:
+            from_json = json.load(f)
+        from_csv = pd.read_csv(csv_path)
+        from_parquet = pd.read_parquet(parquet_path)
+
+    if from_json != RECORDS or list(from_csv['ticker']) != ['AAPL', 'ZZZZ'] or len(from_parquet) != 2:
+        print("✗ Output did not round-trip")
+        return False
+
+    print("✓ JSON, CSV and Parquet written")
+    return True
+
+
+def test_short_history():
+    """Indicators skipped for a short history become empty cells, not errors."""
+    print("\nTesting short history...")
+
+    result = AnalysisService(iterations=100, provider=FixtureProvider(days=12)).analyze('AAPL', 'short')
+    if not result.ok or 'rsi' in result.indicators:
+        print(f"✗ Expected a successful analysis without RSI: {result.error}")
+        return False
+    try:
+        record = flatten_result(result)
+    except KeyError as e:
+        print(f"✗ Flattening failed: {e!r}")
+        return False
+    if record['rsi'] is not None or record['score'] is None:
+        print(f"✗ Unexpected record: rsi={record['rsi']}, score={record['score']}")
+        return False
+
+    print(f"✓ 12 bars flattened with an empty RSI cell (skipped: {sorted(set(result.breakdown) ^ {'rsi'})})")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("No UI imports", test_no_ui_imports),
+        ("Output formats", test_output_formats),
+        ("Short history", test_short_history),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
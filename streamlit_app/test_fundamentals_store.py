@@ -0,0 +1,105 @@
+"""
+Test script for the fundamentals snapshot store and sector peer engine.
+Runs offline with synthetic .info payloads.
+"""
+import sys
+import tempfile
+from datetime import timedelta
+
+import numpy as np
+
+from fundamentals_store import FundamentalsStore, SectorPeerEngine, info_to_frame
+
+
+def make_infos(count: int = 40) -> dict:
+    """Synthetic .info payloads for two sectors."""
+    rng = np.random.default_rng(7)
+    infos = {}
+    for i in range(count):
+        infos[f"T{i:03d}"] = {
+            'sector': 'Technology' if i % 2 == 0 else 'Utilities',
+            'trailingPE': float(rng.uniform(5, 60)),
+            'profitMargins': float(rng.uniform(-0.1, 0.4)),
+            'returnOnEquity': float(rng.uniform(-0.1, 0.5)),
+            'debtToEquity': float(rng.uniform(0, 300)),
+            'currentRatio': float(rng.uniform(0.5, 3)),
+        }
+    return infos
+
+
+def test_snapshot_refresh():
+    """Snapshots are reused until stale."""
+    print("\nTesting snapshot refresh...")
+
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'trailingPE': 20.0, 'sector': 'Technology'}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FundamentalsStore(tmp)
+        store.get_info('aapl', fetch)
+        store.get_info('AAPL', fetch)
+        if len(calls) != 1:
+            print(f"✗ Fresh snapshot refetched ({len(calls)} calls)")
+            return False
+
+        # A new store instance reads from disk; a zero max_age forces refresh
+        reloaded = FundamentalsStore(tmp, max_age=timedelta(0))
+        reloaded.get_info('AAPL', fetch)
+        if len(calls) != 2 or reloaded.tickers() != ['AAPL']:
+            print("✗ Stale snapshot not refreshed")
+            return False
+
+    print("✓ Snapshot cached and refreshed when stale")
+    return True
+
+
+def test_peer_percentiles():
+    """Binary-search percentiles match a brute-force ranking."""
+    print("\nTesting sector peer percentiles...")
+
+    infos = make_infos()
+    engine = SectorPeerEngine(info_to_frame(infos))
+    frame = engine.percentile_frame()
+
+    for ticker in ('T000', 'T013'):
+        info = infos[ticker]
+        peers = [v['returnOnEquity'] for v in infos.values() if v['sector'] == info['sector']]
+        below = sum(p < info['returnOnEquity'] for p in peers)
+        equal = sum(p == info['returnOnEquity'] for p in peers)
+        expected = (below + equal / 2) / len(peers) * 100
+
+        single = engine.ticker_percentiles(ticker)['roe']
+        if abs(single - expected) > 1e-9 or abs(frame.loc[ticker, 'roe'] - expected) > 1e-9:
+            print(f"✗ {ticker} ROE percentile {single:.2f} != {expected:.2f}")
+            return False
+
+    scores = engine.score_universe()
+    if len(scores) != 40 or not scores['score'].between(0, 100).all():
+        print("✗ Universe scores out of range")
+        return False
+
+    print(f"✓ Percentiles match; top ticker {scores.index[0]} ({scores['score'].iloc[0]})")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Snapshot refresh", test_snapshot_refresh),
+        ("Peer percentiles", test_peer_percentiles),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
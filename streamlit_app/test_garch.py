@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for the GARCH(1,1) return model.
+Checks that the fit recovers known parameters, that the vectorized paths
+match a per-path loop, that simulations start from the current volatility
+regime, and that fits are cached per ticker and history (offline, synthetic data).
+"""
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analysis_service import AnalysisService
+from fixtures import FixtureProvider, synthetic_ohlcv
+from garch import GarchStore, conditional_variance, fit_garch
+from monte_carlo import MonteCarloSimulator
+
+OMEGA, ALPHA, BETA = 4e-6, 0.08, 0.90
+
+
+def garch_returns(n, seed=0, mu=0.0005, shock_at=None):
+    """Returns simulated from known GARCH(1,1) parameters, optionally with a variance shock at one day."""
+    rng = np.random.default_rng(seed)
+    variance = OMEGA / (1 - ALPHA - BETA)
+    returns = np.empty(n)
+    for t in range(n):
+        if t == shock_at:
+            variance *= 9
+        shock = math.sqrt(variance) * rng.standard_normal()
+        returns[t] = mu + shock
+        variance = OMEGA + ALPHA * shock ** 2 + BETA * variance
+    return returns
+
+
+def price_frame(returns):
+    """Daily OHLCV-like frame with the given close-to-close returns."""
+    close = 100 * np.cumprod(np.concatenate(([1.0], 1 + returns)))
+    index = pd.bdate_range('2015-01-02', periods=len(close))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(len(close), 1e6)}, index=index)
+
+
+def test_fit_recovers_parameters():
+    """A long GARCH series gives back its alpha and beta; an i.i.d. one gives little persistence."""
+    print("\nTesting GARCH fit...")
+    fitted = fit_garch(garch_returns(4000))
+    print(f"  alpha {fitted.alpha:.3f} (true {ALPHA}), beta {fitted.beta:.3f} (true {BETA})")
+    if abs(fitted.alpha - ALPHA) > 0.04 or abs(fitted.beta - BETA) > 0.06:
+        print("✗ Parameters not recovered")
+        return False
+
+    residuals = garch_returns(200) - 0.0005
+    loop = [OMEGA / (1 - ALPHA - BETA)]
+    for e in residuals:
+        loop.append(OMEGA + ALPHA * e ** 2 + BETA * loop[-1])
+    if not np.allclose(conditional_variance(residuals, OMEGA, ALPHA, BETA, loop[0]), loop):
+        print("✗ Filtered variances differ from the recursion")
+        return False
+
+    close = synthetic_ohlcv(1000)['Close'].to_numpy()
+    iid = fit_garch(close[1:] / close[:-1] - 1)
+    if iid.alpha > 0.1 or not math.isclose(iid.long_run_variance, np.var(close[1:] / close[:-1] - 1, ddof=1)):
+        print(f"✗ Unexpected fit of i.i.d. returns: {iid}")
+        return False
+    print("✓ Parameters recovered")
+    return True
+
+
+def test_paths_match_loop():
+    """All-paths-per-day stepping equals a per-path loop over the same draws."""
+    print("\nTesting vectorized GARCH paths...")
+    simulator = MonteCarloSimulator(price_frame(garch_returns(1500)), model='garch', seed=2)
+    garch = simulator.garch_parameters()
+    ours = simulator.simulate_paths(50, 30, 100.0)
+
+    rng = np.random.default_rng(2)
+    draws = np.array([rng.standard_normal(50) for _ in range(30)])
+    loop = np.empty((50, 30))
+    for i in range(50):
+        price, variance = 100.0, garch.next_variance
+        for day in range(30):
+            shock = math.sqrt(variance) * draws[day, i]
+            price *= 1 + garch.mu + shock
+            loop[i, day] = price
+            variance = garch.omega + garch.alpha * shock ** 2 + garch.beta * variance
+    if not np.allclose(ours, loop, rtol=1e-12):
+        print("✗ Vectorized paths differ from the loop")
+        return False
+    print("✓ Identical to the per-path loop")
+    return True
+
+
+def test_current_regime():
+    """A volatile recent spell widens short horizons more than long ones; the closed form follows the variance."""
+    print("\nTesting volatility regime...")
+    calm = MonteCarloSimulator(price_frame(garch_returns(1500, seed=3)), iterations=20000,
+                               model='garch', seed=1)
+    stressed = MonteCarloSimulator(price_frame(garch_returns(1500, seed=3, shock_at=1495)), iterations=20000,
+                                   model='garch', seed=1)
+    widths = {}
+    for name, simulator in (('calm', calm), ('stressed', stressed)):
+        result = simulator.run_simulation(7, 100.0, horizons=(180,))
+        widths[name] = {h: (s['percentile_90'] - s['percentile_10']) for h, s in result['horizons'].items()}
+        analytic = simulator.run_analytic(7, 100.0, horizons=(180,))['horizons']
+        for h, stats in result['horizons'].items():
+            if abs(analytic[h]['percentile_90'] - stats['percentile_90']) > 0.05 * widths[name][h]:
+                print(f"✗ Closed-form variance off for {name} {h}d")
+                return False
+    short_ratio = widths['stressed'][7] / widths['calm'][7]
+    long_ratio = widths['stressed'][180] / widths['calm'][180]
+    print(f"  stressed/calm 10-90 width: {short_ratio:.2f}x at 7d, {long_ratio:.2f}x at 180d")
+    if not short_ratio > long_ratio > 1:
+        print("✗ Simulation ignores the current regime")
+        return False
+    print("✓ Short horizons follow the current volatility")
+    return True
+
+
+def test_store_caches_fits():
+    """Each ticker is fitted once per history; new bars refit; the service simulates GARCH paths."""
+    print("\nTesting parameter store...")
+    store = GarchStore()
+    data = price_frame(garch_returns(800))
+    for _ in range(3):
+        MonteCarloSimulator(data, model='garch', ticker='TEST', store=store).garch_parameters()
+    MonteCarloSimulator(data.iloc[:-1], model='garch', ticker='TEST', store=store).garch_parameters()
+    if store.fits != 2:
+        print(f"✗ Expected 2 fits, got {store.fits}")
+        return False
+
+    # Timeframes fit different history lengths (200 and 253 daily bars); alternating keeps both fits
+    store = GarchStore()
+    for _ in range(3):
+        for bars in (201, 254):
+            MonteCarloSimulator(data.iloc[-bars:], model='garch', ticker='TEST', store=store).garch_parameters()
+    if store.fits != 2:
+        print(f"✗ Alternating history lengths: expected 2 fits, got {store.fits}")
+        return False
+
+    small = GarchStore(max_entries=2)
+    for bars in (300, 301, 302, 300):
+        MonteCarloSimulator(data.iloc[:bars], model='garch', ticker='TEST', store=small).garch_parameters()
+    if small.fits != 4 or len(small._entries) != 2:
+        print(f"✗ Bounded store: {small.fits} fits, {len(small._entries)} entries")
+        return False
+
+    result = AnalysisService(iterations=300, provider=FixtureProvider(), return_model='garch').analyze('AAPL', 'short')
+    if not result.ok or not 0 < result.simulation['bull_probability'] < 100:
+        print(f"✗ GARCH analysis failed: {result.error}")
+        return False
+    print("✓ One fit per ticker and history, bounded")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("GARCH TESTS")
+    print("=" * 60)
+
+    results = {
+        'Fit recovers parameters': test_fit_recovers_parameters(),
+        'Paths match loop': test_paths_match_loop(),
+        'Current regime': test_current_regime(),
+        'Store caches fits': test_store_caches_fits(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
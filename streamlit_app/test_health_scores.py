@@ -0,0 +1,93 @@
+"""
+Test script for the vectorized fundamental health score.
+Checks calculate_health_scores against calculate_health_score row by row.
+"""
+import sys
+import time
+
+import numpy as np
+
+from fundamentals import FundamentalAnalyzer, HEALTH_SCORE_FIELDS
+
+
+# Values around every threshold used by calculate_health_score / _determine_valuation
+CANDIDATES = {
+    'pe_trailing': [None, 0, -5, 8, 10, 12, 15, 25, 30, 35, 40, 55],
+    'peg_ratio': [None, 0, -1, 0.5, 1, 1.5, 2, 2.5, 3, 4],
+    'pb_ratio': [None, 0, 1, 1.5, 3, 5, 7],
+    'profit_margin': [None, 0, -0.1, 0.05, 0.1, 0.15, 0.2, 0.3],
+    'roe': [None, 0, -0.2, 0.1, 0.12, 0.15, 0.4],
+    'operating_margin': [None, 0, -0.05, 0.05, 0.1, 0.15, 0.25],
+    'revenue_growth': [None, 0, -0.1, 0.05, 0.1, 0.15, 0.3],
+    'earnings_growth': [None, 0, -0.3, 0.05, 0.1, 0.15, 0.5],
+    'debt_to_equity': [None, 0, 30, 50, 80, 100, 150, 200, 250],
+    'current_ratio': [None, 0, 0.8, 1.0, 1.2, 1.5, 1.8, 2.0, 2.5],
+    'free_cash_flow': [None, 0, -1e8, 5e8, 1e9, 5e9],
+    'dividend_yield': [None, 0, 0.01, 0.02, 0.04, 0.06, 0.07, 0.08, 0.1],
+    'payout_ratio': [None, 0, -0.2, 0.3, 0.6, 0.7, 0.8, 0.9],
+}
+
+
+def make_universe(count: int = 3000) -> dict:
+    """Random fundamentals dicts built from the threshold candidates."""
+    rng = np.random.default_rng(42)
+    universe = {}
+    for i in range(count):
+        fundamentals = {'other': {}}
+        for category, fields in HEALTH_SCORE_FIELDS.items():
+            fundamentals[category] = {
+                field: CANDIDATES[field][rng.integers(len(CANDIDATES[field]))] for field in fields
+            }
+        universe[f"T{i:04d}"] = fundamentals
+    return universe
+
+
+def test_matches_scalar():
+    """Vectorized scores, valuation and flags equal the scalar method."""
+    print("\nTesting vectorized health scores...")
+
+    universe = make_universe()
+    analyzer = FundamentalAnalyzer("TEST")
+
+    start = time.perf_counter()
+    frame = FundamentalAnalyzer.fundamentals_to_frame(universe)
+    scores = FundamentalAnalyzer.calculate_health_scores(frame)
+    vector_time = time.perf_counter() - start
+
+    # Strings are normally built only for displayed rows; describe all to compare
+    described = FundamentalAnalyzer.describe_health_flags(frame, scores)
+
+    start = time.perf_counter()
+    for ticker, fundamentals in universe.items():
+        score, analysis = analyzer.calculate_health_score(fundamentals)
+        row = scores.loc[ticker]
+        mismatch = (
+            row['score'] != score
+            or row['max_score'] != analysis['max_score']
+            or row['earned_score'] != analysis['earned_score']
+            or row['valuation_status'] != analysis['valuation_status']
+            or described[ticker]['strengths'] != analysis['strengths']
+            or described[ticker]['red_flags'] != analysis['red_flags']
+        )
+        if mismatch:
+            print(f"✗ Mismatch for {ticker}: {fundamentals}")
+            print(f"  scalar: {score} {analysis}")
+            print(f"  vector: {row.to_dict()} {described[ticker]}")
+            return False
+    scalar_time = time.perf_counter() - start
+
+    print(f"✓ {len(universe)} rows match (vectorized {vector_time*1000:.0f} ms, "
+          f"scalar {scalar_time*1000:.0f} ms)")
+    return True
+
+
+def main():
+    """Run all tests."""
+    result = test_matches_scalar()
+    print("\n" + "=" * 60)
+    print(f"{'✓ PASS' if result else '✗ FAIL'} - Vectorized health scores")
+    return 0 if result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared yfinance HTTP session.
+Checks rate limiting, retries with backoff and the circuit breaker offline,
+using a scripted base session and a fake clock.
+"""
+import sys
+
+from http_session import CircuitOpenError, ResilienceMixin, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when sleep() is called."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class ScriptedSession:
+    """Base session returning (or raising) scripted outcomes in order."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = 0
+
+    def request(self, method, url, *args, **kwargs):
+        self.sent += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return FakeResponse(*outcome) if isinstance(outcome, tuple) else FakeResponse(outcome)
+
+
+class RetryingScriptedSession(ResilienceMixin, ScriptedSession):
+    def __init__(self, outcomes, clock, **resilience):
+        super().__init__(outcomes)
+        self.configure_resilience(clock=clock, sleep=clock.sleep, **resilience)
+
+
+def test_token_bucket():
+    """Burst passes immediately, then requests are spaced at the rate."""
+    print("\nTesting token bucket...")
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+    waits = [bucket.acquire() for _ in range(5)]
+    print(f"  waits: {[round(w, 3) for w in waits]}")
+    if waits[:2] != [0.0, 0.0] or abs(sum(waits) - 0.3) > 1e-9 or abs(clock.now - 0.3) > 1e-9:
+        print("✗ Unexpected waits")
+        return False
+    print("✓ 2-request burst, then 100 ms spacing")
+    return True
+
+
+def test_retry_then_success():
+    """429 and 503 are retried (honouring Retry-After) until a 200 arrives."""
+    print("\nTesting retries...")
+    clock = FakeClock()
+    session = RetryingScriptedSession([(429, {'Retry-After': '2'}), 503, ConnectionError('reset'), 200],
+                          clock, rate=1000, burst=1000, backoff_base=0.5)
+    response = session.request('GET', 'https://example.com')
+    stats = session.stats()
+    print(f"  sleeps: {[round(s, 3) for s in clock.sleeps]}, stats: {stats}")
+    if response.status_code != 200 or session.sent != 4 or stats['retries'] != 3:
+        print("✗ Request was not retried to success")
+        return False
+    if clock.sleeps[0] != 2.0 or not (0 <= clock.sleeps[1] <= 1.0 and 0 <= clock.sleeps[2] <= 2.0):
+        print("✗ Unexpected backoff delays")
+        return False
+    if stats['circuit'] != 'closed' or stats['failures'] != 0:
+        print("✗ Success should leave the circuit closed")
+        return False
+    print("✓ Retried 3 times with jittered backoff")
+    return True
+
+
+def test_retries_exhausted():
+    """After max_retries the last 429 is returned and connection errors are raised."""
+    print("\nTesting exhausted retries...")
+    clock = FakeClock()
+    session = RetryingScriptedSession([429] * 3, clock, rate=1000, burst=1000, max_retries=2)
+    response = session.request('GET', 'https://example.com')
+    if response.status_code != 429 or session.stats()['failures'] != 1:
+        print("✗ Final 429 not handed back")
+        return False
+
+    session = RetryingScriptedSession([TimeoutError('slow')] * 3, clock, rate=1000, burst=1000, max_retries=2)
+    try:
+        session.request('GET', 'https://example.com')
+        print("✗ Connection error swallowed")
+        return False
+    except TimeoutError:
+        pass
+    print("✓ Final response returned / error raised after retries")
+    return True
+
+
+def test_circuit_breaker():
+    """Repeated failures open the circuit; a successful probe closes it."""
+    print("\nTesting circuit breaker...")
+    clock = FakeClock()
+    session = RetryingScriptedSession([500, 500, 200], clock, rate=1000, burst=1000, max_retries=0,
+                          failure_threshold=2, reset_timeout=10)
+    session.request('GET', 'https://example.com')
+    session.request('GET', 'https://example.com')
+    if session.stats()['circuit'] != 'open':
+        print(f"✗ Circuit not open: {session.stats()}")
+        return False
+    try:
+        session.request('GET', 'https://example.com')
+        print("✗ Request sent while circuit open")
+        return False
+    except CircuitOpenError as e:
+        print(f"  rejected: {e}")
+    if session.sent != 2 or session.stats()['rejected'] != 1:
+        print("✗ Rejected request reached the network")
+        return False
+
+    clock.now += 10
+    if session.breaker.state != 'half_open':
+        print("✗ Circuit not half-open after reset timeout")
+        return False
+    response = session.request('GET', 'https://example.com')
+    if response.status_code != 200 or session.stats()['circuit'] != 'closed':
+        print("✗ Successful probe did not close the circuit")
+        return False
+    print("✓ Opened, rejected, probed and closed")
+    return True
+
+
+def test_interrupted_probe():
+    """A probe ending in a non-transient error does not leave the circuit stuck half-open."""
+    print("\nTesting interrupted probe...")
+    clock = FakeClock()
+    session = RetryingScriptedSession([500, ValueError('bad URL'), KeyboardInterrupt(), 200], clock,
+                                      rate=1000, burst=1000, max_retries=0,
+                                      failure_threshold=1, reset_timeout=10)
+    session.request('GET', 'https://example.com')
+    clock.now += 10
+    for expected in (ValueError, KeyboardInterrupt):
+        try:
+            session.request('GET', 'https://example.com')
+            print(f"✗ Probe did not raise {expected.__name__}")
+            return False
+        except expected:
+            pass
+        except CircuitOpenError as e:
+            print(f"✗ Probe rejected: {e}")
+            return False
+        if session.breaker.state != 'half_open':
+            print(f"✗ Circuit {session.breaker.state} after {expected.__name__}")
+            return False
+
+    try:
+        response = session.request('GET', 'https://example.com')
+    except CircuitOpenError as e:
+        print(f"✗ Next probe rejected: {e}")
+        return False
+    if response.status_code != 200 or session.stats()['circuit'] != 'closed':
+        print("✗ Next probe did not close the circuit")
+        return False
+    print("✓ Probe released after ValueError and KeyboardInterrupt")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("HTTP SESSION TESTS")
+    print("=" * 60)
+
+    results = {
+        'Token bucket': test_token_bucket(),
+        'Retry then success': test_retry_then_success(),
+        'Retries exhausted': test_retries_exhausted(),
+        'Circuit breaker': test_circuit_breaker(),
+        'Interrupted probe': test_interrupted_probe(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test that startup stays light: importing the app must not load pandas,
+yfinance or VADER, and the sentiment lexicon is loaded once per process.
+"""
+import sys
+
+from import_report import measure
+
+
+def test_app_import_is_light():
+    """Importing app.py does not pull in the data/analysis stack."""
+    print("\nTesting app import cost...")
+    result = measure('app')
+    loaded = [name for name in ('pandas', 'numpy', 'yfinance', 'curl_cffi', 'vaderSentiment')
+              if name in result['heavy_loaded']]
+    print(f"  import app: {result['total_ms']:.1f} ms, heavy modules: {result['heavy_loaded']}")
+    if loaded:
+        print(f"✗ Loaded at import time: {loaded}")
+        return False
+    print("✓ No heavy modules loaded at import time")
+    return True
+
+
+def test_sentiment_analyzer_shared():
+    """All NewsSentimentAnalyzer instances share one VADER analyzer."""
+    print("\nTesting shared sentiment analyzer...")
+    from news_sentiment import NewsSentimentAnalyzer
+    from fixtures import FixtureProvider
+
+    provider = FixtureProvider()
+    first = NewsSentimentAnalyzer('AAA', provider=provider)
+    second = NewsSentimentAnalyzer('BBB', provider=provider)
+    if first.analyzer is not second.analyzer:
+        print("✗ Each instance loaded its own lexicon")
+        return False
+    score = first.analyze_sentiment("Shares surge on record profits")
+    print(f"  compound score: {score['compound']:.3f}")
+    print("✓ Analyzer shared")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("IMPORT REPORT TESTS")
+    print("=" * 60)
+
+    results = {
+        'App import is light': test_app_import_is_light(),
+        'Sentiment analyzer shared': test_sentiment_analyzer_shared(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
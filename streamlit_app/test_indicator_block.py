@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for compact indicator storage.
+Checks that indicator series live in one float32 block as zero-copy views,
+that latest values and scores are unchanged, and the memory saved (offline).
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analysis_service import AnalysisService
+from fixtures import FixtureProvider, synthetic_ohlcv
+from indicator_engine import indicator_names
+from indicators import IndicatorBlock, TechnicalIndicators, compact_frame
+
+
+def series_items(indicators):
+    return {f'{name}.{key}': value for name, values in indicators.items()
+            for key, value in values.items() if isinstance(value, pd.Series)}
+
+
+def reference_indicators(data):
+    """Indicators as computed before compaction (float64 series, NumPy scalars)."""
+    ti = TechnicalIndicators(data)
+    ti.calculate_rsi()
+    ti.calculate_macd()
+    ti.calculate_bollinger_bands()
+    ti.calculate_sma()
+    ti.calculate_volume_metrics()
+    for name in indicator_names():
+        if name not in ti.indicators:
+            ti.indicators[name] = ti.engine.compute(name)
+    return ti.indicators
+
+
+def test_zero_copy_block():
+    """Every indicator series is a read-only view into one Fortran-ordered block."""
+    print("\nTesting indicator block...")
+    ti = TechnicalIndicators(synthetic_ohlcv(250))
+    indicators = ti.calculate_all()
+    block = ti.block
+    series = series_items(indicators)
+    print(f"  {len(series)} series in a {block.values.shape} {block.values.dtype} block")
+    if block.values.dtype != np.float32 or not block.values.flags.f_contiguous or block.values.flags.writeable:
+        print("✗ Block is not a read-only float32 column-major array")
+        return False
+    if sorted(series) != sorted(block.columns):
+        print("✗ Block columns differ from indicator series")
+        return False
+    if not all(np.shares_memory(value.to_numpy(), block.values) for value in series.values()):
+        print("✗ Indicator series were copied out of the block")
+        return False
+    if not all(np.shares_memory(block.column(name), block.values) for name in block.columns):
+        print("✗ column() returned a copy")
+        return False
+    frame = compact_frame(synthetic_ohlcv(50))
+    if set(frame.dtypes) != {np.dtype(np.float32)}:
+        print("✗ compact_frame kept float64 columns")
+        return False
+    print("✓ Zero-copy float32 views")
+    return True
+
+
+def test_values_unchanged():
+    """Latest values are Python floats equal to the float64 computation; series within float32 precision."""
+    print("\nTesting values...")
+    data = synthetic_ohlcv(250)
+    reference = reference_indicators(data)
+    indicators = TechnicalIndicators(data).calculate_all()
+
+    for name, values in reference.items():
+        for key, expected in values.items():
+            actual = indicators[name][key]
+            if isinstance(expected, pd.Series):
+                if not np.allclose(actual.to_numpy(float), expected.to_numpy(float), rtol=1e-6, equal_nan=True):
+                    print(f"✗ {name}.{key} series differs")
+                    return False
+            elif isinstance(expected, (np.number, float)):
+                if type(actual) is not float or actual != float(expected):
+                    print(f"✗ {name}.{key}: {actual!r} != {expected!r}")
+                    return False
+            elif actual != expected:
+                print(f"✗ {name}.{key}: {actual!r} != {expected!r}")
+                return False
+
+    block = IndicatorBlock(data.index, {'close': data['Close']})
+    if block.latest('close') != float(np.float32(data['Close'].iloc[-1])):
+        print("✗ latest() mismatch")
+        return False
+    print("✓ Latest values exact, series within float32 precision")
+    return True
+
+
+def test_memory_saved():
+    """Indicator storage is several times smaller than float64 series plus a data copy."""
+    print("\nTesting memory...")
+    data = synthetic_ohlcv(750)
+    before = sum(value.memory_usage(index=False) for value in series_items(reference_indicators(data)).values())
+    before += data.copy().memory_usage(index=False).sum()
+    ti = TechnicalIndicators(data)
+    ti.calculate_all()
+    after = ti.block.nbytes
+    print(f"  float64 series + copy: {before / 1024:.0f} KiB, float32 block: {after / 1024:.0f} KiB")
+    if before / after < 2.5 or ti.data is not data:
+        print("✗ Expected at least a 2.5x reduction and no data copy")
+        return False
+
+    service = AnalysisService(iterations=200, provider=FixtureProvider())
+    result = service.analyze('AAPL', 'long', 'moderate', include_series=True)
+    if not result.ok:
+        print(f"✗ Analysis failed: {result.error}")
+        return False
+    if set(result.series.data.dtypes) != {np.dtype(np.float32)} or \
+            result.series.simulation['simulations'].dtype != np.float32:
+        print("✗ Cached OHLCV or simulation paths not compacted")
+        return False
+    print(f"✓ {before / after:.1f}x smaller")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("INDICATOR BLOCK TESTS")
+    print("=" * 60)
+
+    results = {
+        'Zero-copy block': test_zero_copy_block(),
+        'Values unchanged': test_values_unchanged(),
+        'Memory saved': test_memory_saved(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
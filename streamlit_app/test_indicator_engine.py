@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the indicator dependency graph.
+Checks that registry-based indicators match the direct pandas formulas, that
+shared intermediates are computed once per frame, and that new indicators
+plug in without extra passes (offline, synthetic data).
+"""
+import sys
+from collections import Counter
+
+import numpy as np
+
+from fixtures import synthetic_ohlcv
+from indicator_engine import (
+    CLOSE, _INDICATORS, diff, ema, gain, register_indicator, rolling_mean, sub,
+)
+from indicators import TechnicalIndicators
+
+
+def same(a, b):
+    return np.array_equal(np.asarray(a, float), np.asarray(b, float), equal_nan=True)
+
+
+def test_matches_direct_formulas():
+    """Engine results are bit-identical to computing each indicator directly."""
+    print("\nTesting results against direct formulas...")
+    data = synthetic_ohlcv(300)
+    close = data['Close']
+    ti = TechnicalIndicators(data)
+    ti.calculate_rsi()
+    ti.calculate_macd()
+    ti.calculate_bollinger_bands()
+
+    delta = close.diff()
+    rs = delta.where(delta > 0, 0).rolling(window=14).mean() / (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = 100 - (100 / (1 + rs))
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    upper = close.rolling(window=20).mean() + close.rolling(window=20).std() * 2
+
+    checks = {
+        'rsi': same(ti.indicators['rsi']['series'], rsi) and ti.indicators['rsi']['value'] == rsi.iloc[-1],
+        'macd': same(ti.indicators['macd']['macd_series'], macd) and same(ti.indicators['macd']['signal_series'], signal),
+        'bollinger': same(ti.indicators['bollinger']['upper_series'], upper),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Mismatch: {failed}")
+        return False
+    print(f"✓ {len(checks)} indicators identical")
+    return True
+
+
+def test_intermediates_computed_once():
+    """Each intermediate is computed once per frame, shared across indicators."""
+    print("\nTesting shared intermediates...")
+    ti = TechnicalIndicators(synthetic_ohlcv(300))
+    ti.calculate_all()
+    computed = ti.engine.computed
+    counts = Counter(computed)
+    print(f"  {len(computed)} intermediates: {sorted({key[0] for key in computed})}")
+    if max(counts.values()) != 1:
+        print(f"✗ Recomputed: {[key for key, n in counts.items() if n > 1]}")
+        return False
+
+    # The MACD signal line reads the MACD line, which reads both EMAs
+    engine = ti.engine
+    line = sub(ema(CLOSE, 12), ema(CLOSE, 26))
+    plan = engine.plan([ema(line, 9)])
+    if plan.index(ema(CLOSE, 12)) > plan.index(line) or plan[-1] != ema(line, 9):
+        print(f"✗ Plan not topologically ordered: {plan}")
+        return False
+    if engine.get(diff(CLOSE)) is not engine.get(diff(CLOSE)):
+        print("✗ Intermediate not memoized")
+        return False
+    try:
+        engine.get(('median', CLOSE))
+        print("✗ Unknown intermediate accepted")
+        return False
+    except KeyError:
+        pass
+    print("✓ No intermediate computed twice")
+    return True
+
+
+def test_registered_indicator_reuses_inputs():
+    """A newly registered indicator is calculated by calculate_all from shared inputs."""
+    print("\nTesting indicator registration...")
+
+    @register_indicator('test_band_gain', window=20,
+                        inputs=lambda window: {'middle': rolling_mean(CLOSE, window), 'up': gain(diff(CLOSE))})
+    def band_gain(middle, up, window):
+        ratio = up / middle
+        return {'value': ratio.iloc[-1], 'series': ratio}
+
+    try:
+        data = synthetic_ohlcv(300)
+        baseline = TechnicalIndicators(data)
+        baseline.engine.compute_all([name for name in _INDICATORS if name != 'test_band_gain'])
+        ti = TechnicalIndicators(data)
+        indicators = ti.calculate_all()
+        if 'test_band_gain' not in indicators or 'test_band_gain.series' not in ti.block.columns:
+            print("✗ Registered indicator not calculated")
+            return False
+        extra = set(ti.engine.computed) - set(baseline.engine.computed)
+        print(f"  extra intermediates: {extra or 'none'}")
+        if extra:
+            print("✗ Registered indicator added passes over the data")
+            return False
+        if not np.allclose(indicators['test_band_gain']['value'],
+                           (data['Close'].diff().clip(lower=0) / data['Close'].rolling(20).mean()).iloc[-1]):
+            print("✗ Wrong value")
+            return False
+    finally:
+        _INDICATORS.pop('test_band_gain')
+    print("✓ Reused rolling_mean(Close, 20) and gain(diff(Close))")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("INDICATOR ENGINE TESTS")
+    print("=" * 60)
+
+    results = {
+        'Matches direct formulas': test_matches_direct_formulas(),
+        'Intermediates computed once': test_intermediates_computed_once(),
+        'Registered indicator reuses inputs': test_registered_indicator_reuses_inputs(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
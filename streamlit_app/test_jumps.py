@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for the jump-diffusion return model.
+Checks the calibration against known parameters, the moments of the densely
+sampled jumps, the earnings-day jump, and the earnings date handling of the
+analysis service (offline, synthetic data).
+"""
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analysis_service import AnalysisService
+from fixtures import FixtureProvider
+from fundamentals import parse_earnings_date
+from jumps import JumpParameters, earnings_move, fit_jumps, trading_days_until
+from monte_carlo import MonteCarloSimulator
+
+TRUE = JumpParameters(mu=0.0003, sigma=0.012, intensity=0.02, jump_mean=-0.01, jump_std=0.06)
+
+
+def jump_returns(n, parameters=TRUE, seed=0):
+    """Simple daily returns drawn from a jump diffusion, one day and one jump at a time."""
+    rng = np.random.default_rng(seed)
+    log_returns = []
+    for _ in range(n):
+        value = rng.normal(parameters.mu, parameters.sigma)
+        for _ in range(rng.poisson(parameters.intensity)):
+            value += rng.normal(parameters.jump_mean, parameters.jump_std)
+        log_returns.append(value)
+    return np.expm1(log_returns)
+
+
+def price_frame(returns):
+    """Daily OHLCV-like frame with the given close-to-close returns."""
+    close = 100 * np.cumprod(np.concatenate(([1.0], 1 + returns)))
+    index = pd.bdate_range('2010-01-04', periods=len(close))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(len(close), 1e6)}, index=index)
+
+
+def test_calibration():
+    """Threshold calibration recovers the diffusion, jump intensity and jump size."""
+    print("\nTesting calibration...")
+    fitted = fit_jumps(jump_returns(10000))
+    print(f"  intensity {fitted.intensity:.4f} (true {TRUE.intensity}), "
+          f"jump std {fitted.jump_std:.4f} (true {TRUE.jump_std}), sigma {fitted.sigma:.4f} (true {TRUE.sigma})")
+    checks = {
+        'intensity': abs(fitted.intensity / TRUE.intensity - 1) < 0.3,
+        'jump size': abs(fitted.jump_std / TRUE.jump_std - 1) < 0.2,
+        'diffusion': abs(fitted.sigma / TRUE.sigma - 1) < 0.1,
+        'no jumps': fit_jumps(np.random.default_rng(1).normal(0, 0.01, 2000)).intensity < 0.01,
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Not recovered: {failed}")
+        return False
+    print("✓ Parameters recovered")
+    return True
+
+
+def test_dense_sampling():
+    """Daily log returns of the sampled paths have the model's mean, variance and fat tails."""
+    print("\nTesting sampled jumps...")
+    simulator = MonteCarloSimulator(price_frame(jump_returns(5000)), model='jump', seed=3)
+    jumps = simulator.jump_parameters()
+    paths = simulator.simulate_paths(20000, 20, 100.0)
+    log_returns = np.diff(np.log(np.column_stack([np.full(20000, 100.0), paths])), axis=1).ravel()
+    standard_error = np.sqrt(jumps.log_variance / len(log_returns))
+    kurtosis = np.mean((log_returns - log_returns.mean()) ** 4) / log_returns.var() ** 2
+    print(f"  variance {log_returns.var():.3e} (model {jumps.log_variance:.3e}), kurtosis {kurtosis:.1f}")
+    if abs(log_returns.mean() - jumps.log_mean) > 4 * standard_error:
+        print("✗ Mean differs from the model")
+        return False
+    if abs(log_returns.var() / jumps.log_variance - 1) > 0.05 or kurtosis < 5:
+        print("✗ Variance or tails differ from the model")
+        return False
+    print("✓ Jump moments match")
+    return True
+
+
+def test_earnings_jump():
+    """The earnings day alone gets the extra variance and lowers the bear target of horizons containing it."""
+    print("\nTesting earnings jump...")
+    data = price_frame(jump_returns(3000))
+    plain = MonteCarloSimulator(data, iterations=20000, model='jump', seed=4)
+    earnings = MonteCarloSimulator(data, iterations=20000, model='jump', seed=4, earnings_day=3)
+    move = earnings_move(earnings.jump_parameters())
+
+    def daily_variance(simulator):
+        paths = simulator.simulate_paths(20000, 7, 100.0)
+        return np.diff(np.log(np.column_stack([np.full(20000, 100.0), paths])), axis=1).var(axis=0)
+
+    extra = daily_variance(earnings) - daily_variance(plain)
+    others = np.delete(extra, 2)
+    print(f"  earnings move ±{move * 100:.1f}%, extra day-3 variance {extra[2]:.2e} (expected {move ** 2:.2e})")
+    if abs(extra[2] / move ** 2 - 1) > 0.1 or np.abs(others).max() > 0.1 * move ** 2:
+        print("✗ Extra variance not on the earnings day")
+        return False
+
+    with_earnings = earnings.run_simulation(7, 100.0)['bear_target']
+    without = plain.run_simulation(7, 100.0)['bear_target']
+    after = MonteCarloSimulator(data, iterations=20000, model='jump', seed=4, earnings_day=30)
+    if not with_earnings < without or abs(after.run_simulation(7, 100.0)['bear_target'] - without) > 0.2:
+        print(f"✗ Bear targets: {with_earnings:.2f} with, {without:.2f} without earnings")
+        return False
+    print(f"✓ 7-day bear target {with_earnings:.2f} with earnings, {without:.2f} without")
+    return True
+
+
+def test_earnings_date():
+    """Earnings dates become trading days after the last bar; the service places the jump."""
+    print("\nTesting earnings dates...")
+    checks = {
+        'next week': trading_days_until('2024-05-07', '2024-05-03') == 2,
+        'same day': trading_days_until('2024-05-03', '2024-05-03') is None,
+        'unknown': trading_days_until(None, '2024-05-03') is None,
+        'parsed': parse_earnings_date({'earningsDate': [datetime(2024, 5, 7, 12).timestamp()]}) == '2024-05-07',
+    }
+
+    class EarningsProvider(FixtureProvider):
+        def info(self, ticker):
+            last_bar = self.history(ticker, 'max').index[-1]
+            return {**super().info(ticker),
+                    'earningsDate': [(last_bar + pd.offsets.BDay(2)).replace(hour=12).timestamp()]}
+
+    results = {}
+    for name, provider in (('without', FixtureProvider()), ('with', EarningsProvider())):
+        np.random.seed(5)
+        service = AnalysisService(iterations=2000, provider=provider, return_model='jump')
+        results[name] = service.analyze('AAPL', 'short')
+    checks['service'] = all(r.ok for r in results.values()) and (
+        results['with'].simulation['bear_target'] < results['without'].simulation['bear_target'])
+
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Failed: {failed}")
+        return False
+    print(f"✓ Bear target {results['with'].simulation['bear_target']:.2f} before earnings, "
+          f"{results['without'].simulation['bear_target']:.2f} without")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("JUMP DIFFUSION TESTS")
+    print("=" * 60)
+
+    results = {
+        'Calibration': test_calibration(),
+        'Dense sampling': test_dense_sampling(),
+        'Earnings jump': test_earnings_jump(),
+        'Earnings date': test_earnings_date(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized indicator kernels.
+Checks Stochastic, ATR, ADX, OBV and VWAP against straightforward
+row-by-row references, and that (dates x tickers) panels give the same
+result as one ticker at a time (offline, synthetic data).
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+import kernels
+from fixtures import synthetic_intraday, synthetic_ohlcv
+
+
+def wilder_reference(values, period):
+    """Wilder smoothing written out as the textbook loop."""
+    out = [np.nan] * len(values)
+    first = next(i for i, v in enumerate(values) if not np.isnan(v))
+    out[first + period - 1] = float(np.mean(values[first:first + period]))
+    for i in range(first + period, len(values)):
+        out[i] = out[i - 1] + (values[i] - out[i - 1]) / period
+    return np.array(out)
+
+
+def same(a, b):
+    return np.allclose(np.asarray(a, float), np.asarray(b, float), equal_nan=True)
+
+
+def test_single_ticker():
+    """Kernels match row-by-row references on one ticker."""
+    print("\nTesting kernels on one ticker...")
+    data = synthetic_ohlcv(300)
+    high, low, close, volume = (data[c].to_numpy() for c in ('High', 'Low', 'Close', 'Volume'))
+    n = len(data)
+
+    tr = np.array([np.nan] + [max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+                              for i in range(1, n)])
+    atr = wilder_reference(tr, 14)
+
+    plus_dm, minus_dm = [np.nan], [np.nan]
+    for i in range(1, n):
+        up, down = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm.append(up if up > down and up > 0 else 0.0)
+        minus_dm.append(down if down > up and down > 0 else 0.0)
+    plus_di = 100 * wilder_reference(np.array(plus_dm), 14) / atr
+    minus_di = 100 * wilder_reference(np.array(minus_dm), 14) / atr
+    adx = wilder_reference(100 * np.abs(plus_di - minus_di) / (plus_di + minus_di), 14)
+
+    lowest = data['Low'].rolling(14).min()
+    percent_k = 100 * (data['Close'] - lowest) / (data['High'].rolling(14).max() - lowest)
+    obv = np.cumsum([0.0] + [volume[i] * np.sign(close[i] - close[i - 1]) for i in range(1, n)])
+    typical = (high + low + close) / 3
+    vwap = np.cumsum(typical * volume) / np.cumsum(volume)
+
+    k, d = kernels.stochastic(data['High'], data['Low'], data['Close'])
+    ours_adx, ours_plus, ours_minus = kernels.average_directional_index(high, low, close)
+    checks = {
+        'stochastic %K': same(k, percent_k),
+        'stochastic %D': same(d, percent_k.rolling(3).mean()),
+        'ATR': same(kernels.average_true_range(high, low, close), atr),
+        'ADX': same(ours_adx, adx) and same(ours_plus, plus_di) and same(ours_minus, minus_di),
+        'OBV': same(kernels.on_balance_volume(close, volume), obv),
+        'VWAP': same(kernels.vwap(high, low, close, volume), vwap),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Mismatch: {failed}")
+        return False
+    if not isinstance(k, pd.Series) or not k.index.equals(data.index):
+        print("✗ pandas input did not come back as pandas")
+        return False
+    if not np.isnan(ours_adx[2 * 14 - 2]) or np.isnan(ours_adx[2 * 14 - 1]):
+        print("✗ ADX warm-up length")
+        return False
+    print(f"✓ {len(checks)} kernels match the references")
+    return True
+
+
+def test_panel_matches_columns():
+    """A dates x tickers panel gives each ticker's single-series result."""
+    print("\nTesting (dates x tickers) panels...")
+    frames = {f'T{seed}': synthetic_ohlcv(500, seed=seed) for seed in range(4)}
+    panel = {field: pd.DataFrame({t: f[field] for t, f in frames.items()}) for field in ('High', 'Low', 'Close', 'Volume')}
+    h, l, c, v = panel['High'], panel['Low'], panel['Close'], panel['Volume']
+
+    results = {
+        'stochastic': (kernels.stochastic(h, l, c)[0], lambda f: kernels.stochastic(f.High, f.Low, f.Close)[0]),
+        'atr': (kernels.average_true_range(h, l, c), lambda f: kernels.average_true_range(f.High, f.Low, f.Close)),
+        'adx': (kernels.average_directional_index(h, l, c)[0],
+                lambda f: kernels.average_directional_index(f.High, f.Low, f.Close)[0]),
+        'obv': (kernels.on_balance_volume(c, v), lambda f: kernels.on_balance_volume(f.Close, f.Volume)),
+        'vwap': (kernels.vwap(h, l, c, v), lambda f: kernels.vwap(f.High, f.Low, f.Close, f.Volume)),
+    }
+    failed = [name for name, (ours, single) in results.items()
+              if not isinstance(ours, pd.DataFrame)
+              or not all(same(ours[t], single(f)) for t, f in frames.items())]
+    if failed:
+        print(f"✗ Panel differs from per-ticker results: {failed}")
+        return False
+    print(f"✓ {len(results)} kernels on a {c.shape} panel")
+    return True
+
+
+def test_vwap_sessions():
+    """Intraday VWAP restarts every session; short inputs stay NaN."""
+    print("\nTesting session VWAP...")
+    bars = synthetic_intraday(3, 5)
+    dates = bars.index.normalize()
+    ours = kernels.vwap(bars['High'], bars['Low'], bars['Close'], bars['Volume'], sessions=dates)
+    typical = (bars['High'] + bars['Low'] + bars['Close']) / 3
+    grouped = (typical * bars['Volume']).groupby(dates).cumsum() / bars['Volume'].groupby(dates).cumsum()
+    if not same(ours, grouped):
+        print("✗ Session VWAP differs from a per-day cumulative average")
+        return False
+    first_bars = ours[~dates.duplicated()]
+    if not same(first_bars, typical[~dates.duplicated()]):
+        print("✗ VWAP did not restart at the session open")
+        return False
+
+    short = synthetic_ohlcv(10)
+    if not np.isnan(kernels.average_true_range(short.High, short.Low, short.Close)).all():
+        print("✗ ATR reported before a full period of data")
+        return False
+    print(f"✓ VWAP restarted for {dates.nunique()} sessions")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("INDICATOR KERNEL TESTS")
+    print("=" * 60)
+
+    results = {
+        'Single ticker': test_single_ticker(),
+        'Panel matches columns': test_panel_matches_columns(),
+        'VWAP sessions': test_vwap_sessions(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
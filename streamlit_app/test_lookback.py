@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the lookback planner.
+Checks the bars derived from indicator inputs (with recursive warm-up), that
+the planned window reproduces the full-history values, and that analyses
+fetch exactly the planned bars and skip indicators the data is too short for
+(offline, fixture data).
+"""
+import sys
+
+import numpy as np
+
+from analysis_service import AnalysisService
+from data_fetcher import DataFetcher
+from fixtures import FixtureProvider, synthetic_ohlcv
+from indicator_engine import _INDICATORS, CLOSE, diff, ema, indicator_names, register_indicator
+from indicators import TechnicalIndicators
+from lookback import ESTIMATION_BARS, history_bars, history_period, indicator_bars, key_lookback, recursive_warmup
+
+# Latest value of each indicator to compare (OBV's level depends on where it starts, its change does not)
+VALUE_KEYS = {'macd': 'macd_line', 'bollinger': 'upper', 'sma': 'sma_200', 'volume': 'average', 'obv': 'change'}
+# Daily VWAP is anchored at the first bar, so it has no window to compare
+ANCHORED = {'vwap'}
+
+
+def test_bars_from_inputs():
+    """Bars follow from the input keys, including EMA warm-up."""
+    print("\nTesting lookback of indicator inputs...")
+    checks = {
+        'sma': indicator_bars(['sma']) == 200,
+        'rsi': indicator_bars(['rsi']) == 15,
+        'ema warm-up': key_lookback(ema(CLOSE, 26)) == recursive_warmup(2 / 27),
+        'unconverged ema': key_lookback(ema(CLOSE, 26), converged=False) == 0,
+        'adx': indicator_bars(['adx'], converged=False) == 2 * 14,
+    }
+
+    @register_indicator('test_momentum', period=30, inputs=lambda period: {'change': diff(CLOSE, period)})
+    def momentum(change, period):
+        return {'value': change.iloc[-1], 'series': change}
+
+    try:
+        checks['registered'] = indicator_bars(['test_momentum']) == 31
+        checks['all'] = indicator_bars() == max(indicator_bars([name]) for name in indicator_names())
+    finally:
+        _INDICATORS.pop('test_momentum')
+
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Wrong lookback: {failed}")
+        return False
+    print(f"✓ {len(checks)} lookbacks, {indicator_bars()} bars for all indicators")
+    return True
+
+
+def test_window_matches_full_history():
+    """Indicators on just the planned bars match those on a long history."""
+    print("\nTesting planned windows...")
+    data = synthetic_ohlcv(1500)
+    full = TechnicalIndicators(data).calculate_all()
+    failed = []
+    names = [name for name in indicator_names() if name not in ANCHORED]
+    for name in names:
+        key = VALUE_KEYS.get(name, 'value')
+        short = TechnicalIndicators(data.tail(indicator_bars([name]))).calculate_all()
+        if name not in short or not np.isclose(short[name][key], full[name][key], rtol=0.01):
+            failed.append(name)
+    if failed:
+        print(f"✗ Differs from the full history: {failed}")
+        return False
+    print(f"✓ {len(names)} indicators match within 1%")
+    return True
+
+
+def test_fetch_and_skip():
+    """Each timeframe fetches the planned bars; too-short data skips indicators."""
+    print("\nTesting planned fetches...")
+    provider = FixtureProvider()
+    fetcher = DataFetcher('AAPL', provider)
+    rows = {timeframe: len(fetcher.fetch_data(timeframe)) for timeframe in ESTIMATION_BARS}
+    print(f"  daily bars: {rows}, hourly period: {history_period(200, '1h')}")
+    if any(rows[timeframe] != history_bars(timeframe)['1d'] for timeframe in rows) or rows['long'] != 253:
+        print("✗ Fetched bars differ from the plan")
+        return False
+
+    result = AnalysisService(iterations=200, provider=provider).analyze('AAPL', 'short')
+    if not result.ok or 'sma' not in result.breakdown or result.indicators['sma']['sma_200'] is None:
+        print(f"✗ Short-term analysis lacks the 200-day SMA: {result.error}")
+        return False
+
+    ti = TechnicalIndicators(synthetic_ohlcv(60))
+    indicators = ti.calculate_all()
+    if ti.skipped != ['sma'] or 'sma' in indicators or np.isnan(indicators['adx']['value']):
+        print(f"✗ Unexpected skips: {ti.skipped}")
+        return False
+    print(f"✓ 60 bars skip {ti.skipped}")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("LOOKBACK PLANNER TESTS")
+    print("=" * 60)
+
+    results = {
+        'Bars from inputs': test_bars_from_inputs(),
+        'Window matches full history': test_window_matches_full_history(),
+        'Fetch and skip': test_fetch_and_skip(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
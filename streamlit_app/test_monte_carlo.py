@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Test script for the Monte Carlo simulator.
+Checks the closed-form statistics against simulated paths within sampling
+error, that analyses only simulate paths when a chart needs them, that the
+vectorized paths match the per-path loop, and that adaptive runs stop at the
+requested precision, that path risk streams over chunks, that several
+horizons come from one path set, and that float32 paths stay within their
+error bound (offline, synthetic data).
+"""
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from analysis_service import SIMULATION_STATS, AnalysisService
+from fixtures import FixtureProvider, synthetic_ohlcv
+from monte_carlo import FLOAT32_TOLERANCE, HORIZON_PERCENTILES, MonteCarloSimulator, PathRisk, float32_error
+
+PATHS = 10000
+# Allowed deviation in standard errors
+Z = 4
+
+
+def test_analytic_matches_simulation():
+    """Closed-form percentiles, mean and bull probability lie within the simulation's sampling error."""
+    print("\nTesting closed-form statistics against simulated paths...")
+    failed = []
+    for seed, days in ((1, 7), (2, 28), (3, 180)):
+        simulator = MonteCarloSimulator(synthetic_ohlcv(500, seed=seed), iterations=PATHS)
+        np.random.seed(seed)
+        simulated = simulator.run_simulation(days, 100.0)
+        analytic = simulator.run_analytic(days, 100.0)
+        final = simulated['final_prices']
+
+        # Share of paths below each closed-form percentile vs. the percentile itself
+        for key, q in (('percentile_10', 0.10), ('bear_target', 0.35), ('median_price', 0.50),
+                       ('bull_target', 0.65), ('percentile_90', 0.90)):
+            if abs(np.mean(final < analytic[key]) - q) > Z * math.sqrt(q * (1 - q) / PATHS):
+                failed.append(f'{key}[{days}d]')
+        p = analytic['bull_probability'] / 100
+        if abs(simulated['bull_probability'] / 100 - p) > Z * math.sqrt(p * (1 - p) / PATHS):
+            failed.append(f'bull_probability[{days}d]')
+        if abs(final.mean() - analytic['mean_price']) > Z * final.std() / math.sqrt(PATHS):
+            failed.append(f'mean_price[{days}d]')
+        print(f"  {days}d: bull {simulated['bull_probability']:.2f}% simulated, "
+              f"{analytic['bull_probability']:.2f}% closed-form")
+    if failed:
+        print(f"✗ Outside sampling error: {failed}")
+        return False
+    print("✓ All statistics within sampling error")
+    return True
+
+
+def test_same_layout():
+    """The closed form returns the simulation's result layout without paths, in microseconds."""
+    print("\nTesting result layout...")
+    simulator = MonteCarloSimulator(synthetic_ohlcv(500), iterations=100)
+    simulated = simulator.run_simulation(28, 100.0)
+    analytic = simulator.run_analytic(28, 100.0)
+    path_keys = set(simulator.run_path_risk(28, 100.0, paths=10))
+    if set(simulated) != set(analytic) | path_keys or analytic['simulations'] is not None:
+        print(f"✗ Keys differ: {set(simulated) ^ (set(analytic) | path_keys)}")
+        return False
+    scenarios = simulator.get_scenarios(analytic)
+    if scenarios['bull']['target'] <= 100.0 or scenarios['bear']['target'] >= 100.0:
+        print(f"✗ Unexpected scenarios: {scenarios}")
+        return False
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        simulator.run_analytic(28, 100.0)
+    per_call = (time.perf_counter() - start) / 1000
+    print(f"  {per_call * 1e6:.1f} µs per call")
+    if per_call > 1e-3:
+        print("✗ Closed form slower than 1 ms")
+        return False
+    print("✓ Same statistics, no paths")
+    return True
+
+
+def test_service_simulates_only_for_charts():
+    """Analyses without series use the closed form; the chart still gets paths."""
+    print("\nTesting analysis service...")
+    service = AnalysisService(iterations=500, provider=FixtureProvider())
+    summary = service.analyze('AAPL', 'medium')
+    charted = service.analyze('AAPL', 'medium', include_series=True)
+    if not (summary.ok and charted.ok):
+        print(f"✗ Analysis failed: {summary.error} / {charted.error}")
+        return False
+    if charted.series.simulation['simulations'].shape != (500, 28):
+        print("✗ Chart analysis lacks simulated paths")
+        return False
+    again = service.analyze('AAPL', 'medium')
+    if any(summary.simulation[key] != again.simulation[key] for key in SIMULATION_STATS):
+        print("✗ Closed-form statistics not deterministic")
+        return False
+    if not 0 < summary.simulation['stop_first_probability'] < 100:
+        print("✗ Path risk missing from the closed-form analysis")
+        return False
+    if [stats['days'] for stats in charted.horizons.values()] != [7, 28, 180]:
+        print(f"✗ Timeframe horizons missing: {charted.horizons}")
+        return False
+    print(f"  median {summary.simulation['median_price']:.2f} closed-form, "
+          f"{charted.simulation['median_price']:.2f} simulated")
+    print("✓ Paths simulated only for the chart")
+    return True
+
+
+def scaled_volatility(data, factor):
+    """Same history with daily returns scaled by a factor."""
+    scaled = data.copy()
+    returns = data['Close'].pct_change().fillna(0) * factor
+    scaled['Close'] = data['Close'].iloc[0] * (1 + returns).cumprod()
+    return scaled
+
+
+def test_vectorized_paths():
+    """Batched paths equal the per-path loop for the same random draws; seeds make runs repeatable."""
+    print("\nTesting vectorized paths...")
+    simulator = MonteCarloSimulator(synthetic_ohlcv(500), iterations=200)
+    drift, volatility = simulator.estimate_parameters()
+    np.random.seed(7)
+    ours = simulator.run_simulation(28, 100.0)['simulations']
+    np.random.seed(7)
+    loop = np.zeros((200, 28))
+    for i in range(200):
+        path = [100.0]
+        for ret in np.random.normal(drift, volatility, 28):
+            path.append(path[-1] * (1 + ret))
+        loop[i] = path[1:]
+    if not np.array_equal(ours, loop):
+        print("✗ Vectorized paths differ from the loop")
+        return False
+
+    first = MonteCarloSimulator(synthetic_ohlcv(500), seed=3).run_simulation(7, 100.0)
+    second = MonteCarloSimulator(synthetic_ohlcv(500), seed=3).run_simulation(7, 100.0)
+    if not np.array_equal(first['simulations'], second['simulations']):
+        print("✗ Seeded runs differ")
+        return False
+    print("✓ Identical to the per-path loop")
+    return True
+
+
+def test_adaptive_stopping():
+    """Calm stocks stop early, volatile ones run longer, and the cap holds."""
+    print("\nTesting adaptive path counts...")
+    data = synthetic_ohlcv(500)
+    calm = MonteCarloSimulator(data, seed=1).run_adaptive(7, 100.0)
+    volatile = MonteCarloSimulator(scaled_volatility(data, 3), seed=1).run_adaptive(7, 100.0)
+    print(f"  calm: {calm['iterations']} paths (±{calm['price_error']:.2f}%), "
+          f"volatile: {volatile['iterations']} paths (±{volatile['price_error']:.2f}%)")
+    for result in (calm, volatile):
+        if not result['converged'] or result['probability_error'] > 2.5 or result['price_error'] > 1.5:
+            print("✗ Stopped before reaching the tolerance")
+            return False
+        if len(result['final_prices']) != result['iterations']:
+            print("✗ Reported paths differ from the simulated ones")
+            return False
+    if calm['iterations'] > 1000 or volatile['iterations'] <= calm['iterations']:
+        print("✗ Path count did not follow volatility")
+        return False
+
+    capped = MonteCarloSimulator(data, seed=1).run_adaptive(28, 100.0, price_tolerance=0.01, max_iterations=1200)
+    if capped['converged'] or capped['iterations'] != 1200:
+        print(f"✗ Cap not respected: {capped['iterations']} paths")
+        return False
+
+    for bad in ({'batch_size': 0}, {'max_iterations': 0}, {'batch_size': -5}):
+        try:
+            MonteCarloSimulator(data, seed=1).run_adaptive(7, 100.0, **bad)
+            print(f"✗ Accepted {bad}")
+            return False
+        except ValueError:
+            pass
+    print("✓ Paths follow the requested precision")
+    return True
+
+
+def test_path_risk():
+    """Streamed path statistics match a per-path reference and never hold all paths."""
+    print("\nTesting path risk...")
+    simulator = MonteCarloSimulator(synthetic_ohlcv(500), iterations=300, seed=4)
+    paths = simulator.simulate_paths(300, 28, 100.0)
+
+    stop_first = target_first = 0
+    drawdowns = []
+    for path in paths:
+        stop_day = next((d for d, price in enumerate(path) if price <= 97.0), None)
+        target_day = next((d for d, price in enumerate(path) if price >= 104.0), None)
+        if stop_day is not None and (target_day is None or stop_day < target_day):
+            stop_first += 1
+        if target_day is not None and (stop_day is None or target_day < stop_day):
+            target_first += 1
+        peak, worst = 100.0, 0.0
+        for price in path:
+            peak = max(peak, price)
+            worst = max(worst, 1 - price / peak)
+        drawdowns.append(worst * 100)
+
+    whole, chunked = PathRisk(100.0, 97.0, 104.0), PathRisk(100.0, 97.0, 104.0)
+    whole.update(paths)
+    for start in range(0, 300, 7):
+        chunked.update(paths[start:start + 7])
+    ours = whole.result()
+    checks = {
+        'stop first': math.isclose(ours['stop_first_probability'], stop_first / 3),
+        'target first': math.isclose(ours['target_first_probability'], target_first / 3),
+        'drawdown': math.isclose(ours['max_drawdown_median'], np.median(drawdowns)),
+        'chunking': ours == chunked.result(),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"✗ Mismatch: {failed}")
+        return False
+
+    tracemalloc.start()
+    risk = simulator.run_path_risk(180, 100.0, paths=20000)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    full = 20000 * 180 * 8
+    print(f"  stop before target {risk['stop_first_probability']:.1f}%, "
+          f"peak memory {peak / 2**20:.1f} MiB for {full / 2**20:.1f} MiB of paths")
+    if peak > full / 3:
+        print("✗ Paths were held in memory")
+        return False
+    print("✓ Path risk streamed over chunks")
+    return True
+
+
+def test_horizons_from_one_run():
+    """Each horizon's statistics equal np.percentile of that day's prices, from one set of paths."""
+    print("\nTesting horizons...")
+    simulator = MonteCarloSimulator(synthetic_ohlcv(500), iterations=2000)
+    np.random.seed(5)
+    result = simulator.run_simulation(28, 100.0, horizons=(180, 7, 28))
+    np.random.seed(5)
+    paths = simulator.simulate_paths(2000, 180, 100.0)
+    if list(result['horizons']) != [7, 28, 180] or not np.array_equal(result['simulations'], paths[:, :28]):
+        print(f"✗ Unexpected horizons or paths: {list(result['horizons'])}")
+        return False
+
+    failed = []
+    for horizon, stats in result['horizons'].items():
+        prices = paths[:, horizon - 1]
+        for key, q in HORIZON_PERCENTILES.items():
+            if not math.isclose(stats[key], np.percentile(prices, q)):
+                failed.append(f'{key}[{horizon}d]')
+        if not math.isclose(stats['bull_probability'], np.mean(prices > 100.0) * 100):
+            failed.append(f'bull_probability[{horizon}d]')
+    main_stats = result['horizons'][28]
+    if any(not math.isclose(main_stats[key], result[key]) for key in main_stats):
+        failed.append('main statistics')
+    analytic = simulator.run_analytic(28, 100.0, horizons=(7, 180))['horizons']
+    if any(not math.isclose(analytic[h]['median_price'], simulator.run_analytic(h, 100.0)['median_price'])
+           for h in (7, 28, 180)):
+        failed.append('closed form')
+    if failed:
+        print(f"✗ Mismatch: {failed}")
+        return False
+
+    print("  " + ", ".join(f"{h}d median {s['median_price']:.2f}" for h, s in result['horizons'].items()))
+    print("✓ Horizon statistics match per-day percentiles")
+    return True
+
+
+def test_float32_paths():
+    """float32 log-space paths match float64 within the error bound, in half the memory, and fall back."""
+    print("\nTesting float32 paths...")
+    data = synthetic_ohlcv(500)
+    simulator = MonteCarloSimulator(data, seed=6, precision='float32')
+    drift, volatility = simulator.estimate_parameters()
+    paths = simulator.simulate_paths(5000, 180, 100.0)
+
+    # Same float32 draws, in float64
+    draws = np.random.default_rng(6).standard_normal((5000, 180), dtype=np.float32).astype(np.float64)
+    exact = 100.0 * np.exp(np.cumsum(np.log1p(drift + volatility * draws), axis=1))
+    error = np.max(np.abs(paths / exact - 1))
+    bound = float32_error(180, drift, volatility)
+    print(f"  max relative error {error:.1e}, bound {bound:.1e}")
+    if paths.dtype != np.float32 or error > bound:
+        print("✗ float32 paths outside the error bound")
+        return False
+
+    sizes = {}
+    for precision in ('float64', 'float32'):
+        tracemalloc.start()
+        MonteCarloSimulator(data, seed=6, precision=precision).simulate_paths(20000, 180, 100.0)
+        sizes[precision] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"  peak {sizes['float64'] / 2**20:.1f} MiB float64, {sizes['float32'] / 2**20:.1f} MiB float32")
+    # Both build one (paths, days) array in place; float32 elements are half the size
+    if sizes['float32'] > 0.55 * sizes['float64']:
+        print("✗ float32 paths not smaller")
+        return False
+
+    volatile = MonteCarloSimulator(scaled_volatility(data, 4), precision='float32')
+    garch = MonteCarloSimulator(data, precision='float32', model='garch')
+    fallbacks = {
+        'long volatile horizon': volatile.simulation_dtype(1000) == np.float64,
+        'short volatile horizon': volatile.simulation_dtype(28) == np.float32,
+        'garch': garch.simulate_paths(10, 28, 100.0).dtype == np.float64,
+    }
+    if not all(fallbacks.values()):
+        print(f"✗ Wrong precision: {fallbacks}")
+        return False
+    print(f"✓ Within {FLOAT32_TOLERANCE:.0e}; float64 beyond it")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("MONTE CARLO TESTS")
+    print("=" * 60)
+
+    results = {
+        'Closed form matches simulation': test_analytic_matches_simulation(),
+        'Same layout': test_same_layout(),
+        'Service simulates only for charts': test_service_simulates_only_for_charts(),
+        'Vectorized paths': test_vectorized_paths(),
+        'Adaptive stopping': test_adaptive_stopping(),
+        'Path risk': test_path_risk(),
+        'Horizons from one run': test_horizons_from_one_run(),
+        'Float32 paths': test_float32_paths(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
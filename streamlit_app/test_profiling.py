@@ -0,0 +1,160 @@
+"""
+Test script for stage timing instrumentation.
+Checks traces, thread propagation, per-request profiling, Prometheus export
+and disabled overhead.
+"""
+import sys
+import threading
+import time
+
+import profiling
+from factors import FactorCache, _PROVIDERS, evaluate_factors, register_factor
+from profiling import span, timed, trace
+
+
+@timed('test.work')
+def work():
+    time.sleep(0.002)
+
+
+def test_trace_waterfall():
+    """Nested spans, including those in factor threads, land in the trace."""
+    print("\nTesting trace waterfall...")
+
+    register_factor('test_profiled')(lambda ticker, info, provider: (time.sleep(0.001), 70)[1])
+    profiling.enable()
+    try:
+        with trace('request') as request_trace:
+            with span('outer'):
+                work()
+                evaluate_factors('TEST', ['test_profiled'], {}, cache=FactorCache())
+    finally:
+        profiling.disable()
+        _PROVIDERS.pop('test_profiled')
+
+    rows = {row['name']: row for row in request_trace.waterfall()}
+    if set(rows) != {'outer', 'test.work', 'factor.test_profiled'}:
+        print(f"✗ Unexpected spans: {sorted(rows)}")
+        return False
+    if rows['outer']['depth'] != 0 or rows['test.work']['depth'] != 1 or rows['factor.test_profiled']['depth'] != 1:
+        print(f"✗ Unexpected nesting: {rows}")
+        return False
+    if rows['test.work']['duration_ms'] < 2 or rows['outer']['duration_ms'] < rows['test.work']['duration_ms']:
+        print(f"✗ Unexpected durations: {rows}")
+        return False
+
+    print(f"✓ {len(rows)} spans over {request_trace.total_ms:.1f} ms, factor thread included")
+    return True
+
+
+def test_request_scoped():
+    """trace(enable=True) profiles its own request only; the process-wide flag stays off."""
+    print("\nTesting per-request profiling...")
+
+    profiling.disable()
+    outside = []
+    register_factor('test_scoped')(lambda ticker, info, provider: 70)
+    try:
+        with trace('request', enable=True) as request_trace:
+            work()
+            evaluate_factors('TEST', ['test_scoped'], {}, cache=FactorCache())
+            # Another session's thread does not inherit this request's context
+            other = threading.Thread(target=lambda: outside.append(profiling.is_enabled()))
+            other.start()
+            other.join()
+    finally:
+        _PROVIDERS.pop('test_scoped')
+
+    names = {row['name'] for row in request_trace.waterfall()}
+    if names != {'test.work', 'factor.test_scoped'}:
+        print(f"✗ Unexpected spans: {sorted(names)}")
+        return False
+    if profiling.is_enabled() or outside != [False]:
+        print(f"✗ Profiling leaked: after {profiling.is_enabled()}, other thread {outside}")
+        return False
+
+    print(f"✓ {len(names)} spans in the request, profiling off elsewhere")
+    return True
+
+
+def test_prometheus_export():
+    """Histogram buckets are cumulative and end with the total count."""
+    print("\nTesting Prometheus export...")
+
+    profiling.metrics.reset()
+    profiling.enable()
+    try:
+        for _ in range(3):
+            work()
+    finally:
+        profiling.disable()
+
+    text = profiling.prometheus_text()
+    lines = [line for line in text.splitlines() if 'stage="test.work"' in line]
+    buckets = [int(line.split()[-1]) for line in lines if '_bucket' in line]
+    if buckets != sorted(buckets) or buckets[-1] != 3 or f'{profiling.METRIC_NAME}_count{{stage="test.work"}} 3' not in text:
+        print(f"✗ Unexpected export:\n{text}")
+        return False
+    if profiling.metrics_json()['stages']['test.work']['count'] != 3:
+        print("✗ JSON metrics disagree")
+        return False
+
+    print(f"✓ {len(lines)} series exported for test.work")
+    return True
+
+
+def test_disabled_overhead():
+    """Disabled instrumentation records nothing and costs well under a microsecond."""
+    print("\nTesting disabled overhead...")
+
+    def plain(x):
+        return x
+
+    instrumented = timed('test.noop')(plain)
+    profiling.metrics.reset()
+    calls = 200_000
+
+    def cost(func):
+        start = time.perf_counter()
+        for i in range(calls):
+            func(i)
+        return (time.perf_counter() - start) / calls * 1e9
+
+    overhead_ns = min(cost(instrumented) - cost(plain) for _ in range(3))
+    start = time.perf_counter()
+    for _ in range(calls):
+        with span('test.noop'):
+            pass
+    span_ns = (time.perf_counter() - start) / calls * 1e9
+
+    if profiling.metrics.snapshot():
+        print("✗ Metrics recorded while disabled")
+        return False
+    if overhead_ns > 1000 or span_ns > 1000:
+        print(f"✗ Overhead too high: @timed {overhead_ns:.0f} ns, span {span_ns:.0f} ns")
+        return False
+
+    print(f"✓ @timed +{overhead_ns:.0f} ns/call, span {span_ns:.0f} ns/block")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Trace waterfall", test_trace_waterfall),
+        ("Per-request profiling", test_request_scoped),
+        ("Prometheus export", test_prometheus_export),
+        ("Disabled overhead", test_disabled_overhead),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
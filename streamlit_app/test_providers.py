@@ -0,0 +1,149 @@
+"""
+Test script for the record/replay data providers.
+Records synthetic fixture data to a temporary directory and replays it (offline).
+"""
+import sys
+import tempfile
+import time
+
+from analysis_service import AnalysisService
+from factors import default_cache
+from fixtures import FixtureProvider
+from providers import DataProvider, MissingRecording, RecordingProvider, ReplayProvider, set_provider
+
+
+COMPARED_FIELDS = ('stock_info', 'score', 'signal', 'breakdown', 'indicators')
+
+
+def analyze_with(provider, ticker, timeframe):
+    """Run the full pipeline (including provider factors) against one provider."""
+    set_provider(provider)
+    default_cache.clear()
+    try:
+        return AnalysisService(iterations=100).analyze(ticker, timeframe, 'moderate')
+    finally:
+        set_provider(None)
+        default_cache.clear()
+
+
+def test_record_replay():
+    """Replayed analyses match the recorded ones."""
+    print("\nTesting record/replay...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = RecordingProvider(tmp, inner=FixtureProvider())
+        replay = ReplayProvider(tmp)
+
+        for timeframe in ('short', 'medium', 'long'):
+            recorded = analyze_with(recorder, 'AAPL', timeframe).to_dict()
+            replayed = analyze_with(replay, 'AAPL', timeframe).to_dict()
+            if recorded['error'] or replayed['error']:
+                print(f"✗ {timeframe}: {recorded['error'] or replayed['error']}")
+                return False
+            diff = [f for f in COMPARED_FIELDS if recorded[f] != replayed[f]]
+            if diff:
+                print(f"✗ {timeframe}: replay differs in {diff}")
+                return False
+
+        missing = analyze_with(replay, 'MSFT', 'short')
+
+    if missing.ok:
+        print("✗ Unrecorded ticker did not fail")
+        return False
+
+    print("✓ short/medium/long analyses identical on replay; unrecorded ticker reported")
+    return True
+
+
+def test_history_slicing():
+    """Periods without their own recording are cut from the longest one."""
+    print("\nTesting history slicing...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = FixtureProvider()
+        RecordingProvider(tmp, inner=fixture).history('TEST', period='2y')
+        replay = ReplayProvider(tmp)
+
+        sliced = replay.history('TEST', period='60d')
+        expected = fixture.history('TEST', period='60d')
+        ranged = replay.history('TEST', start='2025-01-01', end='2025-02-01')
+
+        try:
+            replay.history('TEST', period='5d', interval='1h')
+            print("✗ Missing interval did not raise")
+            return False
+        except MissingRecording:
+            pass
+
+    if not sliced.equals(expected):
+        print(f"✗ 60d slice has {len(sliced)} rows, expected {len(expected)}")
+        return False
+    if len(ranged) != 23 or ranged.index[0].strftime('%Y-%m-%d') != '2025-01-01':
+        print(f"✗ Unexpected date range slice: {len(ranged)} rows")
+        return False
+
+    print(f"✓ 60d slice ({len(sliced)} rows) and date range ({len(ranged)} rows)")
+    return True
+
+
+def test_replay_throughput():
+    """Replay serves history and info from memory after the first call."""
+    print("\nTesting replay throughput...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = RecordingProvider(tmp, inner=FixtureProvider())
+        recorder.history('TEST', period='6mo')
+        recorder.info('TEST')
+        replay = ReplayProvider(tmp)
+
+        start = time.perf_counter()
+        for _ in range(2000):
+            replay.history('TEST', period='6mo')
+            replay.info('TEST')
+        rate = 2000 / (time.perf_counter() - start)
+
+    if rate < 1000:
+        print(f"✗ Only {rate:,.0f} lookups/s")
+        return False
+
+    print(f"✓ {rate:,.0f} history+info lookups/s")
+    return True
+
+
+def test_incomplete_provider():
+    """A provider missing a method fails when constructed, not mid-analysis."""
+    print("\nTesting incomplete provider...")
+
+    class HistoryOnly(DataProvider):
+        def history(self, ticker, period=None, interval='1d', start=None, end=None):
+            return FixtureProvider().history(ticker, period, interval, start, end)
+
+    try:
+        HistoryOnly()
+    except TypeError as e:
+        print(f"✓ Rejected: {e}")
+        return True
+    print("✗ Incomplete provider constructed")
+    return False
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Record/replay", test_record_replay),
+        ("History slicing", test_history_slicing),
+        ("Replay throughput", test_replay_throughput),
+        ("Incomplete provider", test_incomplete_provider),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Test script for the scoring system and factor providers.
+Runs offline with synthetic indicators, fixture data and a pre-filled factor cache.
+"""
+import sys
+import time
+
+from factors import FactorCache, evaluate_factors, register_factor
+from fixtures import FixtureProvider
+from scoring import ScoringSystem
+
+
+INDICATORS = {
+    'rsi': {'value': 35.0},
+    'macd': {'macd_line': 1.2, 'signal_line': 0.8, 'histogram': 0.4},
+    'bollinger': {'current': 101.0, 'upper': 110.0, 'lower': 100.0, 'middle': 105.0},
+    'sma': {'current': 101.0, 'sma_50': 98.0, 'sma_200': 95.0},
+    'volume': {'change_pct': 25.0},
+}
+
+
+def test_short_unchanged():
+    """Short-term weights have no provider factors and sum to 100."""
+    print("\nTesting short-term score...")
+
+    cache = FactorCache()
+    results = ScoringSystem('short', 'moderate', factor_cache=cache).calculate_score(
+        INDICATORS, {'ticker': 'TEST'})
+
+    expected = int(0.70 * 25 + 0.85 * 30 + 0.65 * 20 + 0.75 * 15 + 0.90 * 10)
+    if results['score'] != expected or results['max_score'] != 100:
+        print(f"✗ Expected {expected}/100, got {results['score']}/{results['max_score']}")
+        return False
+
+    print(f"✓ Short-term score: {results['score']}/100")
+    return True
+
+
+def test_sentiment_factor():
+    """Medium-term score includes cached sentiment and stays normalized."""
+    print("\nTesting sentiment factor...")
+
+    cache = FactorCache()
+    cache.set('sentiment', 'TEST', 80)
+    results = ScoringSystem('medium', 'moderate', factor_cache=cache).calculate_score(
+        INDICATORS, {'ticker': 'TEST'})
+
+    if 'sentiment' not in results['breakdown'] or results['max_score'] != 100:
+        print(f"✗ Sentiment missing from breakdown: {results['breakdown'].keys()}")
+        return False
+
+    # Unavailable factor is left out and the score is renormalized
+    cache.set('sentiment', 'TEST', None)
+    missing = ScoringSystem('medium', 'moderate', factor_cache=cache).calculate_score(
+        INDICATORS, {'ticker': 'TEST'})
+    total = sum(d['weighted'] for d in missing['breakdown'].values())
+    if missing['max_score'] != 95 or missing['score'] != int(total * 100 / 95):
+        print(f"✗ Score not normalized: {missing['score']} ({missing['max_score']})")
+        return False
+
+    print(f"✓ With sentiment: {results['score']}/100, without: {missing['score']}/100")
+    return True
+
+
+def test_concurrent_providers():
+    """Providers run concurrently and are cached per ticker."""
+    print("\nTesting concurrent providers...")
+
+    calls = []
+
+    def slow_provider(ticker, stock_info, provider):
+        calls.append(ticker)
+        time.sleep(0.2)
+        return 60
+
+    for name in ('slow_a', 'slow_b', 'slow_c'):
+        register_factor(name)(slow_provider)
+
+    cache = FactorCache()
+    start = time.perf_counter()
+    scores = evaluate_factors('test', ['slow_a', 'slow_b', 'slow_c'], {}, cache=cache)
+    elapsed = time.perf_counter() - start
+
+    if scores != {'slow_a': 60, 'slow_b': 60, 'slow_c': 60} or elapsed > 0.5:
+        print(f"✗ Unexpected results {scores} in {elapsed:.2f}s")
+        return False
+
+    evaluate_factors('TEST', ['slow_a', 'slow_b', 'slow_c'], {}, cache=cache)
+    if len(calls) != 3:
+        print(f"✗ Cache miss: provider called {len(calls)} times")
+        return False
+
+    print(f"✓ 3 providers in {elapsed:.2f}s, cached on second call")
+    return True
+
+
+def test_data_provider():
+    """Factors read from the scoring system's data provider and are cached per provider."""
+    print("\nTesting data provider...")
+
+    cache = FactorCache()
+    first, second = FixtureProvider(), FixtureProvider()
+    for provider in (first, second, first):
+        ScoringSystem('medium', 'moderate', factor_cache=cache, provider=provider).calculate_score(
+            INDICATORS, {'ticker': 'AAPL'})
+
+    hits = [cache.get('sentiment', 'AAPL', provider) for provider in (first, second, None)]
+    if not hits[0][0] or not hits[1][0] or hits[2][0] or hits[0][1] is None:
+        print(f"✗ Unexpected cache entries (first, second, process-wide): {hits}")
+        return False
+
+    print(f"✓ Fixture sentiment {hits[0][1]}, cached per provider")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Short-term score", test_short_unchanged),
+        ("Sentiment factor", test_sentiment_factor),
+        ("Concurrent providers", test_concurrent_providers),
+        ("Data provider", test_data_provider),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
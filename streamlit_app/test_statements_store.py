@@ -0,0 +1,118 @@
+"""
+Test script for point-in-time statement storage.
+Runs offline with a fake data provider.
+"""
+import sys
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from fixtures import FixtureProvider
+from statements_store import StatementStore
+
+
+QUARTERS = pd.to_datetime(['2024-12-31', '2024-09-30', '2024-06-30', '2024-03-31', '2023-12-31'])
+
+
+class FakeProvider(FixtureProvider):
+    """Serves fixed statements by yfinance attribute name."""
+
+    def __init__(self, revenue_scale: float = 1.0):
+        super().__init__()
+        revenue = [100.0 * revenue_scale, 95.0, 90.0, 85.0, 80.0]
+        self.quarterly_income_stmt = pd.DataFrame({
+            q: {'Total Revenue': r, 'Net Income': r * 0.2, 'Operating Income': r * 0.25, 'Diluted EPS': r / 100}
+            for q, r in zip(QUARTERS, revenue)
+        })
+        self.quarterly_balance_sheet = pd.DataFrame({
+            q: {'Stockholders Equity': 400.0, 'Total Debt': 120.0, 'Current Assets': 300.0,
+                'Current Liabilities': 150.0, 'Total Assets': 900.0}
+            for q in QUARTERS
+        })
+        self.quarterly_cashflow = pd.DataFrame({
+            q: {'Free Cash Flow': 15.0, 'Operating Cash Flow': 20.0, 'Cash Dividends Paid': -5.0}
+            for q in QUARTERS
+        })
+        self.income_stmt = pd.DataFrame()
+        self.balance_sheet = pd.DataFrame()
+        self.cashflow = pd.DataFrame()
+
+    def statement(self, ticker, attribute):
+        return getattr(self, attribute)
+
+
+def test_point_in_time():
+    """As-of lookups only see statements filed by that date."""
+    print("\nTesting point-in-time lookup...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StatementStore(tmp)
+        added = store.ingest('TEST', FakeProvider(), ingested_at=datetime(2025, 3, 1))
+        history = store.load('TEST')
+
+        # 2024-12-31 quarter is known 45 days later
+        before = history.statement_as_of('2025-02-13', 'income', 'quarterly')
+        after = history.statement_as_of('2025-02-14', 'income', 'quarterly')
+        if before.columns[0] != QUARTERS[1] or after.columns[0] != QUARTERS[0]:
+            print(f"✗ Wrong latest period: {before.columns[0]} / {after.columns[0]}")
+            return False
+
+        # Restated revenue is only visible from the second ingestion on
+        store.ingest('TEST', FakeProvider(revenue_scale=1.1), ingested_at=datetime(2025, 6, 1))
+        history = store.load('TEST')
+        old = history.statement_as_of('2025-05-01', 'income', 'quarterly').loc['Total Revenue', QUARTERS[0]]
+        new = history.statement_as_of('2025-06-01', 'income', 'quarterly').loc['Total Revenue', QUARTERS[0]]
+        if old != 100.0 or abs(new - 110.0) > 1e-9:
+            print(f"✗ Restatement not point-in-time: {old} -> {new}")
+            return False
+
+    print(f"✓ {added} rows ingested, as-of lookups respect filing lag and restatements")
+    return True
+
+
+def test_health_history():
+    """Health score history is rebuilt from stored statements."""
+    print("\nTesting health score history...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StatementStore(tmp)
+        store.ingest('TEST', FakeProvider(), ingested_at=datetime(2025, 3, 1))
+        history = store.load('TEST')
+
+        fundamentals = history.fundamentals_as_of('2025-03-01', price=50.0)
+        if abs(fundamentals['profitability']['profit_margin'] - 0.2) > 1e-9:
+            print(f"✗ Unexpected profit margin: {fundamentals['profitability']}")
+            return False
+        if abs(fundamentals['growth']['revenue_growth'] - 0.25) > 1e-9:
+            print(f"✗ Unexpected revenue growth: {fundamentals['growth']}")
+            return False
+
+        prices = pd.Series([40.0, 50.0], index=pd.to_datetime(['2024-06-01', '2025-01-01']))
+        scores = history.health_score_history(['2024-06-01', '2025-03-01'], prices)
+        if len(scores) != 2 or scores['max_score'].iloc[1] == 0:
+            print(f"✗ Unexpected history:\n{scores}")
+            return False
+
+    print(f"✓ Scores by date: {scores['score'].tolist()}")
+    return True
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        ("Point-in-time lookup", test_point_in_time),
+        ("Health score history", test_health_history),
+    ]
+
+    results = [(name, test_func()) for name, test_func in tests]
+
+    print("\n" + "=" * 60)
+    for name, result in results:
+        print(f"{'✓ PASS' if result else '✗ FAIL'} - {name}")
+
+    return 0 if all(r[1] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
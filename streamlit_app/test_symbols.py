@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for the local symbol directory.
+Checks lookup, autocomplete, listing import/refresh and the negative cache
+used by DataFetcher.validate_ticker (offline).
+"""
+import os
+import sys
+import tempfile
+
+from data_fetcher import DataFetcher
+from fixtures import FixtureProvider
+import symbols
+from symbols import DEFAULT_SYMBOLS_FILE, SymbolDirectory, SymbolInfo, get_symbol_directory
+
+NASDAQ_LISTED = """Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares
+AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N
+ZXZZT|NASDAQ TEST STOCK|G|Y|N|100|N|N
+File Creation Time: 0101202500:00|||||||
+"""
+
+OTHER_LISTED = """ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol
+BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK.B
+SPY|SPDR S&P 500 ETF Trust|P|SPY|Y|100|N|SPY
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingProvider(FixtureProvider):
+    """Provider knowing only AAPL, counting info() calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.info_calls = 0
+
+    def info(self, ticker):
+        self.info_calls += 1
+        return {'currentPrice': 200.0} if ticker == 'AAPL' else {}
+
+
+def test_lookup_and_complete():
+    """Seed directory: exact lookups and prefix suggestions."""
+    print("\nTesting lookup and autocomplete...")
+    directory = SymbolDirectory.from_file(DEFAULT_SYMBOLS_FILE)
+    entry = directory.get(' msft ')
+    if entry is None or entry.name != 'Microsoft Corporation':
+        print(f"✗ Lookup failed: {entry}")
+        return False
+    if 'NOPE' in directory:
+        print("✗ Unknown symbol found")
+        return False
+
+    by_symbol = [s.symbol for s in directory.complete('GOO')]
+    by_name = [s.symbol for s in directory.complete('micro')]
+    print(f"  GOO -> {by_symbol}, micro -> {by_name}")
+    if by_symbol != ['GOOG', 'GOOGL'] or set(by_name) != {'MSFT', 'MU'}:
+        print("✗ Unexpected suggestions")
+        return False
+    if len(directory.complete('A', limit=3)) != 3 or directory.complete('  '):
+        print("✗ Limit / empty prefix not respected")
+        return False
+    print(f"✓ {len(directory)} symbols, lookups and suggestions OK")
+    return True
+
+
+def test_listing_import_and_refresh():
+    """NASDAQ Trader listings parse (test issues skipped) and refresh() reloads."""
+    print("\nTesting listing import and refresh...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'listing.txt')
+        with open(path, 'w') as handle:
+            handle.write(NASDAQ_LISTED)
+
+        directory = SymbolDirectory.from_file(path)
+        if len(directory) != 1 or 'AAPL' not in directory or 'ZXZZT' in directory:
+            print("✗ Test issue or footer imported")
+            return False
+        if directory.refresh():
+            print("✗ Unchanged file reloaded")
+            return False
+
+        with open(path, 'w') as handle:
+            handle.write(OTHER_LISTED)
+        os.utime(path, (1, 1))
+        if not directory.refresh() or 'AAPL' in directory:
+            print("✗ Changed file not reloaded")
+            return False
+        expected = [SymbolInfo('BRK-B', 'Berkshire Hathaway Inc. Class B', 'NYSE'),
+                    SymbolInfo('SPY', 'SPDR S&P 500 ETF Trust', 'NYSE Arca')]
+        if [directory.get('BRK-B'), directory.get('SPY')] != expected:
+            print(f"✗ Unexpected entries: {directory.get('BRK-B')}, {directory.get('SPY')}")
+            return False
+    print("✓ Listings imported and refreshed")
+    return True
+
+
+def test_runtime_reload():
+    """The process-wide directory picks up a changed STOCK_ANALYZER_SYMBOLS file and forgets its misses."""
+    print("\nTesting runtime reload...")
+    previous = os.environ.get('STOCK_ANALYZER_SYMBOLS')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'symbols.csv')
+        with open(path, 'w') as handle:
+            handle.write("symbol,name,exchange\nAAPL,Apple Inc.,NASDAQ\n")
+        os.environ['STOCK_ANALYZER_SYMBOLS'] = path
+        symbols._load_symbol_directory.cache_clear()
+        try:
+            provider = CountingProvider()
+            accepted_before = DataFetcher('NEWCO', provider).validate_ticker()
+
+            with open(path, 'a') as handle:
+                handle.write("NEWCO,New Company Inc.,NYSE\n")
+            os.utime(path, (1, 1))
+            directory = get_symbol_directory()
+            known = directory.get('NEWCO') is not None and not directory.is_known_miss('NEWCO')
+        finally:
+            if previous is None:
+                os.environ.pop('STOCK_ANALYZER_SYMBOLS')
+            else:
+                os.environ['STOCK_ANALYZER_SYMBOLS'] = previous
+            symbols._load_symbol_directory.cache_clear()
+
+    if accepted_before or provider.info_calls or not known:
+        print(f"✗ Accepted before: {accepted_before}, known after reload: {known}")
+        return False
+    print("✓ Added ticker accepted without a restart")
+    return True
+
+
+def test_negative_cache():
+    """Misses are remembered for the TTL; authoritative directories reject unknowns."""
+    print("\nTesting negative cache...")
+    clock = FakeClock()
+    provider = CountingProvider()
+    directory = SymbolDirectory([SymbolInfo('AAPL', 'Apple Inc.', 'NASDAQ')], miss_ttl=60, clock=clock)
+
+    results = [DataFetcher('TYPO', provider, directory).validate_ticker() for _ in range(3)]
+    if any(results) or provider.info_calls != 1:
+        print(f"✗ Miss not cached: {results}, {provider.info_calls} info calls")
+        return False
+    clock.now += 61
+    DataFetcher('TYPO', provider, directory).validate_ticker()
+    if provider.info_calls != 2:
+        print("✗ Miss not re-checked after TTL")
+        return False
+    if not DataFetcher('AAPL', provider, directory).validate_ticker():
+        print("✗ Valid ticker rejected")
+        return False
+
+    strict = SymbolDirectory([SymbolInfo('AAPL', 'Apple Inc.', 'NASDAQ')], authoritative=True)
+    calls = provider.info_calls
+    if DataFetcher('ZZZZ', provider, strict).validate_ticker() or provider.info_calls != calls:
+        print("✗ Authoritative directory asked the provider about an unknown symbol")
+        return False
+    print(f"✓ {provider.info_calls} provider calls for 6 validations")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("SYMBOL DIRECTORY TESTS")
+    print("=" * 60)
+
+    results = {
+        'Lookup and autocomplete': test_lookup_and_complete(),
+        'Listing import and refresh': test_listing_import_and_refresh(),
+        'Negative cache': test_negative_cache(),
+        'Runtime reload': test_runtime_reload(),
+    }
+
+    print("\n" + "=" * 60)
+    for name, passed in results.items():
+        print(f"{'✓ PASS' if passed else '✗ FAIL'} - {name}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())